@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+
+"""
+In-process benchmark suite for the prediction API.
+
+Drives main.app through httpx's ASGITransport (no server, no sockets), so the
+numbers are the application's own request handling: routing, validation,
+prediction and serialization. Each scenario reports p50/p95/p99 latency and
+throughput; cold import time of main is measured in fresh interpreters.
+
+    python benchmark_api.py                           # run and compare to the baseline
+    python benchmark_api.py --save-baseline           # record a new baseline
+    python benchmark_api.py --tolerance 0.25 --requests 2000 --concurrency 8
+
+A scenario regresses when its p50 or p95 grows (or throughput drops) by more
+than --tolerance relative to benchmark_baseline.json, ignoring differences
+below --min-delta-ms. A 1000-row batch must also beat ten single /predict
+calls (p50 against p50). Regressions make the exit code 1.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "benchmark_baseline.json")
+
+# 1000 distinct rows: in-domain seasons hit the prediction table, far seasons go to live inference
+BATCH_1000 = [{"season": 2015 + i % 20, "team_encoded": i % 10, "driver_experience": i // 10 % 25}
+              for i in range(1000)]
+
+# name -> (method, path, json body)
+SCENARIOS = {
+    "predict_historical": ("POST", "/predict", {
+        "season": 2023, "team_encoded": 0, "driver_name": "Max Verstappen", "driver_experience": 8}),
+    "predict_future": ("POST", "/predict", {
+        "season": 2027, "team_encoded": 3, "driver_name": "Lando Norris", "driver_experience": 7}),
+    "predict_unknown_driver": ("POST", "/predict", {
+        "season": 2024, "team_encoded": 8, "driver_name": "New Rookie", "driver_experience": 1}),
+    "predict_batch_1000": ("POST", "/predict/batch", BATCH_1000),
+    "historical_season": ("GET", "/historical/2024", None),
+    "teams": ("GET", "/teams", None),
+}
+
+# (batch scenario, single-call scenario, single calls the batch must beat)
+BATCH_CHECK = ("predict_batch_1000", "predict_historical", 10)
+
+COLD_IMPORT_SNIPPET = (
+    "import sys, time; started = time.perf_counter(); import main; "
+    "sys.stderr.write('COLD_IMPORT_MS=%.3f\\n' % ((time.perf_counter() - started) * 1000))"
+)
+
+
+def load_app():
+    sys.path.insert(0, HERE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        import main
+    return main.app
+
+
+def summarize(latencies_ms: List[float], elapsed: float) -> Dict[str, float]:
+    values = np.asarray(latencies_ms)
+    return {
+        "requests": int(len(values)),
+        "p50_ms": round(float(np.percentile(values, 50)), 4),
+        "p95_ms": round(float(np.percentile(values, 95)), 4),
+        "p99_ms": round(float(np.percentile(values, 99)), 4),
+        "mean_ms": round(float(values.mean()), 4),
+        "throughput_rps": round(len(values) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, method: str, path: str, body: Optional[dict],
+                       requests: int, concurrency: int, warmup: int) -> Dict[str, float]:
+    async def one() -> float:
+        started = time.perf_counter()
+        response = await client.request(method, path, json=body)
+        elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} {path} -> {response.status_code}: {response.text[:200]}")
+        return elapsed
+
+    for _ in range(warmup):
+        await one()
+
+    latencies: List[float] = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            latencies.append(await one())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def run_suite(app, names: List[str], requests: int, concurrency: int, warmup: int) -> Dict[str, dict]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        results = {}
+        for name in names:
+            method, path, body = SCENARIOS[name]
+            results[name] = await run_scenario(client, method, path, body, requests, concurrency, warmup)
+        return results
+
+
+def cold_import(runs: int) -> Dict[str, float]:
+    """Time `import main` in fresh interpreters (model, data and indexes included)"""
+    timings = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, "-c", COLD_IMPORT_SNIPPET], cwd=HERE,
+                                   capture_output=True, text=True, check=True)
+        line = next(l for l in completed.stderr.splitlines() if l.startswith("COLD_IMPORT_MS="))
+        timings.append(float(line.split("=", 1)[1]))
+    return {
+        "runs": runs,
+        "p50_ms": round(float(np.percentile(timings, 50)), 2),
+        "max_ms": round(max(timings), 2),
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float, min_delta_ms: float) -> List[str]:
+    """Human-readable regressions of results against baseline"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if metric in previous and metric in current:
+                delta = current[metric] - previous[metric]
+                if delta > min_delta_ms and current[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append(f"{name}.{metric}: {previous[metric]:.3f} -> {current[metric]:.3f} ms")
+        if previous.get("throughput_rps") and current.get("throughput_rps") is not None:
+            if current["throughput_rps"] < previous["throughput_rps"] / (1 + tolerance):
+                regressions.append(f"{name}.throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}")
+    return regressions
+
+
+def check_batch(results: Dict[str, dict]) -> List[str]:
+    """The batch scenario's p50 must stay below that many single-call p50s"""
+    batch, single, calls = BATCH_CHECK
+    if batch not in results or single not in results:
+        return []
+    budget = results[single]["p50_ms"] * calls
+    if results[batch]["p50_ms"] < budget:
+        return []
+    return [f"{batch}.p50_ms: {results[batch]['p50_ms']:.3f} ms is not below {calls} x {single} ({budget:.3f} ms)"]
+
+
+def print_report(results: Dict[str, dict]) -> None:
+    print(f"\n{'scenario':<24}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>10}")
+    for name, r in results.items():
+        if name == "cold_import":
+            print(f"{name:<24}{r['p50_ms']:>9.1f}{'':>9}{'':>9}{'':>10}   (max {r['max_ms']:.1f} ms, {r['runs']} runs)")
+        else:
+            print(f"{name:<24}{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}{r['p99_ms']:>9.3f}{r['throughput_rps']:>10.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="In-process ASGI benchmark for the prediction API")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--requests", type=int, default=1000, help="Timed requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=1, help="Requests in flight at once")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--cold-runs", type=int, default=3, help="Fresh-interpreter imports (0 to skip)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown (0.2 = 20%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.25, help="Ignore smaller absolute slowdowns")
+    parser.add_argument("--output", help="Also write this run's results to a JSON file")
+    args = parser.parse_args(argv)
+
+    names = [n.strip() for n in args.scenarios.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios {unknown}; available: {list(SCENARIOS)}")
+
+    app = load_app()
+    # Keep any request logging (F1_LOG_LEVEL=DEBUG) out of the report
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = asyncio.run(run_suite(app, names, args.requests, args.concurrency, args.warmup))
+    if args.cold_runs > 0:
+        results["cold_import"] = cold_import(args.cold_runs)
+    print_report(results)
+
+    report = {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "requests": args.requests,
+                 "concurrency": args.concurrency, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    regressions = check_batch(results)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        for line in regressions:
+            print(f"⚠️ {line}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nℹ️ No baseline at {args.baseline}; run with --save-baseline to record one")
+    else:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions += compare(results, baseline, args.tolerance, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) (tolerance {args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    if os.path.exists(args.baseline):
+        print(f"\n✅ No regressions beyond {args.tolerance:.0%} of the baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the NumPy forest evaluator against sklearn's predict_proba.
+
+Times both paths on the served model (or a synthetic forest) for a range of
+batch sizes, after checking their outputs are bit-identical.
+
+    python benchmark_forest.py
+    python benchmark_forest.py --batches 1,8,64,2310 --repeat 500
+    python benchmark_forest.py --synthetic 100        # 100-tree forest on random rows
+"""
+
+import argparse
+import sys
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from compiled_forest import CompiledForest, matches_model
+from prediction_table import domain_grid
+
+
+def time_call(fn: Callable, X: np.ndarray, repeat: int) -> float:
+    """Median wall time of fn(X) in microseconds"""
+    fn(X)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(X)
+        samples.append(time.perf_counter() - started)
+    return float(np.median(samples) * 1e6)
+
+
+def synthetic_model(n_estimators: int, seed: int = 0):
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.RandomState(seed)
+    X = domain_grid()[rng.randint(0, len(domain_grid()), 3000)]
+    y = np.clip(X[:, 1] * 2 + rng.randint(-3, 4, len(X)), 1, 20).astype(int)
+    return RandomForestClassifier(n_estimators=n_estimators, random_state=seed).fit(X, y)
+
+
+def run(model, batches: List[int], repeat: int, seed: int = 0) -> Dict[int, dict]:
+    forest = CompiledForest.from_sklearn(model)
+    rng = np.random.RandomState(seed)
+    grid = domain_grid()
+    results = {}
+    for size in batches:
+        X = grid[rng.randint(0, len(grid), size)]
+        if not matches_model(forest, model, X):
+            raise AssertionError(f"Compiled forest differs from sklearn on a batch of {size}")
+        sklearn_us = time_call(model.predict_proba, X, repeat)
+        numpy_us = time_call(forest.predict_proba, X, repeat)
+        results[size] = {"sklearn_us": sklearn_us, "numpy_us": numpy_us, "speedup": sklearn_us / numpy_us}
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="NumPy forest evaluator vs sklearn predict_proba")
+    parser.add_argument("--batches", default="1,8,64,512,2310")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--synthetic", type=int, help="Benchmark a synthetic forest with this many trees")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        model = synthetic_model(args.synthetic)
+        label = f"synthetic forest ({args.synthetic} trees)"
+    else:
+        from model_loader import find_model_artifact, load_model
+        model_path, info_path = find_model_artifact()
+        model, _ = load_model(model_path, info_path)
+        label = model_path
+    forest = CompiledForest.from_sklearn(model)
+    print(f"🌲 {label}: {forest.n_estimators} trees, {forest.node_count} nodes, depth {forest.depth}")
+
+    results = run(model, [int(b) for b in args.batches.split(",")], args.repeat)
+    print(f"\n{'batch':>7}{'sklearn us':>13}{'numpy us':>11}{'speedup':>10}")
+    for size, r in results.items():
+        print(f"{size:>7}{r['sklearn_us']:>13.1f}{r['numpy_us']:>11.1f}{r['speedup']:>9.1f}x")
+    print("\n✅ Outputs bit-identical for every batch")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
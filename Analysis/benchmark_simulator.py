@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the Monte Carlo race simulator on a 20-car grid.
+
+Scores a full 2024 entry list with the served model (or random
+distributions with --random), then times simulate_race for each requested
+number of races and checks every simulated race is a permutation. Exits 1
+when the largest run's median exceeds --budget-ms.
+
+    python benchmark_simulator.py                        # 10k and 100k races, 250 ms budget
+    python benchmark_simulator.py --simulations 100000 --repeat 10 --budget-ms 200
+"""
+
+import argparse
+import sys
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from race_simulator import position_distribution, sample_finishing_positions, simulate_race
+
+# (team_encoded, driver_experience) for a 20-car grid, two cars per team
+GRID = [(team, experience) for team in range(10) for experience in (3, 9)]
+
+
+def grid_probabilities(random: bool) -> Tuple[np.ndarray, np.ndarray]:
+    if random:
+        classes = np.arange(1, 21)
+        return np.random.default_rng(0).dirichlet(np.full(20, 0.3), size=len(GRID)), classes
+    from model_loader import find_model_artifact, load_model
+    from model_registry import ServingModel
+
+    model_path, info_path = find_model_artifact()
+    model, model_info = load_model(model_path, info_path)
+    serving = ServingModel(model, model_info, model_info['model_sha256'][:12], model_path)
+    X = np.array([[2024, team, experience] for team, experience in GRID], dtype=float)
+    return serving.predict_proba(X), model.classes_
+
+
+def time_simulation(probabilities, classes, simulations: int, repeat: int) -> List[float]:
+    simulate_race(probabilities, classes, simulations, seed=0)
+    samples = []
+    for seed in range(repeat):
+        started = time.perf_counter()
+        simulate_race(probabilities, classes, simulations, seed=seed)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Monte Carlo race simulator benchmark")
+    parser.add_argument("--simulations", default="10000,100000", help="Comma-separated race counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Median budget for the largest run")
+    parser.add_argument("--random", action="store_true", help="Random 20-class distributions instead of the model")
+    args = parser.parse_args(argv)
+
+    probabilities, classes = grid_probabilities(args.random)
+    counts = [int(c) for c in args.simulations.split(",")]
+
+    # Validity: every simulated race is a permutation of P1..Pn, and the same seed repeats exactly
+    positions = sample_finishing_positions(probabilities, classes, counts[-1], np.random.default_rng(7))
+    assert (np.sort(positions, axis=1) == np.arange(1, len(GRID) + 1)).all()
+    assert np.array_equal(position_distribution(positions), position_distribution(
+        sample_finishing_positions(probabilities, classes, counts[-1], np.random.default_rng(7))))
+
+    print(f"🏎️ {len(GRID)} cars, {len(classes)} position classes, median of {args.repeat} runs")
+    print(f"\n{'races':>9}{'median ms':>12}{'p95 ms':>10}{'races/s':>14}")
+    median = 0.0
+    for count in counts:
+        samples = time_simulation(probabilities, classes, count, args.repeat)
+        median = float(np.median(samples))
+        print(f"{count:>9}{median:>12.1f}{np.percentile(samples, 95):>10.1f}{count / median * 1000:>14,.0f}")
+
+    if median > args.budget_ms:
+        print(f"\n❌ {counts[-1]} races took {median:.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        return 1
+    print(f"\n✅ {counts[-1]} races in {median:.1f} ms (budget {args.budget_ms:.0f} ms); every race a valid permutation")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+"""
+Startup and memory benchmark: pre-forked serve.py workers vs independent
+uvicorn processes that each load the application.
+
+For each layout it reports the time until every process answers /health and,
+from /proc/<pid>/smaps_rollup, per-process RSS, PSS (shared pages split between
+sharers) and USS (private pages only). A worker's USS is what it costs on top
+of the shared, already-loaded model and indexes.
+
+    python benchmark_workers.py --workers 4
+
+Linux only (fork + /proc).
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """rss/pss/uss in kB from smaps_rollup"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "uss": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def children(pid: int) -> List[int]:
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return [int(p) for p in f.read().split()]
+
+
+def wait_healthy(port: int, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1.0) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.05)
+    raise TimeoutError(f"Server on port {port} did not become healthy")
+
+
+def warm(port: int, requests: int) -> None:
+    """Touch the serving paths so every worker has paged in what it needs"""
+    body = b'{"season": 2024, "team_encoded": 0, "driver_name": "Max Verstappen", "driver_experience": 8}'
+    for i in range(requests):
+        req = urllib.request.Request(f"http://127.0.0.1:{port}/predict", data=body,
+                                     headers={"Content-Type": "application/json"})
+        urllib.request.urlopen(req, timeout=5.0).read()
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/historical/{2021 + i % 5}", timeout=5.0).read()
+
+
+def start(cmd: List[str]) -> subprocess.Popen:
+    return subprocess.Popen(cmd, cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            env={**os.environ, "PYTHONUNBUFFERED": "1"})
+
+
+def stop(procs: List[subprocess.Popen]) -> None:
+    for p in procs:
+        p.terminate()
+    for p in procs:
+        try:
+            p.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            p.kill()
+
+
+def report(name: str, startup: float, pids: Dict[str, int]) -> Dict[str, int]:
+    print(f"\n{name}: ready in {startup:.2f}s")
+    print(f"  {'process':<14}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+    totals = {"rss": 0, "pss": 0, "uss": 0}
+    for label, pid in pids.items():
+        mem = memory_kb(pid)
+        for key in totals:
+            totals[key] += mem[key]
+        print(f"  {label:<14}{mem['rss'] / 1024:>10.1f}{mem['pss'] / 1024:>10.1f}{mem['uss'] / 1024:>10.1f}")
+    print(f"  {'total':<14}{totals['rss'] / 1024:>10.1f}{totals['pss'] / 1024:>10.1f}{totals['uss'] / 1024:>10.1f}")
+    return totals
+
+
+def bench_prefork(workers: int, warm_requests: int) -> Dict[str, int]:
+    port = free_port()
+    started = time.perf_counter()
+    proc = start([sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)])
+    try:
+        wait_healthy(port)
+        while len(children(proc.pid)) < workers:
+            time.sleep(0.05)
+        startup = time.perf_counter() - started
+        warm(port, warm_requests)
+        pids = {"launcher": proc.pid, **{f"worker {i}": pid for i, pid in enumerate(children(proc.pid))}}
+        return report(f"serve.py --workers {workers} (pre-fork, shared pages)", startup, pids)
+    finally:
+        stop([proc])
+
+
+def bench_independent(workers: int, warm_requests: int) -> Dict[str, int]:
+    ports = [free_port() for _ in range(workers)]
+    started = time.perf_counter()
+    procs = [start([sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+                    "--log-level", "warning"]) for port in ports]
+    try:
+        for port in ports:
+            wait_healthy(port)
+        startup = time.perf_counter() - started
+        for port in ports:
+            warm(port, warm_requests)
+        pids = {f"process {i}": p.pid for i, p in enumerate(procs)}
+        return report(f"{workers} x uvicorn main:app (each loads everything)", startup, pids)
+    finally:
+        stop(procs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--warm-requests", type=int, default=50)
+    args = parser.parse_args()
+
+    independent = bench_independent(args.workers, args.warm_requests)
+    prefork = bench_prefork(args.workers, args.warm_requests)
+    print(f"\nTotal PSS: {independent['pss'] / 1024:.1f} MB -> {prefork['pss'] / 1024:.1f} MB "
+          f"({100 * (1 - prefork['pss'] / independent['pss']):.0f}% less)")
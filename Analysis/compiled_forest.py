@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Pure-NumPy evaluator for a fitted RandomForestClassifier.
+
+The forest is flattened once into contiguous node arrays shared by all
+trees (feature, threshold, left/right child as global node indices, leaf
+class distributions, one root offset per tree). Evaluation walks every tree
+over the whole batch at once: one gather-compare-select step per tree level,
+no per-estimator dispatch, input validation or joblib fan-out. That wins
+for single rows and small batches (what live /predict calls send); for
+large batches sklearn's compiled tree walk is faster again, see
+benchmark_forest.py and ServingModel.
+
+Results are bit-identical to sklearn's predict_proba because the arithmetic
+is the same: X is cast to float32 and compared `<=` against the float64
+thresholds, leaf distributions are summed tree by tree in estimator order
+starting from zeros, then divided by the number of trees.
+
+    python compiled_forest.py [out.npz]      # export the served model's forest
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+import numpy as np
+
+LEAF = -1  # sklearn's TREE_LEAF
+
+
+class CompiledForest:
+    """Flattened forest; predict_proba / classes_ stand in for the sklearn model"""
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, classes: np.ndarray, n_features: int, depth: int):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        self.depth = int(depth)
+        self.is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForest":
+        """Flatten a fitted single-output RandomForestClassifier (or any forest of DecisionTreeClassifiers)"""
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        n_classes = int(model.n_classes_)
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == LEAF
+            own = np.arange(offset, offset + tree.node_count)
+            # Leaves point at themselves (is_leaf is recovered from that after save/load)
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(np.where(is_leaf, 0.0, tree.threshold))
+            # What DecisionTreeClassifier.predict_proba returns for a sample landing on each node
+            values.append(tree.value[:, 0, :n_classes])
+            roots.append(offset)
+            offset += tree.node_count
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+            roots=np.asarray(roots, dtype=np.intp),
+            classes=np.asarray(model.classes_),
+            n_features=model.n_features_in_,
+            depth=max(estimator.tree_.max_depth for estimator in model.estimators_),
+        )
+
+    @property
+    def n_estimators(self) -> int:
+        return len(self.roots)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.feature)
+
+    def _validate(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}, expected (n, {self.n_features_in_})")
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity")
+        return X
+
+    def apply(self, X) -> np.ndarray:
+        """Global leaf index reached in every tree, shape (n_samples, n_estimators)"""
+        X = self._validate(X).astype(np.float64)
+        n_samples = len(X)
+        flat_X = X.ravel()
+        # One lane per (tree, sample), tree-major so neighbouring lanes read the same tree's
+        # nodes; lanes that reach a leaf are dropped, so each step only touches live ones
+        leaves = np.repeat(self.roots, n_samples)
+        lanes = np.flatnonzero(~self.is_leaf[leaves])
+        nodes = leaves[lanes]
+        row_offset = np.tile(np.arange(n_samples) * self.n_features_in_, self.n_estimators)[lanes]
+        while lanes.size:
+            go_left = flat_X[row_offset + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+            done = self.is_leaf[nodes]
+            leaves[lanes[done]] = nodes[done]
+            live = ~done
+            lanes, nodes, row_offset = lanes[live], nodes[live], row_offset[live]
+        return leaves.reshape(self.n_estimators, n_samples).T
+
+    def predict_proba(self, X) -> np.ndarray:
+        leaves = self.apply(X)
+        proba = np.zeros((len(leaves), self.value.shape[1]), dtype=np.float64)
+        # Tree by tree, in estimator order: the same summation order as sklearn
+        for tree_leaves in leaves.T:
+            proba += self.value[tree_leaves]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.classes_.take(self.predict_proba(X).argmax(axis=1))
+
+    def save(self, path: str) -> None:
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left, right=self.right,
+                 value=self.value, roots=self.roots, classes=self.classes_,
+                 n_features=self.n_features_in_, depth=self.depth)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledForest":
+        with np.load(path) as arrays:
+            return cls(**{name: arrays[name] for name in arrays.files})
+
+
+def compile_forest(model) -> Optional[CompiledForest]:
+    """CompiledForest for a supported model, else None (callers keep using the model itself)"""
+    try:
+        return CompiledForest.from_sklearn(model)
+    except (AttributeError, ValueError):
+        return None
+
+
+def matches_model(forest: CompiledForest, model, X) -> bool:
+    """True when the forest reproduces model.predict_proba(X) bit for bit"""
+    expected = model.predict_proba(X)
+    actual = forest.predict_proba(X)
+    return expected.shape == actual.shape and np.array_equal(expected.view(np.uint64), actual.view(np.uint64))
+
+
+def main(argv=None) -> int:
+    from model_loader import find_model_artifact, load_model
+    from prediction_table import domain_grid
+
+    parser = argparse.ArgumentParser(description="Flatten the position model into a .npz forest")
+    parser.add_argument("out", nargs="?", help="Output path (default: next to the model, .forest.npz)")
+    args = parser.parse_args(argv)
+
+    model_path, info_path = find_model_artifact()
+    model, _ = load_model(model_path, info_path)
+    forest = CompiledForest.from_sklearn(model)
+    out_path = args.out or os.path.splitext(model_path)[0] + ".forest.npz"
+    # Check against sklearn on every cell of the serving domain before writing anything
+    if not matches_model(forest, model, domain_grid()):
+        print(f"❌ Compiled forest does not reproduce {model_path} exactly")
+        return 1
+    forest.save(out_path)
+    print(f"✅ {forest.n_estimators} trees, {forest.node_count} nodes, depth {forest.depth} -> {out_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
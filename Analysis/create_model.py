@@ -8,16 +8,22 @@ from sklearn.preprocessing import LabelEncoder
 import joblib
 import os
 
+from f1_data import load_dataset, resolve_source
+from model_loader import save_model
+from team_resolver import TEAM_MAPPING, encode_teams, team_name
+
 print("🏎️ Simple F1 Position Predictor - Training Model")
 print("="*50)
 
-# Get CSV path
-script_dir = os.path.dirname(os.path.abspath(__file__))
-csv_path = os.path.join(script_dir, "..", "Scraper", "driver_stats.csv")
+# Locate the standings (season store or CSV)
+try:
+    source_path = resolve_source()
+except FileNotFoundError:
+    source_path = None
 
-print(f"🔍 Looking for CSV at: {csv_path}")
-if not os.path.exists(csv_path):
-    print("❌ CSV not found, creating minimal synthetic data")
+print(f"🔍 Looking for standings: {source_path}")
+if source_path is None:
+    print("❌ Standings not found, creating minimal synthetic data")
     # Create minimal synthetic data
     synthetic_data = {
         'season': [2020, 2020, 2021, 2021, 2022, 2022, 2023, 2023] * 3,
@@ -29,25 +35,19 @@ if not os.path.exists(csv_path):
     df = pd.DataFrame(synthetic_data)
     print(f"📊 Created synthetic data: {len(df)} records")
 else:
-    print("✅ Loading CSV data")
-    df = pd.read_csv(csv_path)
-    # Clean column names
-    df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
+    print("✅ Loading cleaned standings")
+    df = load_dataset(['pos', 'driver', 'team', 'pts', 'season'], source=source_path)
     print(f"📊 Data loaded: {len(df)} records")
 
-# Team mapping for encoding
-team_mapping = {
-    "Red Bull Racing": 0, "Mercedes": 1, "Ferrari": 2, "McLaren": 3,
-    "Aston Martin": 4, "Alpine": 5, "Haas": 6, "RB": 7,
-    "Williams": 8, "Kick Sauber": 9, "AlphaTauri": 7, "Alfa Romeo": 9
-}
+# Team mapping for encoding (shared with the API)
+team_mapping = TEAM_MAPPING
 
 print(f"🏁 Team mapping: {team_mapping}")
 
 # Prepare data for modeling
 print("🧹 Preparing data...")
 
-# Clean position data (handle numeric positions only)
+# Keep numeric finishing positions only (the store has NaN for DNF, DSQ, etc.)
 df['pos_numeric'] = pd.to_numeric(df['pos'], errors='coerce')
 df = df.dropna(subset=['pos_numeric'])
 df = df[df['pos_numeric'] > 0]  # Only valid finishing positions
@@ -56,22 +56,8 @@ df = df[df['pos_numeric'] <= 20]  # Reasonable position limit
 print(f"📈 Valid position records: {len(df)}")
 print(f"📊 Position range: {df['pos_numeric'].min()} to {df['pos_numeric'].max()}")
 
-# Encode teams
-def encode_team(team_name):
-    team_name = str(team_name).strip()
-    # Direct mapping
-    if team_name in team_mapping:
-        return team_mapping[team_name]
-    
-    # Fuzzy matching for team name variations
-    for team, code in team_mapping.items():
-        if team.lower() in team_name.lower() or team_name.lower() in team.lower():
-            return code
-    
-    # Default for unknown teams
-    return 9  # Default to Kick Sauber encoding
-
-df['team_encoded'] = df['team'].apply(encode_team)
+# Encode teams with the shared resolver
+df['team_encoded'] = encode_teams(df['team'])
 print(f"🏢 Team encoding completed")
 
 # Create driver experience feature (simplified)
@@ -112,22 +98,16 @@ print(f"✅ Model trained successfully!")
 print(f"🎯 Test accuracy: {accuracy:.3f}")
 print(f"📊 Model classes: {model.classes_}")
 
-# Save model
+# Save model together with its metadata (features, classes, content hash)
 model_path = "f1_position_predictor.joblib"
-joblib.dump(model, model_path)
-print(f"💾 Model saved to: {model_path}")
-
-# Save model info
-model_info = {
+info_path = "f1_model_info.joblib"
+model_info = save_model(model, {
     'features': ['season', 'team_encoded', 'driver_experience'],
     'team_mapping': team_mapping,
     'model_type': 'position_classification',
-    'classes': model.classes_.tolist(),
     'accuracy': accuracy
-}
-
-info_path = "f1_model_info.joblib"
-joblib.dump(model_info, info_path)
+}, model_path, info_path)
+print(f"💾 Model saved to: {model_path} (sha256 {model_info['model_sha256'][:12]})")
 print(f"💾 Model info saved to: {info_path}")
 
 # Test predictions
@@ -142,9 +122,7 @@ test_cases = [
 for i, test_case in enumerate(test_cases):
     pred = model.predict([test_case])
     proba = model.predict_proba([test_case])
-    team_name = next((team for team, code in team_mapping.items() if code == test_case[1]), f"Team {test_case[1]}")
-    
-    print(f"Test {i+1}: Season {test_case[0]}, {team_name}, {test_case[2]} years exp")
+    print(f"Test {i+1}: Season {test_case[0]}, {team_name(test_case[1])}, {test_case[2]} years exp")
     print(f"  -> Position: P{pred[0]}, Confidence: {np.max(proba[0]):.3f}")
 
 print("\n✅ Model training completed successfully!")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""
+Ranked fuzzy driver-name search over the scraped standings.
+
+Scraped DRIVER values carry a glued 3-letter code ("Max VerstappenVER"), which
+f1_data.split_driver_code strips, as everywhere else. Each distinct driver is
+indexed by its name tokens (exact and prefix matches, for autocomplete) and by
+character trigrams (typo tolerance). A query only touches the postings of its
+own trigrams and tokens, so lookups stay sub-millisecond as the history grows.
+"""
+
+import bisect
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from f1_data import split_driver_code
+
+TOKEN_WEIGHT = 0.6
+TRIGRAM_WEIGHT = 0.4
+PREFIX_CREDIT = 0.75
+
+
+def normalize(text: str) -> str:
+    """Case-fold, drop accents and collapse whitespace"""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class DriverSearchIndex:
+    """Token + trigram inverted index over distinct driver names"""
+
+    def __init__(self, records: Iterable[dict]):
+        self.drivers: List[dict] = []
+        self._doc_tokens: List[List[str]] = []
+        self._doc_trigrams: List[Set[str]] = []
+        self._by_name: Dict[str, int] = {}
+        self._token_postings: Dict[str, Set[int]] = defaultdict(set)
+        self._trigram_postings: Dict[str, Set[int]] = defaultdict(set)
+
+        for record in records:
+            raw = record.get('driver')
+            if not isinstance(raw, str) or not raw.strip():
+                continue
+            name, code = split_driver_code(raw)
+            key = normalize(name)
+            doc_id = self._by_name.get(key)
+            if doc_id is None:
+                doc_id = len(self.drivers)
+                self._by_name[key] = doc_id
+                self.drivers.append({'driver': name, 'code': code, 'seasons': set(), 'teams': set()})
+                # The driver code ("VER") is searchable as a token too
+                tokens = key.split() + ([code.lower()] if code else [])
+                self._doc_tokens.append(tokens)
+                self._doc_trigrams.append(trigrams(key))
+                for token in tokens:
+                    self._token_postings[token].add(doc_id)
+                for gram in self._doc_trigrams[doc_id]:
+                    self._trigram_postings[gram].add(doc_id)
+            entry = self.drivers[doc_id]
+            if entry['code'] is None and code:
+                entry['code'] = code
+            if record.get('season') is not None:
+                entry['seasons'].add(int(record['season']))
+            if isinstance(record.get('team'), str):
+                entry['teams'].add(record['team'])
+
+        self._sorted_tokens = sorted(self._token_postings)
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        docs: Set[int] = set()
+        start = bisect.bisect_left(self._sorted_tokens, prefix)
+        for token in self._sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            docs |= self._token_postings[token]
+        return docs
+
+    def _token_score(self, query_tokens: List[str], doc_id: int) -> float:
+        doc_tokens = self._doc_tokens[doc_id]
+        total = 0.0
+        for q in query_tokens:
+            if q in doc_tokens:
+                total += 1.0
+            elif any(t.startswith(q) for t in doc_tokens):
+                total += PREFIX_CREDIT
+        return total / len(query_tokens)
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.2) -> List[dict]:
+        """Ranked candidates for a (possibly partial or misspelt) driver name"""
+        key = normalize(split_driver_code(query)[0] if query else '')
+        if not key:
+            return []
+        query_tokens = key.split()
+        query_grams = trigrams(key)
+
+        # Candidates share a trigram or a token prefix with the query
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for doc_id in self._trigram_postings.get(gram, ()):
+                shared[doc_id] += 1
+        for token in query_tokens:
+            for doc_id in self._prefix_docs(token):
+                shared.setdefault(doc_id, 0)
+
+        results = []
+        for doc_id, overlap in shared.items():
+            dice = 2.0 * overlap / (len(query_grams) + len(self._doc_trigrams[doc_id]))
+            score = TOKEN_WEIGHT * self._token_score(query_tokens, doc_id) + TRIGRAM_WEIGHT * dice
+            if score >= min_score:
+                results.append((score, doc_id))
+
+        results.sort(key=lambda item: (-item[0], self.drivers[item[1]]['driver']))
+        return [self._result(doc_id, score) for score, doc_id in results[:limit]]
+
+    def best_match(self, query: str, min_score: float = 0.5) -> Optional[dict]:
+        results = self.search(query, limit=1, min_score=min_score)
+        return results[0] if results else None
+
+    def _result(self, doc_id: int, score: float) -> dict:
+        entry = self.drivers[doc_id]
+        return {
+            'driver': entry['driver'],
+            'code': entry['code'],
+            'score': round(score, 4),
+            'seasons': sorted(entry['seasons']),
+            'teams': sorted(entry['teams']),
+        }
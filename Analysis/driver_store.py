@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+"""
+Typed, columnar on-disk store for the driver standings.
+
+The scraper used to hand every consumer a CSV (and an indent-2 JSON copy) that
+each script re-parsed, re-normalized and re-coerced. The store keeps the
+cleaned, typed columns once, partitioned by season:
+
+    driver_store/
+        schema.json          columns, dtypes, categorical dictionaries, partitions
+        season=2021.npz      one uncompressed array per column
+        season=2022.npz
+        ...
+
+Categorical columns (driver, team, nationality) are stored as int32 codes into
+dictionaries shared by all partitions. `pos` is float32 with NaN for
+unclassified results (DNF/DSQ/NC - the raw text is kept in `status`), `pts`
+float64 and `season` int16. np.load reads .npz members lazily, so
+load_standings() only touches the requested seasons and columns.
+
+    python driver_store.py [driver_stats.csv] [driver_store/]
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+STORE_DIRNAME = "driver_store"
+SCHEMA_FILENAME = "schema.json"
+SCHEMA_VERSION = 1
+
+CATEGORICAL_COLUMNS = ("driver", "team", "nationality", "status")
+NUMERIC_COLUMNS = {"pos": "float32", "pts": "float64", "season": "int16"}
+COLUMNS = ("pos", "driver", "nationality", "team", "pts", "season", "status")
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """'POS.' -> 'pos', 'Season' -> 'season' (the scraper's raw headers)"""
+    df = df.copy()
+    df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
+    return df
+
+
+def partition_filename(season: int) -> str:
+    return f"season={int(season)}.npz"
+
+
+def find_store() -> Optional[str]:
+    """F1_DATA_STORE, then driver_store/ next to this script or in ../Scraper"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.environ.get("F1_DATA_STORE"),
+        os.path.join(script_dir, STORE_DIRNAME),
+        os.path.join(os.path.dirname(script_dir), "Scraper", STORE_DIRNAME),
+    ]
+    for candidate in candidates:
+        if candidate and os.path.exists(os.path.join(candidate, SCHEMA_FILENAME)):
+            return candidate
+    return None
+
+
+def _atomic_write(path: str, write) -> None:
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    os.fchmod(fd, 0o644)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def write_store(df: pd.DataFrame, root: str) -> dict:
+    """Write raw or normalized standings as a typed store; returns the schema.
+
+    The store is replaced as a whole: seasons missing from df are removed, so pass every season.
+    """
+    df = normalize_columns(df)
+    pos_numeric = pd.to_numeric(df['pos'], errors='coerce')
+    typed = pd.DataFrame({
+        "pos": pos_numeric.astype(NUMERIC_COLUMNS["pos"]),
+        "driver": df['driver'],
+        "nationality": df.get('nationality'),
+        "team": df.get('team'),
+        "pts": pd.to_numeric(df['pts'], errors='coerce').astype(NUMERIC_COLUMNS["pts"]),
+        "season": pd.to_numeric(df['season'], errors='coerce'),
+        # Raw position text only where it is not a number (e.g. "DQ", "NC")
+        "status": df['pos'].astype(str).where(pos_numeric.isna(), ""),
+    })
+    typed = typed.dropna(subset=['season'])
+    typed['season'] = typed['season'].astype(NUMERIC_COLUMNS["season"])
+
+    dictionaries: Dict[str, List[str]] = {}
+    codes: Dict[str, np.ndarray] = {}
+    for column in CATEGORICAL_COLUMNS:
+        values = typed[column].where(typed[column].notna(), None)
+        categories = sorted({str(v) for v in values if v is not None})
+        dictionaries[column] = categories
+        # Missing values get code -1
+        codes[column] = pd.Categorical(values, categories=categories).codes.astype(np.int32)
+
+    os.makedirs(root, exist_ok=True)
+    partitions = []
+    for season in sorted(typed['season'].unique()):
+        mask = (typed['season'] == season).to_numpy()
+        arrays = {column: typed[column].to_numpy()[mask] for column in NUMERIC_COLUMNS}
+        arrays.update({column: codes[column][mask] for column in CATEGORICAL_COLUMNS})
+        filename = partition_filename(season)
+        _atomic_write(os.path.join(root, filename), lambda f: np.savez(f, **arrays))
+        partitions.append({"season": int(season), "file": filename, "rows": int(mask.sum())})
+
+    schema = {
+        "version": SCHEMA_VERSION,
+        "columns": list(COLUMNS),
+        "dtypes": {**NUMERIC_COLUMNS, **{c: "category" for c in CATEGORICAL_COLUMNS}},
+        "dictionaries": dictionaries,
+        "partitions": partitions,
+    }
+    # Schema last: readers never see partitions it does not describe
+    _atomic_write(os.path.join(root, SCHEMA_FILENAME),
+                  lambda f: f.write(json.dumps(schema, ensure_ascii=False, indent=1).encode("utf-8")))
+
+    known = {p["file"] for p in partitions}
+    for name in os.listdir(root):
+        if name.startswith("season=") and name.endswith(".npz") and name not in known:
+            os.remove(os.path.join(root, name))
+    return schema
+
+
+class DriverStore:
+    """Reader for a store directory written by write_store()"""
+
+    def __init__(self, root: Optional[str] = None):
+        root = root or find_store()
+        if root is None:
+            raise FileNotFoundError(f"No {STORE_DIRNAME}/ found; build one with `python driver_store.py`")
+        self.root = root
+        with open(os.path.join(root, SCHEMA_FILENAME), encoding="utf-8") as f:
+            self.schema = json.load(f)
+        if self.schema.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported driver store version {self.schema.get('version')} in {root}")
+        self.partitions = {p["season"]: p for p in self.schema["partitions"]}
+        self._categories = {
+            column: pd.CategoricalDtype(categories, ordered=False)
+            for column, categories in self.schema["dictionaries"].items()
+        }
+
+    @property
+    def seasons(self) -> List[int]:
+        return sorted(self.partitions)
+
+    @property
+    def rows(self) -> int:
+        return sum(p["rows"] for p in self.partitions.values())
+
+    def load(self, columns: Optional[Sequence[str]] = None, seasons: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        """Selected columns (in the order given) for selected seasons, in season order"""
+        columns = list(COLUMNS) if columns is None else list(columns)
+        unknown = [c for c in columns if c not in COLUMNS]
+        if unknown:
+            raise KeyError(f"Unknown columns {unknown}; available: {list(COLUMNS)}")
+        wanted = self.seasons if seasons is None else sorted({int(s) for s in seasons} & set(self.partitions))
+
+        parts: Dict[str, List[np.ndarray]] = {column: [] for column in columns}
+        for season in wanted:
+            with np.load(os.path.join(self.root, self.partitions[season]["file"])) as partition:
+                for column in columns:
+                    parts[column].append(partition[column])
+
+        data = {}
+        for column in columns:
+            if column in NUMERIC_COLUMNS:
+                array = np.concatenate(parts[column]) if parts[column] else np.array([], dtype=NUMERIC_COLUMNS[column])
+                data[column] = array
+            else:
+                codes = np.concatenate(parts[column]) if parts[column] else np.array([], dtype=np.int32)
+                data[column] = pd.Categorical.from_codes(codes, dtype=self._categories[column])
+        return pd.DataFrame(data, columns=columns)
+
+
+def load_standings(columns: Optional[Sequence[str]] = None, seasons: Optional[Iterable[int]] = None,
+                   root: Optional[str] = None) -> pd.DataFrame:
+    """Typed standings from the store: categorical driver/team, numeric pos/pts/season"""
+    return DriverStore(root).load(columns, seasons)
+
+
+if __name__ == "__main__":
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(script_dir), "Scraper", "driver_stats.csv")
+    out_dir = sys.argv[2] if len(sys.argv) > 2 else os.path.join(os.path.dirname(csv_path), STORE_DIRNAME)
+    schema = write_store(pd.read_csv(csv_path), out_dir)
+    print(f"✅ Wrote {sum(p['rows'] for p in schema['partitions'])} rows in "
+          f"{len(schema['partitions'])} season partitions to {out_dir}")
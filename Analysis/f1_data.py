@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+"""
+Shared, cached loader for the cleaned driver standings.
+
+Every script used to find driver_stats.csv on its own and repeat the same
+cleaning. load_dataset() does it in one place:
+
+1. resolve the source: F1_DATA_SOURCE, else the typed season store
+   (driver_store.py), else driver_stats.csv next to this script, in ../Scraper
+   or in the working directory
+2. clean once: normalized column names, numeric pos/pts/season, driver names
+   with the glued code stripped (driver_clean / driver_code) and a `classified`
+   flag that is False for DNF/DSQ/NC (non-numeric positions)
+3. persist the cleaned frame to .f1_cache/ keyed by the source's sha256 (and
+   CLEANING_VERSION), so later runs unpickle it instead of cleaning again
+
+    df = load_dataset()                          # every row
+    df = load_dataset(classified_only=True)      # DNF/DSQ rows dropped, for training
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import tempfile
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from driver_store import SCHEMA_FILENAME, DriverStore, find_store, normalize_columns
+from team_resolver import encode_teams
+
+# Bump when clean_standings() changes so cached frames are rebuilt
+CLEANING_VERSION = 2
+
+# Scraped names carry a 2-3 letter code, e.g. "Max VerstappenVER"
+DRIVER_CODE_PATTERN = re.compile(r'^(.*?)\s?([A-Z]{2,3})$')
+
+# Inputs of the served position classifier, in order
+POSITION_FEATURES = ['season', 'team_encoded', 'driver_experience']
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cache_dir() -> str:
+    return os.environ.get("F1_CACHE_DIR", os.path.join(_repo_root(), ".f1_cache"))
+
+
+def resolve_source() -> str:
+    """Path of the dataset to load (a store directory or a CSV file)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.environ.get("F1_DATA_SOURCE"),
+        find_store(),
+        os.path.join(script_dir, "driver_stats.csv"),
+        os.path.join(_repo_root(), "Scraper", "driver_stats.csv"),
+        "driver_stats.csv",
+    ]
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError("No driver standings found (driver_store/ or driver_stats.csv)")
+
+
+def _source_files(source: str) -> List[str]:
+    if not os.path.isdir(source):
+        return [source]
+    return [os.path.join(source, name) for name in sorted(os.listdir(source))
+            if name == SCHEMA_FILENAME or name.endswith(".npz")]
+
+
+def source_fingerprint(source: str) -> str:
+    """sha256 over the source file (or every file of a store directory)"""
+    digest = hashlib.sha256(f"cleaning-v{CLEANING_VERSION}".encode())
+    for path in _source_files(source):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_source(source: str) -> pd.DataFrame:
+    if os.path.isdir(source):
+        return DriverStore(source).load()
+    return normalize_columns(pd.read_csv(source))
+
+
+def split_driver_code(driver: str) -> Tuple[str, Optional[str]]:
+    """'Max VerstappenVER' -> ('Max Verstappen', 'VER'); names without a code are returned as-is.
+
+    The only place driver codes are stripped: the cleaned standings, the driver
+    search, the historical index and the race results store all call this.
+    """
+    text = ' '.join(str(driver).split())
+    match = DRIVER_CODE_PATTERN.match(text)
+    if match and match.group(1):
+        return match.group(1).strip(), match.group(2)
+    return text, None
+
+
+def clean_standings(df: pd.DataFrame) -> pd.DataFrame:
+    """The cleaning steps the API and training scripts share"""
+    df = normalize_columns(df)
+    df['pos'] = pd.to_numeric(df['pos'], errors='coerce')
+    df['pts'] = pd.to_numeric(df['pts'], errors='coerce')
+    df['season'] = pd.to_numeric(df['season'], errors='coerce')
+    df = df.dropna(subset=['season']).reset_index(drop=True)
+    df['season'] = df['season'].astype(int)
+
+    split = [split_driver_code(d) if isinstance(d, str) else (d, None) for d in df['driver']]
+    df['driver_clean'] = [name for name, _ in split]
+    df['driver_code'] = [code for _, code in split]
+
+    df['classified'] = df['pos'].notna()
+    return df
+
+
+def _atomic_pickle(obj, path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_dataset(columns: Optional[Sequence[str]] = None, seasons: Optional[Iterable[int]] = None,
+                 classified_only: bool = False, source: Optional[str] = None,
+                 use_cache: bool = True) -> pd.DataFrame:
+    """Cleaned standings, from the fingerprint-keyed cache when the source is unchanged"""
+    source = source or resolve_source()
+    df = None
+    cache_path = None
+    if use_cache:
+        cache_path = os.path.join(cache_dir(), f"standings-{source_fingerprint(source)[:24]}.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                df = pickle.load(f)
+        except FileNotFoundError:
+            df = None
+        except Exception as e:  # truncated file, pickle from another pandas version...
+            print(f"⚠️ Ignoring unreadable data cache {cache_path}: {e}")
+            df = None
+
+    if df is None:
+        df = clean_standings(read_source(source))
+        if cache_path is not None:
+            try:
+                _atomic_pickle(df, cache_path)
+            except OSError as e:
+                print(f"⚠️ Could not write data cache {cache_path}: {e}")
+
+    if seasons is not None:
+        df = df[df['season'].isin([int(s) for s in seasons])]
+    if classified_only:
+        df = df[df['classified']]
+    if columns is not None:
+        df = df[list(columns)]
+    return df.reset_index(drop=True) if (seasons is not None or classified_only) else df
+
+
+def row_keys(df: pd.DataFrame) -> pd.Series:
+    """Content key per standings row; a row whose result changes gets a new key"""
+    text = (df['season'].astype(str) + "|" + df['driver'].astype(str) + "|"
+            + df['team'].astype(str) + "|" + df['pos'].astype(str))
+    return text.map(lambda t: hashlib.sha1(t.encode("utf-8")).hexdigest()[:16])
+
+
+def position_training_frame(source: Optional[str] = None) -> pd.DataFrame:
+    """Classified rows with POSITION_FEATURES, the int `position` target and `row_key`"""
+    df = load_dataset(['driver', 'driver_clean', 'team', 'pos', 'season', 'classified'],
+                      classified_only=True, source=source)
+    df['team_encoded'] = encode_teams(df['team'])
+    # How many seasons each driver has raced
+    df['driver_experience'] = df.groupby('driver_clean')['season'].transform('nunique')
+    df['position'] = df['pos'].astype(int)
+    df['row_key'] = row_keys(df)
+    return df
+
+
+if __name__ == "__main__":
+    import time
+
+    source = resolve_source()
+    for label in ("first load", "second load"):
+        started = time.perf_counter()
+        df = load_dataset(source=source)
+        print(f"{label}: {len(df)} rows from {source} in {(time.perf_counter() - started) * 1000:.1f} ms")
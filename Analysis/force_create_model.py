@@ -9,6 +9,8 @@ import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 import joblib
 
+from model_loader import save_model
+
 def force_create_model():
     """Force create a new working model"""
     print("🔧 FORCE CREATING NEW MODEL")
@@ -85,22 +87,17 @@ def force_create_model():
         print("❌ Model test FAILED")
         return False
     
-    # Save model
+    # Save model together with its metadata (features, classes, content hash)
     print("Saving model...")
-    joblib.dump(model, "f1_position_predictor.joblib")
-    
-    # Save model info
-    model_info = {
+    save_model(model, {
         'features': ['season', 'team_encoded', 'driver_experience'],
         'team_mapping': {
             "Red Bull Racing": 0, "Mercedes": 1, "Ferrari": 2, "McLaren": 3,
             "Aston Martin": 4, "Alpine": 5, "Haas": 6, "RB": 7,
             "Williams": 8, "Kick Sauber": 9
         },
-        'model_type': 'position_classification',
-        'classes': model.classes_.tolist()
-    }
-    joblib.dump(model_info, "f1_model_info.joblib")
+        'model_type': 'position_classification'
+    }, "f1_position_predictor.joblib", "f1_model_info.joblib")
     
     print("✅ Model created and saved successfully!")
     
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+"""
+In-memory indexes over the historical standings, built once at load time.
+
+get_historical_data used to filter the whole DataFrame by season and run
+several str.contains scans per request. HistoricalIndex keeps:
+
+- season -> row block (plain dict records, in file order)
+- season -> normalized driver token -> row offsets within the block
+- season -> every 1-3 character substring of a driver name (with and without
+  spaces) -> sorted row offsets
+- (season, team code) -> best-points row, with teams resolved by the
+  shared team_resolver
+
+Driver lookups keep the old precedence (first name, then last name, then the
+space-stripped full name; first matching row in file order wins). Matches are
+literal, case-insensitive substrings. A needle of up to three characters is
+answered by the first offset of its posting list; a longer one only checks
+the rows holding its rarest trigram (bounded by an exact token hit), in file
+order. A miss or prefix query therefore costs O(k) in that posting list, which
+is the whole season only when every name shares the trigram.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from f1_data import split_driver_code
+from team_resolver import UNKNOWN_TEAM_CODE, resolve_team
+
+# Substring postings hold every 1..GRAM character slice of each driver name
+GRAM = 3
+
+
+def driver_tokens(driver: str) -> List[str]:
+    """Lower-cased name tokens, as scraped and with the glued driver code stripped"""
+    return str(driver).lower().split() + split_driver_code(driver)[0].lower().split()
+
+
+def substrings(text: str, max_len: int = GRAM) -> Set[str]:
+    """Every substring of text up to max_len characters"""
+    return {text[i:i + n] for n in range(1, max_len + 1) for i in range(len(text) - n + 1)}
+
+
+def add_postings(postings: Dict[str, List[int]], keys: Iterable[str], offset: int) -> None:
+    # Offsets arrive in increasing order, so every posting list stays sorted
+    for key in keys:
+        postings.setdefault(key, []).append(offset)
+
+
+class SeasonBlock:
+    """Rows of one season plus the lookup structures derived from them"""
+
+    def __init__(self, records: List[dict]):
+        self.records = records
+        drivers = [r.get('driver') for r in records]
+        self.lowered = [str(d).lower() if isinstance(d, str) else None for d in drivers]
+        self.lowered_no_spaces = [d.replace(" ", "") if d is not None else None for d in self.lowered]
+        self.first_named = next((offset for offset, d in enumerate(self.lowered) if d is not None), None)
+        self.tokens: Dict[str, List[int]] = {}
+        self.grams: Dict[str, List[int]] = {}
+        self.grams_no_spaces: Dict[str, List[int]] = {}
+        for offset, driver in enumerate(drivers):
+            if not isinstance(driver, str):
+                continue
+            add_postings(self.tokens, dict.fromkeys(driver_tokens(driver)), offset)
+            add_postings(self.grams, substrings(self.lowered[offset]), offset)
+            add_postings(self.grams_no_spaces, substrings(self.lowered_no_spaces[offset]), offset)
+        self.best_by_team: Dict[int, dict] = {}
+
+    def first_containing(self, needle: str, no_spaces: bool = False) -> Optional[dict]:
+        """First row (in file order) whose driver contains needle, case-insensitively"""
+        needle = needle.lower()
+        haystacks, postings = (self.lowered_no_spaces, self.grams_no_spaces) if no_spaces else (self.lowered, self.grams)
+        if not needle:
+            return self.records[self.first_named] if self.first_named is not None else None
+        # Up to GRAM characters the postings are exact: their first offset is the answer
+        if len(needle) <= GRAM:
+            rows = postings.get(needle)
+            return self.records[rows[0]] if rows else None
+
+        # Longer needles: a row containing the needle holds its rarest trigram, so only that
+        # posting list is checked, in file order; an exact token hit bounds it (only earlier
+        # rows can still win)
+        token_rows = self.tokens.get(needle) if not no_spaces else None
+        end = token_rows[0] if token_rows else len(haystacks)
+        rarest = min((postings.get(needle[i:i + GRAM], ()) for i in range(len(needle) - GRAM + 1)), key=len)
+        for offset in rarest:
+            if offset >= end:
+                break
+            if needle in haystacks[offset]:
+                return self.records[offset]
+        return self.records[end] if token_rows else None
+
+
+class HistoricalIndex:
+    """Season, driver-token and team indexes over a cleaned standings DataFrame"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.seasons: Dict[int, SeasonBlock] = {}
+        for season, group in df.groupby('season', sort=True):
+            self.seasons[int(season)] = SeasonBlock(group.to_dict('records'))
+
+        for block in self.seasons.values():
+            for record in block.records:
+                team_code = resolve_team(record.get('team'))
+                if team_code == UNKNOWN_TEAM_CODE:
+                    continue
+                best = block.best_by_team.get(team_code)
+                # Keep the first of equal maxima, like DataFrame.idxmax; NaN points never win
+                if best is None or (pd.notna(record.get('pts')) and (pd.isna(best.get('pts')) or record['pts'] > best['pts'])):
+                    block.best_by_team[team_code] = record
+
+    def season(self, season: int) -> Optional[SeasonBlock]:
+        return self.seasons.get(int(season))
+
+    def find_driver(self, season: int, driver_name: str) -> Optional[dict]:
+        """First-name, then last-name, then space-stripped full-name match within a season"""
+        block = self.season(season)
+        if block is None:
+            return None
+
+        driver_name_clean = driver_name.strip()
+        parts = driver_name_clean.split()
+        first_name = parts[0] if parts else ""
+        last_name = parts[-1] if len(parts) > 1 else ""
+
+        result = block.first_containing(first_name) if first_name else None
+        if result is None and last_name:
+            result = block.first_containing(last_name)
+        if result is None:
+            result = block.first_containing(driver_name_clean.replace(" ", ""), no_spaces=True)
+        return result
+
+    def find_team(self, season: int, team_encoded: int) -> Optional[dict]:
+        """Best-points row for a team code in a season"""
+        block = self.season(season)
+        return block.best_by_team.get(team_encoded) if block is not None else None
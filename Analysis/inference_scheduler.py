@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+"""
+Micro-batching scheduler for live model inference.
+
+Concurrent /predict calls each used to run their own tiny predict_proba in
+FastAPI's threadpool, contending for the GIL. The scheduler queues feature rows
+and a single worker thread flushes them as one matrix once either
+max_batch_size rows are waiting or the oldest row has waited max_wait_ms.
+Each caller blocks on a Future that resolves to its own (position, confidence).
+
+Configured per deployment through the environment:
+    F1_BATCH_ENABLED      1/0 (default 1)
+    F1_BATCH_MAX_SIZE     rows per flush (default 64)
+    F1_BATCH_MAX_WAIT_MS  max queueing delay for the first row (default 2)
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# score_batch(X) -> (positions, confidences), one entry per row of X
+ScoreBatch = Callable[[np.ndarray], Tuple[Sequence[int], Sequence[float]]]
+
+HISTOGRAM_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+# Batches above the largest bucket (F1_BATCH_MAX_SIZE can exceed it) are counted here
+OVERFLOW_BUCKET = f">{HISTOGRAM_BUCKETS[-1]}"
+
+
+class InferenceScheduler:
+    """Coalesces single-row inference requests into batched model calls"""
+
+    def __init__(self, score_batch: ScoreBatch, max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.score_batch = score_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self._closed = False
+        self._start_lock = threading.Lock()
+        self._start()
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._queue: "queue.Queue[Tuple[list, Future, ScoreBatch]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._histogram: Dict[str, int] = {f"<={bucket}": 0 for bucket in HISTOGRAM_BUCKETS}
+        self._histogram[OVERFLOW_BUCKET] = 0
+        self._batches = 0
+        self._rows = 0
+        self._errors = 0
+        self._worker = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+        self._worker.start()
+
+    @classmethod
+    def from_env(cls, score_batch: ScoreBatch) -> "InferenceScheduler":
+        return cls(
+            score_batch,
+            max_batch_size=int(os.environ.get("F1_BATCH_MAX_SIZE", "64")),
+            max_wait_ms=float(os.environ.get("F1_BATCH_MAX_WAIT_MS", "2")),
+        )
+
+    def submit(self, row: Sequence[float], score_batch: Optional[ScoreBatch] = None) -> Future:
+        """Queue one feature row; the Future resolves to (position, confidence).
+
+        score_batch overrides the default scorer for this row, so a request keeps
+        the model it started with even if another model is swapped in meanwhile.
+        """
+        if self._closed:
+            raise RuntimeError("Inference scheduler is closed")
+        if self._pid != os.getpid():
+            # Threads do not survive fork(): a pre-forked worker gets its own queue and worker
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._start()
+        future: Future = Future()
+        self._queue.put((list(row), future, score_batch or self.score_batch))
+        return future
+
+    def predict(self, row: Sequence[float], timeout: float = 5.0) -> Tuple[int, float]:
+        return self.submit(row).result(timeout=timeout)
+
+    def _collect(self) -> List[Tuple[list, Future, ScoreBatch]]:
+        """Block for the first row, then gather until the size limit or its deadline"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            items = [item for item in batch if item is not None]
+            if items:
+                self._flush(items)
+            if len(items) < len(batch):
+                return  # close() sentinel
+
+    def _flush(self, items: List[Tuple[list, Future, ScoreBatch]]) -> None:
+        # Rows queued against different models are scored by their own model
+        # (bound methods of the same model compare equal, so they share a group)
+        groups: Dict[ScoreBatch, List[Tuple[list, Future, ScoreBatch]]] = {}
+        for item in items:
+            groups.setdefault(item[2], []).append(item)
+
+        for group in groups.values():
+            futures = [future for _, future, _ in group]
+            try:
+                positions, confidences = group[0][2](np.array([row for row, _, _ in group], dtype=float))
+                for future, position, confidence in zip(futures, positions, confidences):
+                    future.set_result((int(position), float(confidence)))
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+        self._record(len(items))
+
+    def _record(self, size: int) -> None:
+        bucket = next((f"<={b}" for b in HISTOGRAM_BUCKETS if size <= b), OVERFLOW_BUCKET)
+        with self._stats_lock:
+            self._histogram[bucket] += 1
+            self._batches += 1
+            self._rows += size
+
+    def stats(self) -> dict:
+        """Queue depth, batch-size histogram and totals for /metrics/inference"""
+        with self._stats_lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "batches": self._batches,
+                "rows": self._rows,
+                "errors": self._errors,
+                "mean_batch_size": (self._rows / self._batches) if self._batches else 0.0,
+                "batch_size_histogram": dict(self._histogram),
+            }
+
+    def close(self) -> None:
+        """Stop accepting rows and let the worker drain the queue"""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join(timeout=1.0)
+
+
+def scheduler_enabled() -> bool:
+    return os.environ.get("F1_BATCH_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
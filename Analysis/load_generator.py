@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+"""
+Async HTTP load generator for a running prediction API.
+
+Replays a weighted mix of /predict, /historical/{season} and /teams traffic
+over one pooled httpx.AsyncClient, either
+
+- open loop at a target rate (--rps): requests start on schedule whether or
+  not earlier ones finished, and latency is measured from the scheduled start
+  so a stalled server is not hidden (no coordinated omission), or
+- closed loop (--concurrency): N workers each send back-to-back.
+
+Payloads come from TEST_PREDICTIONS in Frontend/test_frontend_compatibility.py,
+the same fixtures the frontend compatibility check uses, so runs stay
+comparable across releases.
+
+    uvicorn main:app --port 8000 &
+    python load_generator.py --rps 200 --duration 30
+    python load_generator.py --concurrency 32 --requests 5000 --mix predict=0.8,historical=0.15,teams=0.05
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "Frontend"))
+
+from test_frontend_compatibility import TEST_PREDICTIONS
+
+DEFAULT_MIX = {"predict": 0.7, "historical": 0.2, "teams": 0.1}
+
+# Upper bounds in ms; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'predict=0.7,teams=0.3' -> normalized weights"""
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown endpoint {name!r}; choose from {list(DEFAULT_MIX)}")
+        mix[name] = float(weight)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("Mix weights must add up to more than 0")
+    return {name: weight / total for name, weight in mix.items()}
+
+
+def build_requests(mix: Dict[str, float], count: int, seed: int) -> List[Tuple[str, str, str, Optional[dict]]]:
+    """(endpoint, method, path, body) for each request, drawn from the mix"""
+    rng = random.Random(seed)
+    seasons = sorted({p["season"] for p in TEST_PREDICTIONS})
+    names, weights = zip(*mix.items())
+    requests = []
+    for i, endpoint in enumerate(rng.choices(names, weights=weights, k=count)):
+        if endpoint == "predict":
+            requests.append((endpoint, "POST", "/predict", TEST_PREDICTIONS[i % len(TEST_PREDICTIONS)]))
+        elif endpoint == "historical":
+            requests.append((endpoint, "GET", f"/historical/{seasons[i % len(seasons)]}", None))
+        else:
+            requests.append((endpoint, "GET", "/teams", None))
+    return requests
+
+
+class LoadStats:
+    """Latencies, statuses and errors per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.outcomes: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    def record(self, endpoint: str, latency_ms: float, outcome: str) -> None:
+        self.latencies.setdefault(endpoint, []).append(latency_ms)
+        self.outcomes[outcome] += 1
+        if outcome != "200":
+            self.errors[f"{endpoint}: {outcome}"] += 1
+
+    def all_latencies(self) -> np.ndarray:
+        return np.concatenate([np.asarray(v) for v in self.latencies.values()]) if self.latencies else np.array([])
+
+    def histogram(self) -> List[Tuple[str, int]]:
+        values = self.all_latencies()
+        edges = (0,) + HISTOGRAM_BUCKETS_MS + (float("inf"),)
+        labels = [f"<= {b} ms" for b in HISTOGRAM_BUCKETS_MS] + [f"> {HISTOGRAM_BUCKETS_MS[-1]} ms"]
+        counts, _ = np.histogram(values, bins=edges)
+        return list(zip(labels, counts.tolist()))
+
+    def summary(self, elapsed: float, target_rps: Optional[float]) -> dict:
+        def percentiles(values):
+            values = np.asarray(values)
+            if not len(values):
+                return {}
+            return {f"p{p}_ms": round(float(np.percentile(values, p)), 3) for p in (50, 95, 99)}
+
+        total = sum(len(v) for v in self.latencies.values())
+        return {
+            "requests": total,
+            "elapsed_s": round(elapsed, 3),
+            "achieved_rps": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            "target_rps": target_rps,
+            "ok": self.outcomes.get("200", 0),
+            "errors": dict(self.errors),
+            "latency": percentiles(self.all_latencies()),
+            "by_endpoint": {name: {"requests": len(v), **percentiles(v)} for name, v in sorted(self.latencies.items())},
+            "histogram": dict(self.histogram()),
+        }
+
+
+async def _send(client: httpx.AsyncClient, stats: LoadStats, endpoint: str, method: str, path: str,
+                body: Optional[dict], started: float) -> None:
+    try:
+        response = await client.request(method, path, json=body)
+        outcome = str(response.status_code)
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    stats.record(endpoint, (time.perf_counter() - started) * 1000, outcome)
+
+
+async def run_load(base_url: str, requests: List[Tuple[str, str, str, Optional[dict]]],
+                   rps: Optional[float] = None, concurrency: int = 16, duration: Optional[float] = None,
+                   timeout: float = 10.0, transport: Optional[httpx.AsyncBaseTransport] = None) -> dict:
+    """Replay requests open-loop at rps, or closed-loop with `concurrency` workers"""
+    stats = LoadStats()
+    limits = httpx.Limits(max_connections=max(concurrency, 1), max_keepalive_connections=max(concurrency, 1))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits, transport=transport) as client:
+        started = time.perf_counter()
+        deadline = started + duration if duration else None
+        if rps:
+            tasks = []
+            for i, (endpoint, method, path, body) in enumerate(requests):
+                scheduled = started + i / rps
+                if deadline and scheduled >= deadline:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(_send(client, stats, endpoint, method, path, body, scheduled)))
+            await asyncio.gather(*tasks)
+        else:
+            queue = iter(requests)
+
+            async def worker():
+                for endpoint, method, path, body in queue:
+                    if deadline and time.perf_counter() >= deadline:
+                        return
+                    await _send(client, stats, endpoint, method, path, body, time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return stats.summary(elapsed, rps)
+
+
+def print_summary(summary: dict) -> None:
+    target = f" (target {summary['target_rps']})" if summary["target_rps"] else ""
+    print(f"\n📊 {summary['requests']} requests in {summary['elapsed_s']:.2f}s: "
+          f"{summary['achieved_rps']} req/s{target}, {summary['ok']} OK")
+    latency = summary["latency"]
+    if latency:
+        print(f"⏱️ p50 {latency['p50_ms']} ms, p95 {latency['p95_ms']} ms, p99 {latency['p99_ms']} ms")
+    for name, stats in summary["by_endpoint"].items():
+        print(f"   {name:<11}{stats['requests']:>7} req  p50 {stats.get('p50_ms', 0):>8} ms  p95 {stats.get('p95_ms', 0):>8} ms")
+
+    print("\nLatency histogram:")
+    peak = max(summary["histogram"].values()) or 1
+    for label, count in summary["histogram"].items():
+        print(f"  {label:>12} {count:>7} {'█' * round(40 * count / peak)}")
+
+    if summary["errors"]:
+        print("\n❌ Errors:")
+        for key, count in sorted(summary["errors"].items(), key=lambda kv: -kv[1]):
+            print(f"  {key}: {count}")
+    else:
+        print("\n✅ No errors")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Async load generator for the prediction API")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()))
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--rps", type=float, help="Open loop: start requests at this rate")
+    mode.add_argument("--concurrency", type=int, default=16, help="Closed loop: requests in flight")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests to send (upper bound with --duration)")
+    parser.add_argument("--duration", type=float, help="Stop starting new requests after this many seconds")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", dest="json_path", help="Write the summary to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+    count = args.requests
+    if args.duration and args.rps:
+        count = max(count, int(args.rps * args.duration))
+    requests = build_requests(mix, count, args.seed)
+
+    print(f"🚀 {len(requests)} requests to {args.url} "
+          f"({'%g req/s' % args.rps if args.rps else '%d concurrent' % args.concurrency}), mix {mix}")
+    summary = asyncio.run(run_load(args.url, requests, rps=args.rps, concurrency=args.concurrency,
+                                   duration=args.duration, timeout=args.timeout))
+    print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 0 if not summary["errors"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
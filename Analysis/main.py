@@ -1,11 +1,37 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-import joblib
-import numpy as np
-import pandas as pd
+import gc
+import hmac
+import json
+import math
 import os
-from typing import Optional, List
+import threading
+import time
+from typing import Any, Dict, Optional, List, Tuple
+
+# Startup is profiled per phase (startup_profile.py): the report is logged once
+# the app is ready, and F1_STARTUP_BUDGET_MS turns a slow cold start into an error.
+from startup_profile import StartupProfiler, api_logger
+
+startup = StartupProfiler()
+log = api_logger()
+
+with startup.phase("web imports"):
+    from fastapi import FastAPI, Header, HTTPException, Query, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from pydantic import BaseModel, TypeAdapter, ValidationError
+
+with startup.phase("data imports"):
+    import numpy as np
+    from model_loader import find_model_artifact, load_model
+    from model_registry import VERSION_LENGTH, ModelRegistry, ServingModel
+    from historical_index import HistoricalIndex
+    from driver_search import DriverSearchIndex
+    from f1_data import load_dataset, resolve_source
+    from race_results import RaceResultsDB, find_race_db
+    from team_resolver import TEAM_MAPPING, team_name
+    from season_payloads import build_season_payloads, etag_matches, parse_fields, position_value
+    from inference_scheduler import InferenceScheduler, scheduler_enabled
+    from race_grid import assign_grid, expected_positions
+    from race_simulator import simulate_race
 
 app = FastAPI(title="F1 Position Predictor API", version="2.0.0")
 
@@ -18,164 +44,118 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
-# Load your trained ML model for position prediction
-model_path = "f1_position_predictor.joblib"
-info_path = "f1_model_info.joblib"
+# Load the pre-trained position model: the registry's CURRENT version if one is
+# published, else the standalone artifact. Startup never trains: a missing or
+# inconsistent artifact raises ModelArtifactError and the app refuses to start.
+model_registry = ModelRegistry()
+
+def load_serving_model(version: Optional[str] = None) -> ServingModel:
+    """Load (but do not activate) a model version, building its prediction table"""
+    if version is not None or model_registry.current_version() is not None:
+        return model_registry.load(version)
+    model_path, info_path = find_model_artifact()
+    model, model_info = load_model(model_path, info_path)
+    return ServingModel(model, model_info, model_info['model_sha256'][:VERSION_LENGTH], model_path)
+
+# Unpickling the forest imports sklearn (and with it scipy and pandas): the bulk of a cold start
+with startup.phase("model"):
+    serving = load_serving_model()
+    serving.warm_up()
+# Module-level aliases for scripts that inspect main.model / main.model_info
+model, model_info, prediction_table = serving.model, serving.model_info, serving.table
+log.info(f"✅ Loaded {type(model).__name__} version {serving.version} from {serving.source}")
+log.info(f"✅ Model classes: {model_info['classes']}")
+log.info(f"✅ Prediction table ready: {prediction_table.positions.size} cells")
+
+reload_lock = threading.Lock()
+reload_status: Dict[str, Any] = {"state": "idle", "version": serving.version, "error": None, "finished_at": None}
+
+def swap_serving_model(version: Optional[str] = None) -> ServingModel:
+    """Load and warm a version, then atomically make it the one new requests use.
+
+    Requests already running keep the ServingModel they captured and finish on it.
+    """
+    global serving, model, model_info, prediction_table
+    with reload_lock:
+        candidate = load_serving_model(version)
+        candidate.warm_up()
+        serving = candidate
+        model, model_info, prediction_table = candidate.model, candidate.model_info, candidate.table
+    log.info(f"🔄 Now serving model version {candidate.version}")
+    return candidate
+
+def reload_in_background(version: Optional[str] = None) -> None:
+    def run():
+        reload_status.update(state="loading", error=None)
+        try:
+            swapped = swap_serving_model(version)
+            reload_status.update(state="idle", version=swapped.version)
+        except Exception as e:
+            log.error(f"❌ Model reload failed, still serving {serving.version}: {e}")
+            reload_status.update(state="failed", error=str(e))
+        reload_status["finished_at"] = time.time()
+    threading.Thread(target=run, name="model-reload", daemon=True).start()
+
+def watch_registry(interval: float) -> None:
+    """Poll the registry's CURRENT pointer and hot-swap when it moves"""
+    def run():
+        while True:
+            time.sleep(interval)
+            current = model_registry.current_version()
+            if current and current != serving.version and reload_status["state"] != "loading":
+                log.info(f"👀 Registry CURRENT moved to {current}")
+                reload_in_background(current)
+    threading.Thread(target=run, name="model-watcher", daemon=True).start()
+
+# Team mapping for encoding (shared with the training scripts)
+team_mapping = TEAM_MAPPING
 
-# FORCE DELETE old model files to ensure fresh start
-if os.path.exists(model_path):
-    try:
-        os.remove(model_path)
-        print(f"🗑️ Deleted old model file: {model_path}")
-    except:
-        pass
+def get_team_name(team_encoded: int) -> str:
+    """Convert team encoding back to team name"""
+    return team_name(team_encoded)
 
-if os.path.exists(info_path):
+# Load the cleaned historical standings (shared loader, cached by source hash)
+historical_data = None
+with startup.phase("historical data"):
     try:
-        os.remove(info_path)
-        print(f"🗑️ Deleted old info file: {info_path}")
-    except:
-        pass
-
-# Check for old model files in parent directory
-old_model_paths = [
-    "../f1_predictor.joblib",
-    "f1_predictor.joblib",
-    "../f1_model.joblib",
-    "f1_model.joblib"
-]
-
-for old_path in old_model_paths:
-    if os.path.exists(old_path):
-        try:
-            os.remove(old_path)
-            print(f"🗑️ Deleted old model file: {old_path}")
-        except:
-            pass
-
-print(f"🔄 Creating fresh position prediction model...")
-
-# Create a simple but working CLASSIFIER model (not regressor!)
-from sklearn.ensemble import RandomForestClassifier
-import numpy as np
-
-# Simple training data that guarantees valid position predictions
-X_simple = np.array([
-    [2020, 0, 5],  # Red Bull, experienced -> Position 1
-    [2020, 0, 3],  # Red Bull, medium -> Position 2  
-    [2021, 1, 8],  # Mercedes, very experienced -> Position 1
-    [2021, 1, 4],  # Mercedes, experienced -> Position 3
-    [2022, 2, 6],  # Ferrari, experienced -> Position 2
-    [2022, 2, 2],  # Ferrari, rookie -> Position 4
-    [2023, 3, 4],  # McLaren, experienced -> Position 5
-    [2023, 3, 1],  # McLaren, rookie -> Position 8
-    [2024, 4, 3],  # Aston Martin -> Position 6
-    [2024, 5, 2],  # Alpine -> Position 9
-    [2020, 6, 1],  # Haas -> Position 12
-    [2021, 7, 3],  # RB -> Position 10
-    [2022, 8, 2],  # Williams -> Position 15
-    [2023, 9, 1],  # Kick Sauber -> Position 18
-])
-
-y_simple = np.array([1, 2, 1, 3, 2, 4, 5, 8, 6, 9, 12, 10, 15, 18])
-
-print(f"📊 Training data shape: {X_simple.shape}")
-print(f"🎯 Positions to predict: {sorted(set(y_simple))}")
-
-# Create CLASSIFIER (not regressor!)
-model = RandomForestClassifier(n_estimators=10, random_state=42)
-model.fit(X_simple, y_simple)
-
-print(f"✅ Model type: {type(model).__name__}")
-print(f"✅ Model classes: {model.classes_}")
-
-# Verify the model works with test cases
-test_cases = [
-    [2023, 0, 5],  # Red Bull, experienced
-    [2024, 1, 8],  # Mercedes, very experienced  
-    [2023, 4, 3],  # Aston Martin, medium (your failing case)
-]
-
-print("🧪 Testing model predictions:")
-for i, test_case in enumerate(test_cases):
-    pred = model.predict([test_case])
-    proba = model.predict_proba([test_case])
-    print(f"  Test {i+1}: {test_case} -> Position {pred[0]}, Confidence: {max(proba[0]):.3f}")
-
-# Save model
-import joblib
-joblib.dump(model, model_path)
-print(f"💾 Fresh CLASSIFIER model saved to {model_path}")
-
-# Verify saved model
-try:
-    loaded_model = joblib.load(model_path)
-    print(f"✅ Model verification: {type(loaded_model).__name__}")
-    test_pred = loaded_model.predict([[2023, 4, 3]])
-    test_proba = loaded_model.predict_proba([[2023, 4, 3]])
-    print(f"✅ Verification test: Aston Martin 2023 -> P{test_pred[0]}, Conf: {max(test_proba[0]):.3f}")
-except Exception as e:
-    print(f"❌ Model verification failed: {e}")
-
-model = loaded_model  # Use the verified loaded model
-
-# Team mapping for encoding
-team_mapping = {
-    "Red Bull Racing": 0, "Mercedes": 1, "Ferrari": 2, "McLaren": 3,
-    "Aston Martin": 4, "Alpine": 5, "Haas": 6, "RB": 7,
-    "Williams": 8, "Kick Sauber": 9, "AlphaTauri": 7, "Alfa Romeo": 9
-}
-
-# Load model info (after team_mapping is defined)
-if os.path.exists(info_path):
-    model_info = joblib.load(info_path)
-    print(f"✅ Model info loaded: {model_info}")
-else:
-    print("⚠️ Model info not found, creating default info...")
-    model_info = {
-        'features': ['season', 'team_encoded', 'driver_experience'],
-        'team_mapping': team_mapping,
-        'model_type': 'position_classification'
-    }
-    # Save default model info
-    import joblib
-    joblib.dump(model_info, info_path)
-    print(f"✅ Default model info saved to {info_path}")
+        historical_source = resolve_source()
+        historical_data = load_dataset(source=historical_source)
+        log.info(f"✅ Historical data loaded from {historical_source}")
+        log.debug(f"📊 {len(historical_data)} rows, columns: {list(historical_data.columns)}")
+        log.debug(f"📈 Available seasons: {sorted(historical_data['season'].unique().tolist())}")
+    except Exception as e:
+        log.error(f"❌ Error loading historical data: {e}")
 
-# Load historical data for lookups
-historical_data = None
-current_dir = os.path.dirname(os.path.abspath(__file__))
-csv_files = [
-    os.path.join(current_dir, "driver_stats.csv"),
-    os.path.join(current_dir, "..", "Scraper", "driver_stats.csv"),
-    "driver_stats.csv",  # relative path as fallback
-    "../Scraper/driver_stats.csv"  # original relative path
-]
-print(f"🔍 Looking for historical data files...")
-print(f"🔍 Current directory: {os.getcwd()}")
-print(f"🔍 Script directory: {current_dir}")
-
-for csv_file in csv_files:
-    print(f"🔍 Checking: {csv_file}")
-    if os.path.exists(csv_file):
-        print(f"📁 File exists: {csv_file}")
+historical_index = None
+driver_search_index = None
+season_payloads = None
+if historical_data is None:
+    log.warning("⚠️ No historical data found - predictions only mode")
+else:
+    with startup.phase("indexes"):
+        # Build season / driver / team indexes once instead of scanning per request
+        historical_index = HistoricalIndex(historical_data)
+        log.info(f"✅ Historical index built: {len(historical_index.seasons)} seasons")
+        driver_search_index = DriverSearchIndex(historical_data.to_dict('records'))
+        log.info(f"✅ Driver search index built: {len(driver_search_index.drivers)} drivers")
+        # Season responses are encoded to JSON bytes once and served as-is
+        season_payloads = build_season_payloads({season: block.records for season, block in historical_index.seasons.items()})
+        log.info(f"✅ Season payloads pre-serialized: {sorted(season_payloads)}")
+
+# Per-race classifications (race_results.sqlite, from f1_scraper.py --races), if ingested
+race_db = None
+race_db_path = find_race_db()
+if race_db_path is None:
+    log.warning("⚠️ No per-race results found - race_name lookups disabled")
+else:
+    with startup.phase("race results"):
         try:
-            historical_data = pd.read_csv(csv_file)
-            print(f"📊 CSV loaded, shape: {historical_data.shape}")
-            historical_data.columns = historical_data.columns.str.strip().str.lower().str.replace('.', '', regex=False)
-            print(f"✅ Historical data loaded from {csv_file}")
-            print(f"📋 Columns: {list(historical_data.columns)}")
-            print(f"📈 Available seasons: {sorted(historical_data['season'].unique()) if 'season' in historical_data.columns else 'NO SEASON COLUMN'}")
-            break
+            race_db = RaceResultsDB(race_db_path, readonly=True)
+            race_summary = race_db.summary()
+            log.info(f"✅ Race results loaded from {race_db_path}: {race_summary['results']} results, {race_summary['races']} races")
         except Exception as e:
-            print(f"❌ Error loading {csv_file}: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print(f"❌ File not found: {csv_file}")
-
-if historical_data is None:
-    print("⚠️ No historical data found - predictions only mode")
+            log.error(f"❌ Error loading race results: {e}")
+            race_db = None
 
 class PredictRequest(BaseModel):
     season: int
@@ -191,6 +171,22 @@ class HistoricalResult(BaseModel):
     team: Optional[str]
     season: int
 
+class RaceResult(BaseModel):
+    season: int
+    round: int
+    race_name: Optional[str]
+    driver: Optional[str]
+    team: Optional[str]
+    actual_position: Optional[int]
+    status: Optional[str] = None  # DNF/DSQ/NC when not classified
+    points: float
+    laps: Optional[int] = None
+
+class ActualResultRequest(BaseModel):
+    season: int
+    driver_name: str
+    race_name: str
+
 class PredictResponse(BaseModel):
     predicted_position: int
     prediction_confidence: float
@@ -199,231 +195,478 @@ class PredictResponse(BaseModel):
     driver_name: Optional[str] = None
     race_name: Optional[str] = None
     historical_result: Optional[HistoricalResult] = None
+    race_result: Optional[RaceResult] = None
     is_historical: bool
 
-def get_team_name(team_encoded: int) -> str:
-    """Convert team encoding back to team name"""
-    print(f"DEBUG: get_team_name called with team_encoded = {team_encoded} (type: {type(team_encoded)})")
-    for team, encoding in team_mapping.items():
-        if encoding == team_encoded:
-            print(f"DEBUG: Found team match: {team} for encoding {team_encoded}")
-            return team
-    print(f"DEBUG: No team found for encoding {team_encoded}, returning default")
-    return f"Team {team_encoded}"
+class BatchPredictItem(BaseModel):
+    index: int
+    prediction: Optional[PredictResponse] = None
+    error: Optional[str] = None
+
+class BatchPredictResponse(BaseModel):
+    count: int
+    errors: int
+    results: List[BatchPredictItem]
+
+predict_requests_adapter = TypeAdapter(List[PredictRequest])
+
+# Largest list /predict/batch accepts (1000 rows take ~15 ms end to end)
+MAX_BATCH_ITEMS = 5000
+
+class GridEntry(BaseModel):
+    driver_name: Optional[str] = None
+    team_encoded: int
+    driver_experience: Optional[int] = 3
+
+class GridRequest(BaseModel):
+    season: int
+    race_name: Optional[str] = None
+    entries: List[GridEntry]
+
+class GridSlot(BaseModel):
+    position: int
+    driver_name: Optional[str] = None
+    team_encoded: int
+    team_name: Optional[str] = None
+    probability: float  # probability of finishing exactly in this position
+    independent_position: int  # what /predict would answer for this driver alone
+    expected_position: float
+
+class GridResponse(BaseModel):
+    season: int
+    race_name: Optional[str] = None
+    count: int
+    log_likelihood: float
+    grid: List[GridSlot]
+
+# Largest entry list /predict/grid accepts (a full grid is 20-22 cars)
+MAX_GRID_ENTRIES = 30
+
+class SimulationRequest(GridRequest):
+    simulations: int = 100_000
+    seed: Optional[int] = None
+    include_distribution: bool = False
+
+class SimulatedDriver(BaseModel):
+    driver_name: Optional[str] = None
+    team_encoded: int
+    team_name: Optional[str] = None
+    win_probability: float
+    podium_probability: float
+    points_probability: float
+    expected_points: float
+    expected_position: float
+    position_distribution: Optional[List[float]] = None  # P1..Pn, with include_distribution
+
+class SimulationResponse(BaseModel):
+    season: int
+    race_name: Optional[str] = None
+    simulations: int
+    seed: Optional[int] = None
+    drivers: List[SimulatedDriver]
+
+# Upper bound on simulated races per request (100k of a 20-car grid take ~80 ms)
+MAX_SIMULATIONS = 200_000
+
+def to_historical_result(result: dict, season: int) -> HistoricalResult:
+    """Build the API model from an indexed standings row"""
+    pts = result.get('pts')
+    return HistoricalResult(
+        position=position_value(result.get('pos')),
+        points=float(pts) if pts is not None and not math.isnan(pts) else 0.0,
+        driver=result.get('driver'),
+        team=result.get('team', ''),
+        season=season
+    )
 
 def get_historical_data(season: int, driver_name: Optional[str] = None, team_encoded: Optional[int] = None) -> Optional[HistoricalResult]:
     """Get historical race result if available"""
-    if historical_data is None:
-        print(f"No historical data available")
+    if historical_index is None:
+        log.debug("No historical data available")
         return None
     
     try:
-        print(f"Looking for historical data: season={season}, driver={driver_name}, team_encoded={team_encoded}")
-        
-        # Filter by season
-        season_data = historical_data[historical_data['season'] == season]
-        print(f"Found {len(season_data)} records for season {season}")
+        log.debug("Looking for historical data: season=%s, driver=%s, team_encoded=%s", season, driver_name, team_encoded)
         
-        if season_data.empty:
-            print(f"No data found for season {season}")
+        season_block = historical_index.season(season)
+        if season_block is None:
+            log.debug("No data found for season %s", season)
             return None
         
-        # If driver name is provided, try to find exact match
+        # Driver match: first name, then last name, then full name without spaces
         if driver_name:
-            # Try different matching strategies for driver names
-            driver_name_clean = driver_name.strip()
-            first_name = driver_name_clean.split()[0] if driver_name_clean else ""
-            last_name = driver_name_clean.split()[-1] if len(driver_name_clean.split()) > 1 else ""
-            
-            print(f"Searching for driver: '{driver_name_clean}', first='{first_name}', last='{last_name}'")
-            
-            # Strategy 1: Search by first name
-            driver_matches = season_data[season_data['driver'].str.contains(first_name, case=False, na=False)] if first_name else pd.DataFrame()
-            print(f"First name search for '{first_name}' found {len(driver_matches)} matches")
-            
-            # Strategy 2: If no matches, try last name  
-            if driver_matches.empty and last_name:
-                driver_matches = season_data[season_data['driver'].str.contains(last_name, case=False, na=False)]
-                print(f"Last name search for '{last_name}' found {len(driver_matches)} matches")
-            
-            # Strategy 3: Try partial match of full name (without spaces)
-            if driver_matches.empty:
-                name_no_spaces = driver_name_clean.replace(" ", "")
-                driver_matches = season_data[season_data['driver'].str.replace(" ", "", regex=False).str.contains(name_no_spaces, case=False, na=False)]
-                print(f"Full name search for '{name_no_spaces}' found {len(driver_matches)} matches")
-            
-            if not driver_matches.empty:
-                result = driver_matches.iloc[0]
-                print(f"Found driver match: {result.get('driver')} - {result.get('pts')} points")
-                return HistoricalResult(
-                    position=int(result.get('pos', 0)) if pd.notna(result.get('pos')) and str(result.get('pos')).isdigit() else None,
-                    points=float(result.get('pts', 0)) if pd.notna(result.get('pts')) else 0.0,
-                    driver=result.get('driver'),
-                    team=result.get('team', ''),
-                    season=season
-                )
+            result = historical_index.find_driver(season, driver_name)
+            if result is not None:
+                log.debug("Found driver match: %s - %s points", result.get('driver'), result.get('pts'))
+                return to_historical_result(result, season)
         
-        # Fallback to team-based lookup
-        team_name = get_team_name(team_encoded) if team_encoded is not None else None
-        if team_name:
-            print(f"Looking for team: '{team_name}'")
-            
-            # Create team search patterns - handle variations like "AlphaTauri RBPT" vs "RB"
-            team_patterns = [team_name]
-            
-            # Add common team variations
-            team_variations = {
-                "RB": ["AlphaTauri", "AlphaTauri RBPT"],
-                "Kick Sauber": ["Alfa Romeo", "Alfa Romeo Ferrari"],
-                "Mercedes": ["Mercedes", "Mercedes AMG"],
-                "Red Bull Racing": ["Red Bull Racing", "Red Bull Racing RBPT", "Red Bull Racing Honda"],
-                "Aston Martin": ["Aston Martin", "Aston Martin Aramco"],
-                "Alpine": ["Alpine", "Alpine Renault"],
-                "Haas": ["Haas", "Haas Ferrari"],
-                "McLaren": ["McLaren", "McLaren Mercedes"],
-                "Williams": ["Williams", "Williams Mercedes"]
-            }
-            
-            if team_name in team_variations:
-                team_patterns.extend(team_variations[team_name])
-            
-            print(f"Team search patterns: {team_patterns}")
-            
-            team_matches = pd.DataFrame()
-            for pattern in team_patterns:
-                # Search for team name (case insensitive, partial match)
-                matches = season_data[season_data['team'].str.contains(pattern, case=False, na=False)]
-                if not matches.empty:
-                    team_matches = matches
-                    print(f"Team pattern '{pattern}' found {len(matches)} matches")
-                    break
-            
-            if not team_matches.empty:
-                # Get the best result for this team (highest points)
-                result = team_matches.loc[team_matches['pts'].idxmax()]
-                print(f"Found team match: {result.get('driver')} ({result.get('team')}) - {result.get('pts')} points")
-                return HistoricalResult(
-                    position=int(result.get('pos', 0)) if pd.notna(result.get('pos')) and str(result.get('pos')).isdigit() else None,
-                    points=float(result.get('pts', 0)) if pd.notna(result.get('pts')) else 0.0,
-                    driver=result.get('driver'),
-                    team=result.get('team', ''),
-                    season=season
-                )
+        # Fallback to team-based lookup (best-points row for the team, precomputed)
+        if team_encoded is not None:
+            result = historical_index.find_team(season, team_encoded)
+            if result is not None:
+                log.debug("Found team match: %s (%s) - %s points", result.get('driver'), result.get('team'), result.get('pts'))
+                return to_historical_result(result, season)
         
-        print(f"No specific match found, returning first record as fallback")
+        log.debug("No specific match found, returning first record as fallback")
         # Last resort - return any record from that season
-        if not season_data.empty:
-            result = season_data.iloc[0]
-            return HistoricalResult(
-                position=int(result.get('pos', 0)) if pd.notna(result.get('pos')) and str(result.get('pos')).isdigit() else None,
-                points=float(result.get('pts', 0)) if pd.notna(result.get('pts')) else 0.0,
-                driver=result.get('driver'),
-                team=result.get('team', ''),
-                season=season
-            )
+        return to_historical_result(season_block.records[0], season)
         
     except Exception as e:
-        print(f"Error fetching historical data: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"Error fetching historical data: {e}")
     
     return None
 
-@app.post("/predict", response_model=PredictResponse)
-def predict_position(request: PredictRequest):
-    """Predict F1 finishing position and include historical data if available"""
+def get_race_result(season: int, race_name: Optional[str], driver_name: Optional[str]) -> Optional[RaceResult]:
+    """A driver's classification in one race, if per-race results are ingested"""
+    if race_db is None or not race_name or not driver_name:
+        return None
     try:
-        print(f"Position prediction request: season={request.season}, team_encoded={request.team_encoded}, driver={request.driver_name}, race={request.race_name}, experience={request.driver_experience}")
-        
-        # Prepare input features for position prediction: [season, team_encoded, driver_experience]
-        X = [[request.season, request.team_encoded, request.driver_experience]]
-        
-        # Get position prediction from the model
+        result = race_db.find_result(season, race_name, driver_name)
+    except Exception as e:
+        log.error(f"Error fetching race result: {e}")
+        return None
+    if result is None:
+        return None
+    return RaceResult(
+        season=result['season'],
+        round=result['round'],
+        race_name=result['race'],
+        driver=result['driver'],
+        team=result['team'],
+        actual_position=result['pos'],
+        status=result['status'] or (result['time'] if result['pos'] is None else None),
+        points=result['pts'] or 0.0,
+        laps=result['laps'],
+    )
+
+# Coalesces concurrent single-row live inference into batched predict_proba calls
+inference_scheduler = InferenceScheduler.from_env(lambda X: serving.predict_rows(X)) if scheduler_enabled() else None
+
+# Features reach the forest as float32; rows sklearn would reject are reported per row instead
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+FEATURE_RANGE_ERROR = "Features must be finite and within float32 range"
+
+def feature_matrix(rows: List[list]) -> np.ndarray:
+    """Rows as a float matrix; ints too large for a float become inf"""
+    try:
+        return np.array(rows, dtype=float).reshape(-1, 3)
+    except OverflowError:
+        def as_float(value) -> float:
+            try:
+                return float(value)
+            except OverflowError:
+                return math.inf
+        return np.array([[as_float(value) for value in row] for row in rows], dtype=float).reshape(-1, 3)
+
+def score_features(rows: List[list], coalesce: bool = False) -> Tuple[List[int], List[float], List[Optional[str]]]:
+    """Score [season, team_encoded, driver_experience] rows.
+
+    In-domain rows are answered from the precomputed prediction table; the rest
+    go through live inference - one predict_rows pass, or the micro-batching
+    scheduler when coalesce is set (concurrent single /predict calls). Rows with
+    a missing feature fall back to P1 with 0.5 confidence, as /predict always has.
+    Rows the model cannot take, or that make it fail, get an error in their slot
+    (the position stays the P1 fallback); one such row never affects the others.
+    """
+    positions = [1] * len(rows)
+    confidences = [0.5] * len(rows)
+    errors: List[Optional[str]] = [None] * len(rows)
+    complete = [i for i, row in enumerate(rows) if None not in row]
+    X = feature_matrix([rows[i] for i in complete])
+    in_range = (np.abs(X) <= FLOAT32_MAX).all(axis=1)  # False for NaN and inf too
+    for j in np.flatnonzero(~in_range):
+        errors[complete[j]] = FEATURE_RANGE_ERROR
+    scorable = [i for i, ok in zip(complete, in_range) if ok]
+    X = X[in_range]
+    if not scorable:
+        return positions, confidences, errors
+
+    # Capture the model once: a hot swap mid-request does not mix versions
+    current = serving
+    best_positions, best_confidences, hits = current.table.lookup_rows(X)
+
+    failed: Dict[int, str] = {}
+    misses = np.flatnonzero(~hits)
+    if len(misses) and coalesce and inference_scheduler is not None:
+        futures = [inference_scheduler.submit(X[i], current.predict_rows) for i in misses]
+        for i, future in zip(misses, futures):
+            try:
+                best_positions[i], best_confidences[i] = future.result(timeout=5.0)
+            except Exception as e:
+                failed[i] = str(e)
+    elif len(misses):
         try:
-            predicted_position_raw = model.predict(X)[0]
-            prediction_probabilities = model.predict_proba(X)[0]
-            prediction_confidence = float(max(prediction_probabilities))
+            best_positions[misses], best_confidences[misses] = current.predict_rows(X[misses])
         except Exception as e:
-            print(f"Model prediction error: {e}")
-            predicted_position_raw = 1
-            prediction_confidence = 0.5
-        
-        # Ensure prediction is valid (convert numpy types to Python types)
-        predicted_position = int(predicted_position_raw) if predicted_position_raw > 0 else 1
-        
-        # Apply team-based fallback logic if prediction is still invalid
-        if predicted_position <= 0 or predicted_position > 20:
-            print(f"Invalid prediction {predicted_position}, applying team-based fallback")
-            # Team-based fallback positions
-            team_fallback_positions = {
-                0: 2,   # Red Bull Racing
-                1: 4,   # Mercedes  
-                2: 3,   # Ferrari
-                3: 6,   # McLaren
-                4: 7,   # Aston Martin
-                5: 9,   # Alpine
-                6: 12,  # Haas
-                7: 10,  # RB
-                8: 15,  # Williams
-                9: 18,  # Kick Sauber
-            }
-            predicted_position = team_fallback_positions.get(request.team_encoded, 10)
-            prediction_confidence = 0.6
-        
-        # Ensure confidence is never zero
-        if prediction_confidence <= 0.0:
-            prediction_confidence = 0.5
-        
-        print(f"Raw prediction: {predicted_position_raw} (type: {type(predicted_position_raw)})")
-        print(f"Final prediction: P{predicted_position} (confidence: {prediction_confidence:.3f})")
-        
-        # Check if this is historical data (before current year)
-        current_year = 2025
-        print(f"DEBUG: request.season type = {type(request.season)}, value = {request.season}")
-        print(f"DEBUG: current_year type = {type(current_year)}, value = {current_year}")
-        
-        # Ensure both are integers for comparison
-        season_int = int(request.season)
-        is_historical = season_int < current_year
-        print(f"DEBUG: {season_int} < {current_year} = {is_historical}")
-        print(f"Is historical: {is_historical} (season {season_int} < {current_year})")
-        
-        # Get historical result if available
-        historical_result = None
-        if is_historical:
-            print(f"Attempting to get historical data for season={request.season}, driver={request.driver_name}, team_encoded={request.team_encoded}")
+            # Rescore row by row so only the rows that actually fail are flagged
+            log.error(f"Model prediction error, retrying {len(misses)} rows one by one: {e}")
+            for i in misses:
+                try:
+                    row_positions, row_confidences = current.predict_rows(X[i:i + 1])
+                    best_positions[i], best_confidences[i] = row_positions[0], row_confidences[0]
+                except Exception as row_error:
+                    failed[i] = str(row_error)
+
+    for j, i in enumerate(scorable):
+        if j in failed:
+            log.error(f"Model prediction error for row {rows[i]}: {failed[j]}")
+            errors[i] = f"Model prediction failed: {failed[j]}"
+        else:
+            positions[i] = int(best_positions[j])
+            confidences[i] = float(best_confidences[j])
+    return positions, confidences, errors
+
+def build_prediction(request: PredictRequest, predicted_position_raw: int, prediction_confidence: float,
+                     historical_cache: Optional[dict] = None) -> PredictResponse:
+    """Apply position fallbacks and attach historical data to a scored request.
+
+    historical_cache lets a batch share lookups for repeated (season, driver, team) keys.
+    """
+    # Ensure prediction is valid (convert numpy types to Python types)
+    predicted_position = int(predicted_position_raw) if predicted_position_raw > 0 else 1
+    
+    # Apply team-based fallback logic if prediction is still invalid
+    if predicted_position <= 0 or predicted_position > 20:
+        log.warning(f"Invalid prediction {predicted_position}, applying team-based fallback")
+        # Team-based fallback positions
+        team_fallback_positions = {
+            0: 2,   # Red Bull Racing
+            1: 4,   # Mercedes  
+            2: 3,   # Ferrari
+            3: 6,   # McLaren
+            4: 7,   # Aston Martin
+            5: 9,   # Alpine
+            6: 12,  # Haas
+            7: 10,  # RB
+            8: 15,  # Williams
+            9: 18,  # Kick Sauber
+        }
+        predicted_position = team_fallback_positions.get(request.team_encoded, 10)
+        prediction_confidence = 0.6
+    
+    # Ensure confidence is never zero
+    if prediction_confidence <= 0.0:
+        prediction_confidence = 0.5
+    
+    log.debug("Raw prediction: %s (type: %s)", predicted_position_raw, type(predicted_position_raw))
+    log.debug("Final prediction: P%s (confidence: %.3f)", predicted_position, prediction_confidence)
+    
+    # Check if this is historical data (before current year)
+    current_year = 2025
+    
+    # Ensure both are integers for comparison
+    season_int = int(request.season)
+    is_historical = season_int < current_year
+    log.debug("Is historical: %s (season %s < %s)", is_historical, season_int, current_year)
+    
+    # Get historical result if available
+    historical_result = None
+    race_result = None
+    if is_historical:
+        lookup_key = (request.season, request.driver_name, request.team_encoded)
+        if historical_cache is not None and lookup_key in historical_cache:
+            historical_result = historical_cache[lookup_key]
+        else:
             historical_result = get_historical_data(
                 season=request.season, 
                 driver_name=request.driver_name,
                 team_encoded=request.team_encoded
             )
-            print(f"Historical result found: {historical_result is not None}")
-            if historical_result:
-                print(f"Historical data: {historical_result}")
-        else:
-            print(f"Not historical data (season {request.season} >= {current_year})")
-        
-        response = PredictResponse(
-            predicted_position=int(predicted_position),
-            prediction_confidence=float(prediction_confidence),
-            season=request.season,
-            team_name=get_team_name(request.team_encoded),
-            driver_name=request.driver_name,
-            race_name=request.race_name,
-            historical_result=historical_result,
-            is_historical=is_historical
-        )
+            if historical_cache is not None:
+                historical_cache[lookup_key] = historical_result
+        log.debug("Historical result: %s", historical_result)
+        if request.race_name:
+            race_lookup_key = ('race', request.season, request.race_name, request.driver_name)
+            if historical_cache is not None and race_lookup_key in historical_cache:
+                race_result = historical_cache[race_lookup_key]
+            else:
+                race_result = get_race_result(request.season, request.race_name, request.driver_name)
+                if historical_cache is not None:
+                    historical_cache[race_lookup_key] = race_result
+    else:
+        log.debug("Not historical data (season %s >= %s)", request.season, current_year)
+    
+    response = PredictResponse(
+        predicted_position=int(predicted_position),
+        prediction_confidence=float(prediction_confidence),
+        season=request.season,
+        team_name=get_team_name(request.team_encoded),
+        driver_name=request.driver_name,
+        race_name=request.race_name,
+        historical_result=historical_result,
+        race_result=race_result,
+        is_historical=is_historical
+    )
+    
+    log.debug("Response: predicted_position=P%s, confidence=%.3f, is_historical=%s, has_historical_result=%s",
+              response.predicted_position, response.prediction_confidence, response.is_historical,
+              response.historical_result is not None)
+    
+    return response
+
+@app.post("/predict", response_model=PredictResponse)
+def predict_position(request: PredictRequest):
+    """Predict F1 finishing position and include historical data if available"""
+    try:
+        log.debug("Position prediction request: season=%s, team_encoded=%s, driver=%s, race=%s, experience=%s",
+                  request.season, request.team_encoded, request.driver_name, request.race_name, request.driver_experience)
         
-        print(f"Response: predicted_position=P{response.predicted_position}, confidence={response.prediction_confidence:.3f}, is_historical={response.is_historical}, has_historical_result={response.historical_result is not None}")
+        # Prepare input features for position prediction: [season, team_encoded, driver_experience]
+        X = [[request.season, request.team_encoded, request.driver_experience]]
+        # A row the model cannot score keeps /predict's P1 fallback
+        positions, confidences, errors = score_features(X, coalesce=True)
+        if errors[0] is not None:
+            log.warning(f"Falling back to P1 for {X[0]}: {errors[0]}")
         
-        return response
+        return build_prediction(request, positions[0], confidences[0])
         
     except Exception as e:
-        print(f"Position prediction failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        log.exception(f"Position prediction failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Position prediction failed: {str(e)}")
 
+@app.post("/predict/batch", response_model=BatchPredictResponse)
+def predict_batch(items: List[Any]):
+    """Predict many positions with one feature matrix and one model pass.
+
+    Each item is validated and post-processed on its own, so a bad item (even
+    one that is not an object) is reported in its slot instead of failing the
+    whole batch. Results keep the order of the request.
+    """
+    if len(items) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=400, detail=f"A batch holds at most {MAX_BATCH_ITEMS} items")
+
+    predictions: List[Optional[PredictResponse]] = [None] * len(items)
+    item_errors: List[Optional[str]] = [None] * len(items)
+    requests_ok: List[Tuple[int, PredictRequest]] = []
+    try:
+        # One validator call for the whole list; item by item only when something is invalid
+        requests_ok = list(enumerate(predict_requests_adapter.validate_python(items)))
+    except ValidationError:
+        for i, item in enumerate(items):
+            try:
+                requests_ok.append((i, PredictRequest.model_validate(item)))
+            except ValidationError as e:
+                item_errors[i] = f"Invalid request: {e}"
+
+    X = [[r.season, r.team_encoded, r.driver_experience] for _, r in requests_ok]
+    positions, confidences, score_errors = score_features(X)
+
+    historical_cache: dict = {}
+    # Experience only moves the scored position, so items that agree on everything else share
+    # one response object (a batch over a season's grid repeats most keys)
+    responses: Dict[tuple, PredictResponse] = {}
+    for (i, request), position, confidence, score_error in zip(requests_ok, positions, confidences, score_errors):
+        if score_error is not None:
+            item_errors[i] = score_error
+            continue
+        key = (request.season, request.team_encoded, request.driver_name, request.race_name, position, confidence)
+        try:
+            if key not in responses:
+                responses[key] = build_prediction(request, position, confidence, historical_cache)
+            predictions[i] = responses[key]
+        except Exception as e:
+            log.error(f"Batch item {i} failed: {e}")
+            item_errors[i] = f"Position prediction failed: {str(e)}"
+
+    errors = sum(1 for error in item_errors if error is not None)
+    log.debug("Batch prediction: %s items, %s errors", len(items), errors)
+    # Each distinct response is encoded once and spliced into the body (as season payloads
+    # are), instead of FastAPI validating and serializing every item again
+    encoded = {id(response): response.model_dump_json() for response in responses.values()}
+    slots = ",".join(
+        f'{{"index":{i},"prediction":{"null" if prediction is None else encoded[id(prediction)]},'
+        f'"error":{"null" if error is None else json.dumps(error)}}}'
+        for i, (prediction, error) in enumerate(zip(predictions, item_errors)))
+    body = f'{{"count":{len(items)},"errors":{errors},"results":[{slots}]}}'
+    return Response(content=body, media_type="application/json")
+
+def grid_features(request) -> np.ndarray:
+    """Feature matrix for a grid or simulation request; 400 when any entry is unusable.
+
+    Missing experience gets /predict's default instead of the P1 fallback. A whole race
+    cannot be scored around a bad entry, so out-of-range features fail the request.
+    """
+    if not 1 <= len(request.entries) <= MAX_GRID_ENTRIES:
+        raise HTTPException(status_code=400, detail=f"entries must hold 1 to {MAX_GRID_ENTRIES} drivers")
+    X = feature_matrix([[request.season, entry.team_encoded, 3 if entry.driver_experience is None else entry.driver_experience]
+                        for entry in request.entries])
+    bad = np.flatnonzero(~(np.abs(X) <= FLOAT32_MAX).all(axis=1))
+    if len(bad):
+        raise HTTPException(status_code=400, detail=f"{FEATURE_RANGE_ERROR} (entries {bad.tolist()})")
+    return X
+
+@app.post("/predict/grid", response_model=GridResponse)
+def predict_grid(request: GridRequest):
+    """Predict a whole finishing order: one predict_proba pass for every entry, then the
+    unique-position assignment with the highest joint probability (race_grid.py)"""
+    X = grid_features(request)
+    current = serving
+    try:
+        probabilities = current.predict_proba(X)
+    except Exception as e:
+        log.exception(f"Grid prediction failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Grid prediction failed: {str(e)}")
+    classes = current.model.classes_
+    positions, assigned, log_likelihood = assign_grid(probabilities, classes)
+    independent = classes[probabilities.argmax(axis=1)]
+    expected = expected_positions(probabilities, classes)
+
+    grid = [GridSlot(
+        position=int(positions[i]),
+        driver_name=request.entries[i].driver_name,
+        team_encoded=request.entries[i].team_encoded,
+        team_name=get_team_name(request.entries[i].team_encoded),
+        probability=float(assigned[i]),
+        independent_position=int(independent[i]),
+        expected_position=round(float(expected[i]), 3),
+    ) for i in np.argsort(positions)]
+    log.debug("Grid prediction: %s entries, log-likelihood %.3f", len(grid), log_likelihood)
+    return GridResponse(season=request.season, race_name=request.race_name, count=len(grid),
+                        log_likelihood=log_likelihood, grid=grid)
+
+@app.post("/predict/simulate", response_model=SimulationResponse)
+def predict_simulate(request: SimulationRequest):
+    """Monte Carlo over whole races: win, podium and points probabilities plus expected
+    points per driver, from one predict_proba pass (race_simulator.py)"""
+    if not 1 <= request.simulations <= MAX_SIMULATIONS:
+        raise HTTPException(status_code=400, detail=f"simulations must be between 1 and {MAX_SIMULATIONS}")
+    if request.seed is not None and request.seed < 0:
+        raise HTTPException(status_code=400, detail="seed must be a non-negative integer")
+
+    X = grid_features(request)
+    current = serving
+    try:
+        probabilities = current.predict_proba(X)
+    except Exception as e:
+        log.exception(f"Race simulation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Race simulation failed: {str(e)}")
+    summary = simulate_race(probabilities, current.model.classes_, request.simulations, request.seed)
+
+    drivers = [SimulatedDriver(
+        driver_name=entry.driver_name,
+        team_encoded=entry.team_encoded,
+        team_name=get_team_name(entry.team_encoded),
+        win_probability=float(summary["win_probability"][i]),
+        podium_probability=float(summary["podium_probability"][i]),
+        points_probability=float(summary["points_probability"][i]),
+        expected_points=round(float(summary["expected_points"][i]), 4),
+        expected_position=round(float(summary["expected_position"][i]), 4),
+        position_distribution=summary["position_distribution"][i].tolist() if request.include_distribution else None,
+    ) for i, entry in enumerate(request.entries)]
+    drivers.sort(key=lambda d: (-d.expected_points, d.expected_position))
+    return SimulationResponse(season=request.season, race_name=request.race_name, simulations=request.simulations,
+                              seed=request.seed, drivers=drivers)
+
+@app.post("/actual-result", response_model=RaceResult)
+def actual_result(request: ActualResultRequest):
+    """Actual finishing position of a driver in one race (per-race results)"""
+    if race_db is None:
+        raise HTTPException(status_code=503, detail="Per-race results not available; run f1_scraper.py --races")
+    result = get_race_result(request.season, request.race_name, request.driver_name)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No result for {request.driver_name} at the {request.season} {request.race_name}")
+    return result
+
 @app.get("/debug/data")
 def debug_data():
     """Debug endpoint to check available data"""
@@ -431,7 +674,7 @@ def debug_data():
         return {"error": "No historical data loaded"}
     
     # Get basic info about the data
-    seasons = sorted(historical_data['season'].unique()) if 'season' in historical_data.columns else []
+    seasons = [int(s) for s in sorted(historical_data['season'].unique())] if 'season' in historical_data.columns else []
     total_records = len(historical_data)
     columns = list(historical_data.columns)
     
@@ -445,36 +688,98 @@ def debug_data():
         "sample_data": sample
     }
 
+@app.get("/metrics/startup")
+def startup_metrics():
+    """Per-phase cold-start timings of this process (startup_profile.py)"""
+    return startup_summary
+
+@app.get("/metrics/inference")
+def inference_metrics():
+    """Micro-batching scheduler queue depth and batch-size histogram"""
+    if inference_scheduler is None:
+        return {"enabled": False}
+    return {"enabled": True, **inference_scheduler.stats()}
+
+def check_admin_token(x_admin_token: Optional[str]) -> None:
+    """Admin endpoints are disabled unless F1_ADMIN_TOKEN is set, then require it as X-Admin-Token"""
+    expected = os.environ.get("F1_ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=503, detail="Admin endpoints are disabled; set F1_ADMIN_TOKEN")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@app.get("/admin/models")
+def list_models(x_admin_token: Optional[str] = Header(None)):
+    """Registry versions, the version being served and the last reload status"""
+    check_admin_token(x_admin_token)
+    return {
+        "serving_version": serving.version,
+        "evaluator": serving.evaluator_name,
+        "registry_current": model_registry.current_version(),
+        "versions": model_registry.list_versions(),
+        "reload": reload_status,
+    }
+
+@app.post("/admin/models/reload", status_code=202)
+def reload_model(version: Optional[str] = None, x_admin_token: Optional[str] = Header(None)):
+    """Load a registry version (default: CURRENT) in the background and hot-swap it in"""
+    check_admin_token(x_admin_token)
+    if version is not None and version not in model_registry.list_versions():
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version!r}")
+    if reload_status["state"] == "loading":
+        raise HTTPException(status_code=409, detail="A model reload is already in progress")
+    reload_in_background(version)
+    return {"accepted": True, "requested_version": version or model_registry.current_version(), "serving_version": serving.version}
+
+@app.on_event("startup")
+def start_registry_watcher():
+    # Started per server process, so every pre-forked worker (serve.py) polls too
+    if float(os.environ.get("F1_MODEL_WATCH_SECONDS", "0")) > 0:
+        watch_registry(float(os.environ["F1_MODEL_WATCH_SECONDS"]))
+
+@app.on_event("shutdown")
+def stop_inference_scheduler():
+    if inference_scheduler is not None:
+        inference_scheduler.close()
+
 @app.get("/teams")
 def get_teams():
     """Get available teams and their encodings"""
     return {"teams": team_mapping}
 
+@app.get("/drivers/search")
+def search_drivers(q: str = Query(..., min_length=1, max_length=100), limit: int = Query(10, ge=1, le=50)):
+    """Ranked fuzzy driver-name search for autocomplete"""
+    if driver_search_index is None:
+        raise HTTPException(status_code=404, detail="Historical data not available")
+    return {"query": q, "results": driver_search_index.search(q, limit=limit)}
+
 @app.get("/historical/{season}")
-def get_season_results(season: int):
-    """Get all results for a specific season"""
-    if historical_data is None:
+def get_season_results(
+    season: int,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of position,driver,team,points,nationality"),
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Get all results for a specific season (pre-serialized, ETag/304 aware)"""
+    if season_payloads is None:
         raise HTTPException(status_code=404, detail="Historical data not available")
     
+    payload = season_payloads.get(season)
+    if payload is None:
+        raise HTTPException(status_code=404, detail=f"No data found for season {season}")
+    
     try:
-        season_data = historical_data[historical_data['season'] == season]
-        if season_data.empty:
-            raise HTTPException(status_code=404, detail=f"No data found for season {season}")
-        
-        results = []
-        for _, row in season_data.iterrows():
-            results.append({
-                "position": int(row.get('pos', 0)) if pd.notna(row.get('pos')) else None,
-                "driver": row.get('driver'),
-                "team": row.get('team', ''),
-                "points": float(row.get('pts', 0)) if pd.notna(row.get('pts')) else None,
-                "nationality": row.get('nationality', '')
-            })
-        
-        return {"season": season, "results": results}
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch season data: {str(e)}")
+        projection = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    body, etag = payload.render(projection, limit, offset)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @app.get("/")
 def root():
@@ -490,8 +795,13 @@ def root():
         ],
         "endpoints": {
             "POST /predict": "Predict finishing position with historical comparison",
+            "POST /predict/batch": "Predict many positions in one model pass",
+            "POST /predict/grid": "Predict a whole finishing order with unique positions",
+            "POST /predict/simulate": "Monte Carlo win/podium/points probabilities for an entry list",
             "GET /teams": "Get team mappings",
-            "GET /historical/{season}": "Get season results",
+            "GET /drivers/search?q=": "Fuzzy driver-name search",
+            "GET /historical/{season}": "Get season results (?fields=, limit, offset; ETag)",
+            "POST /actual-result": "Actual position of a driver in one race",
             "GET /test/lookup/{season}": "Test historical data lookup"
         },
         "model_info": {
@@ -505,7 +815,7 @@ def root():
 @app.get("/health")
 def health_check():
     """Simple health check endpoint"""
-    return {"status": "ok", "message": "FastAPI service is running"}
+    return {"status": "ok", "message": "FastAPI service is running", "model_version": serving.version}
 
 @app.get("/test/year/{season}")
 def test_year_logic(season: int):
@@ -528,7 +838,7 @@ def test_year_logic(season: int):
 @app.get("/test/lookup/{season}")
 def test_historical_lookup(season: int, driver: str = None, team_encoded: int = None):
     """Test the historical data lookup logic"""
-    print(f"Testing historical lookup: season={season}, driver={driver}, team_encoded={team_encoded}")
+    log.debug("Testing historical lookup: season=%s, driver=%s, team_encoded=%s", season, driver, team_encoded)
     
     result = get_historical_data(season, driver, team_encoded)
     
@@ -541,9 +851,17 @@ def test_historical_lookup(season: int, driver: str = None, team_encoded: int =
         "result": result.dict() if result else None
     }
 
+# Import-to-ready: log the per-phase report, fail if over F1_STARTUP_BUDGET_MS
+startup_summary = startup.ready(log)
+# Move everything loaded so far (model, indexes, ~150k objects) out of the collector's view:
+# otherwise full collections triggered by big request bodies rescan it (~100 ms pauses)
+gc.freeze()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
 
 # To run the FastAPI app manually, use the command:
-# uvicorn main:app --reload
\ No newline at end of file
+# uvicorn main:app --reload
+# Production, one shared model load across several workers:
+# python serve.py --workers 4
\ No newline at end of file
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Load the pre-trained position model and verify it against its f1_model_info metadata.
+
+Serving never trains: if the artifact is missing or does not match its metadata
+(features, classes, content hash) we raise ModelArtifactError and refuse to start.
+Training scripts write artifacts through save_model() so the metadata stays in sync.
+"""
+
+import hashlib
+import os
+import sys
+from typing import List, Optional, Tuple
+
+import joblib
+
+MODEL_FILENAME = "f1_position_predictor.joblib"
+INFO_FILENAME = "f1_model_info.joblib"
+EXPECTED_FEATURES = ['season', 'team_encoded', 'driver_experience']
+
+
+class ModelArtifactError(RuntimeError):
+    """Raised when the model artifact is missing or inconsistent with its metadata"""
+
+
+def file_sha256(path: str) -> str:
+    """Content hash of a file, read in 1MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def candidate_dirs() -> List[str]:
+    """Directories searched for the artifact: cwd, this script's dir, repo root"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return [os.getcwd(), script_dir, os.path.dirname(script_dir)]
+
+
+def find_model_artifact() -> Tuple[str, str]:
+    """Resolve (model_path, info_path), honouring F1_MODEL_PATH / F1_MODEL_INFO_PATH"""
+    model_path = os.environ.get("F1_MODEL_PATH")
+    info_path = os.environ.get("F1_MODEL_INFO_PATH")
+    if model_path:
+        if not info_path:
+            info_path = os.path.join(os.path.dirname(os.path.abspath(model_path)), INFO_FILENAME)
+        return model_path, info_path
+
+    for directory in candidate_dirs():
+        path = os.path.join(directory, MODEL_FILENAME)
+        if os.path.exists(path):
+            return path, os.path.join(directory, INFO_FILENAME)
+
+    raise ModelArtifactError(
+        f"No {MODEL_FILENAME} found in {candidate_dirs()} - "
+        f"train one with train_position_model.py or set F1_MODEL_PATH"
+    )
+
+
+def verify_model(model, model_info: dict, expected_sha256: Optional[str] = None) -> None:
+    """Check a loaded model against its metadata, raising ModelArtifactError on mismatch"""
+    features = list(model_info.get('features', []))
+    if features != EXPECTED_FEATURES:
+        raise ModelArtifactError(f"Model features {features} do not match serving features {EXPECTED_FEATURES}")
+
+    if expected_sha256 is not None and model_info.get('model_sha256') != expected_sha256:
+        raise ModelArtifactError(
+            f"Model content hash {expected_sha256[:12]} does not match "
+            f"f1_model_info ({str(model_info.get('model_sha256'))[:12]})"
+        )
+
+    if getattr(model, 'n_features_in_', len(features)) != len(features):
+        raise ModelArtifactError(f"Model expects {model.n_features_in_} features, metadata lists {len(features)}")
+
+    classes = getattr(model, 'classes_', None)
+    if classes is None or not hasattr(model, 'predict_proba'):
+        raise ModelArtifactError(f"{type(model).__name__} is not a fitted position classifier")
+    if [int(c) for c in classes] != [int(c) for c in model_info.get('classes', [])]:
+        raise ModelArtifactError(f"Model classes {list(classes)} do not match f1_model_info {model_info.get('classes')}")
+
+
+def load_model(model_path: str, info_path: str) -> Tuple[object, dict]:
+    """Load and verify a model artifact; never retrains"""
+    for path in (model_path, info_path):
+        if not os.path.exists(path):
+            raise ModelArtifactError(f"Model artifact file not found: {path}")
+
+    model_info = joblib.load(info_path)
+    if 'model_sha256' not in model_info or 'classes' not in model_info:
+        raise ModelArtifactError(
+            f"{info_path} has no content hash/classes - re-train, or run "
+            f"'python model_loader.py --stamp {model_path} {info_path}' for a trusted legacy artifact"
+        )
+
+    # Hash before unpickling so a swapped or truncated file is never loaded
+    sha256 = file_sha256(model_path)
+    if model_info['model_sha256'] != sha256:
+        raise ModelArtifactError(f"{model_path} content hash {sha256[:12]} does not match {info_path}")
+
+    model = joblib.load(model_path)
+    verify_model(model, model_info, sha256)
+    return model, model_info
+
+
+def _atomic_dump(obj, path: str) -> None:
+    """joblib.dump to a temp file and rename, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(obj, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def save_model(model, model_info: dict, model_path: str = MODEL_FILENAME, info_path: str = INFO_FILENAME) -> dict:
+    """Write a model and its metadata (features, classes, content hash) together"""
+    _atomic_dump(model, model_path)
+    model_info = dict(model_info)
+    model_info['features'] = list(model_info.get('features', EXPECTED_FEATURES))
+    model_info['classes'] = [int(c) for c in model.classes_]
+    model_info['model_sha256'] = file_sha256(model_path)
+    verify_model(model, model_info, model_info['model_sha256'])
+    _atomic_dump(model_info, info_path)
+    return model_info
+
+
+def stamp_model(model_path: str, info_path: str) -> dict:
+    """Add classes and content hash to the metadata of an existing (trusted) artifact"""
+    model = joblib.load(model_path)
+    model_info = joblib.load(info_path) if os.path.exists(info_path) else {}
+    model_info['features'] = list(model_info.get('features', EXPECTED_FEATURES))
+    model_info.setdefault('model_type', 'position_classification')
+    model_info['classes'] = [int(c) for c in model.classes_]
+    model_info['model_sha256'] = file_sha256(model_path)
+    verify_model(model, model_info, model_info['model_sha256'])
+    _atomic_dump(model_info, info_path)
+    return model_info
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--stamp":
+        model_path = sys.argv[2] if len(sys.argv) > 2 else MODEL_FILENAME
+        info_path = sys.argv[3] if len(sys.argv) > 3 else INFO_FILENAME
+        info = stamp_model(model_path, info_path)
+        print(f"✅ Stamped {info_path}: classes={info['classes']}, sha256={info['model_sha256'][:12]}")
+    else:
+        model_path, info_path = find_model_artifact()
+        model, info = load_model(model_path, info_path)
+        print(f"✅ {model_path}: {type(model).__name__}, classes={info['classes']}, sha256={info['model_sha256'][:12]}")
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+
+"""
+Content-hashed model registry with a "current" pointer.
+
+Layout (F1_MODEL_REGISTRY, default <repo>/model_registry):
+
+    versions/<sha256[:12]>/f1_position_predictor.joblib
+    versions/<sha256[:12]>/f1_model_info.joblib
+    CURRENT                      -> version id being served
+
+Versions are immutable once published; switching or rolling back only rewrites
+CURRENT (atomically). The API loads a new version into a ServingModel in the
+background, warms it up, and swaps the reference, so requests already running
+finish on the model they started with.
+
+    python model_registry.py publish [model_path] [info_path]
+    python model_registry.py use <version>
+    python model_registry.py list
+"""
+
+import os
+import re
+import shutil
+import sys
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from model_loader import (INFO_FILENAME, MODEL_FILENAME, ModelArtifactError, file_sha256,
+                          load_model, save_model)
+from compiled_forest import compile_forest, matches_model
+from prediction_table import domain_grid, table_for_model
+
+VERSION_LENGTH = 12
+VERSION_PATTERN = re.compile(rf"^[0-9a-f]{{{VERSION_LENGTH}}}$")
+
+# Up to this many rows the NumPy forest beats sklearn's per-call overhead (benchmark_forest.py)
+COMPILED_BATCH_LIMIT = 256
+
+# Rows every candidate model must score before it is swapped in
+WARMUP_ROWS = np.array([
+    [2023, 0, 5], [2024, 1, 8], [2023, 4, 3], [2024, 8, 2], [2025, 3, 5], [2035, 9, 25],
+], dtype=float)
+
+
+def default_registry_dir() -> str:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.environ.get("F1_MODEL_REGISTRY", os.path.join(os.path.dirname(script_dir), "model_registry"))
+
+
+class ModelRegistry:
+    """Publish, list and point at content-hashed model versions"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or default_registry_dir()
+        self.versions_dir = os.path.join(self.root, "versions")
+        self.current_path = os.path.join(self.root, "CURRENT")
+
+    def version_paths(self, version: str) -> Tuple[str, str]:
+        # Versions are hash prefixes; anything else (e.g. "../..") never names a directory
+        if not isinstance(version, str) or not VERSION_PATTERN.match(version):
+            raise ModelArtifactError(f"Invalid model version {version!r}")
+        version_dir = os.path.join(self.versions_dir, version)
+        return os.path.join(version_dir, MODEL_FILENAME), os.path.join(version_dir, INFO_FILENAME)
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.versions_dir):
+            return []
+        return sorted(
+            (v for v in os.listdir(self.versions_dir)
+             if VERSION_PATTERN.match(v) and os.path.exists(self.version_paths(v)[0])),
+            key=lambda v: os.path.getmtime(os.path.join(self.versions_dir, v)),
+        )
+
+    def current_version(self) -> Optional[str]:
+        try:
+            with open(self.current_path) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def set_current(self, version: str) -> None:
+        """Point CURRENT at an existing version (atomic rename)"""
+        if not os.path.exists(self.version_paths(version)[0]):
+            raise ModelArtifactError(f"Unknown model version {version}")
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = f"{self.current_path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, self.current_path)
+
+    def publish(self, model_path: str, info_path: str, make_current: bool = True) -> str:
+        """Copy a verified artifact into versions/<hash>; returns the version id"""
+        load_model(model_path, info_path)  # refuse to publish anything serving would refuse
+        version = file_sha256(model_path)[:VERSION_LENGTH]
+        target_dir = os.path.join(self.versions_dir, version)
+        if not os.path.exists(self.version_paths(version)[0]):
+            os.makedirs(self.versions_dir, exist_ok=True)
+            staging = tempfile.mkdtemp(prefix=f".{version}-", dir=self.versions_dir)
+            shutil.copy2(model_path, os.path.join(staging, MODEL_FILENAME))
+            shutil.copy2(info_path, os.path.join(staging, INFO_FILENAME))
+            try:
+                os.rename(staging, target_dir)
+            except OSError:
+                # Another publisher won the race with identical content
+                shutil.rmtree(staging, ignore_errors=True)
+        if make_current:
+            self.set_current(version)
+        return version
+
+    def publish_model(self, model, model_info: dict, make_current: bool = True) -> str:
+        """save_model() a fitted model straight into the registry"""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self.versions_dir, prefix=".staging-") as staging:
+            model_path = os.path.join(staging, MODEL_FILENAME)
+            info_path = os.path.join(staging, INFO_FILENAME)
+            save_model(model, model_info, model_path, info_path)
+            return self.publish(model_path, info_path, make_current)
+
+    def load(self, version: Optional[str] = None) -> "ServingModel":
+        version = version or self.current_version()
+        if version is None:
+            raise ModelArtifactError(f"No current model version in {self.root}")
+        model_path, info_path = self.version_paths(version)
+        model, model_info = load_model(model_path, info_path)
+        return ServingModel(model, model_info, version, model_path)
+
+
+class ServingModel:
+    """A loaded model version plus everything derived from it for serving"""
+
+    def __init__(self, model, model_info: dict, version: str, source: str):
+        self.model = model
+        self.model_info = model_info
+        self.version = version
+        self.source = source
+        # Small batches go through the flattened NumPy forest, but only when it reproduces
+        # sklearn bit for bit on the whole serving domain
+        forest = compile_forest(model)
+        if forest is not None and not matches_model(forest, model, np.vstack([domain_grid(), WARMUP_ROWS])):
+            forest = None
+        self.forest = forest
+        self.evaluator_name = "numpy" if forest is not None else "sklearn"
+        self.table = table_for_model(model, model_info['model_sha256'])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Same probabilities either way; the faster path for the batch size"""
+        if self.forest is not None and len(X) <= COMPILED_BATCH_LIMIT:
+            return self.forest.predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def predict_rows(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Live inference: one predict_proba pass, argmax position and its probability"""
+        probabilities = self.predict_proba(X)
+        best = probabilities.argmax(axis=1)
+        return self.model.classes_[best], probabilities[np.arange(len(X)), best]
+
+    def warm_up(self) -> None:
+        """Score the warmup set; raises if the model cannot serve valid positions"""
+        positions, confidences = self.predict_rows(WARMUP_ROWS)
+        if len(positions) != len(WARMUP_ROWS) or not np.all((confidences > 0) & (confidences <= 1)):
+            raise ModelArtifactError(f"Model version {self.version} failed warmup")
+        if not set(int(p) for p in positions) <= set(self.model_info['classes']):
+            raise ModelArtifactError(f"Model version {self.version} predicted unknown positions")
+
+
+if __name__ == "__main__":
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "publish":
+        model_path = sys.argv[2] if len(sys.argv) > 2 else MODEL_FILENAME
+        info_path = sys.argv[3] if len(sys.argv) > 3 else INFO_FILENAME
+        version = registry.publish(model_path, info_path)
+        print(f"✅ Published {model_path} as version {version} (now current)")
+    elif command == "use":
+        registry.set_current(sys.argv[2])
+        print(f"✅ Current model version: {sys.argv[2]}")
+    else:
+        current = registry.current_version()
+        for version in registry.list_versions():
+            print(f"{'*' if version == current else ' '} {version}")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+Whole-grid finishing orders from per-driver position probabilities.
+
+/predict scores each driver on its own, so several drivers can come back as
+P1. For a full entry list we instead take every driver's class
+probabilities (one predict_proba pass), spread them over the grid's
+positions 1..n, and pick the one-driver-per-position assignment with the
+highest joint probability: the Hungarian algorithm on the n x n
+negative log-probability matrix.
+
+The model only knows the positions it saw in training (no P7 or P11 ...),
+so positions no driver can reach tie at the probability floor; those ties
+go to the driver whose expected position is closest.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# log(0) floor: unreachable positions stay possible but are never preferred
+PROBABILITY_FLOOR = 1e-12
+# Far below any real log-probability difference, so it only orders exact ties
+TIE_BREAK_WEIGHT = 1e-9
+
+
+def position_matrix(probabilities: np.ndarray, classes, n_positions: int) -> np.ndarray:
+    """(n_drivers, n_positions) probability of finishing P1..Pn; classes beyond n are dropped"""
+    probabilities = np.asarray(probabilities, dtype=float)
+    classes = np.asarray(classes, dtype=int)
+    matrix = np.zeros((len(probabilities), n_positions))
+    keep = (classes >= 1) & (classes <= n_positions)
+    matrix[:, classes[keep] - 1] = probabilities[:, keep]
+    return matrix
+
+
+def expected_positions(probabilities: np.ndarray, classes) -> np.ndarray:
+    return np.asarray(probabilities, dtype=float) @ np.asarray(classes, dtype=float)
+
+
+def assign_grid(probabilities: np.ndarray, classes) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Unique finishing positions for every driver that maximize the joint probability.
+
+    Returns (positions, probability of each driver's assigned position, joint log-likelihood).
+    """
+    n = len(probabilities)
+    matrix = position_matrix(probabilities, classes, n)
+    log_p = np.log(np.maximum(matrix, PROBABILITY_FLOOR))
+    expected = expected_positions(probabilities, classes)
+    slots = np.arange(1, n + 1)
+    cost = -log_p + TIE_BREAK_WEIGHT * (slots[None, :] - expected[:, None]) ** 2
+
+    # Square cost matrix: rows come back as 0..n-1, one slot per driver
+    drivers, slot_index = linear_sum_assignment(cost)
+    return slots[slot_index], matrix[drivers, slot_index], float(log_p[drivers, slot_index].sum())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+
+"""
+Per-race classifications, ingested from the scraper's race partitions into SQLite.
+
+f1_scraper.py --races writes one NDJSON partition per round
+(partitions/races/season=<y>/round=<nn>.ndjson, listed in manifest.jsonl). The
+ingest streams those files line by line into race_results.sqlite in fixed-size
+chunks, never holding more than one chunk of rows, so the whole archive (tens
+of thousands of rows) goes in with flat memory:
+
+    races          (season, round) -> grand prix name, slug, race key
+    race_results   one row per classified car, keyed (season, round, row)
+                   and indexed by (season, race_key, driver_key)
+    ingested       partition key -> sha256 already loaded
+
+A partition is replaced in a single transaction, and one whose sha256 is
+already in `ingested` is skipped, so re-running the ingest is cheap and safe.
+
+Races are looked up by any common name: "British Grand Prix", "Great Britain"
+and the URL slug "great-britain" all resolve to the same race key.
+
+    python race_results.py ingest [partitions_dir] [race_results.sqlite]
+    python race_results.py lookup 2024 "British Grand Prix" "Lando Norris"
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import unicodedata
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from f1_data import split_driver_code
+
+DB_FILENAME = "race_results.sqlite"
+DEFAULT_CHUNK_ROWS = 5000
+
+# Adjectival and city names -> formula1.com race slug
+RACE_ALIASES = {
+    "argentine": "argentina", "australian": "australia", "austrian": "austria",
+    "belgian": "belgium", "brazilian": "brazil", "sao-paulo": "brazil", "british": "great-britain",
+    "canadian": "canada", "chinese": "china", "dutch": "netherlands", "european": "europe",
+    "french": "france", "german": "germany", "hungarian": "hungary", "indian": "india", "italian": "italy",
+    "japanese": "japan", "korean": "korea", "malaysian": "malaysia", "mexican": "mexico",
+    "mexico-city": "mexico", "moroccan": "morocco", "portuguese": "portugal", "russian": "russia",
+    "saudi-arabian": "saudi-arabia", "south-african": "south-africa", "spanish": "spain",
+    "styrian": "styria", "swedish": "sweden", "swiss": "switzerland", "turkish": "turkey",
+    "tuscan": "tuscany", "us": "united-states", "usa": "united-states", "united-states-of-america": "united-states",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    race TEXT,
+    race_slug TEXT,
+    race_key TEXT NOT NULL,
+    race_id INTEGER,
+    PRIMARY KEY (season, round)
+);
+CREATE INDEX IF NOT EXISTS races_by_key ON races (season, race_key);
+CREATE TABLE IF NOT EXISTS race_results (
+    season INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    row INTEGER NOT NULL,
+    race_key TEXT NOT NULL,
+    pos INTEGER,
+    status TEXT,
+    number INTEGER,
+    driver TEXT,
+    driver_code TEXT,
+    driver_key TEXT NOT NULL,
+    team TEXT,
+    laps INTEGER,
+    time TEXT,
+    pts REAL,
+    PRIMARY KEY (season, round, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_by_race_driver ON race_results (season, race_key, driver_key);
+CREATE TABLE IF NOT EXISTS ingested (
+    key TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+RESULT_COLUMNS = ("season", "round", "row", "race_key", "pos", "status", "number", "driver", "driver_code",
+                  "driver_key", "team", "laps", "time", "pts")
+INSERT_RESULTS = f"INSERT INTO race_results VALUES ({', '.join('?' * len(RESULT_COLUMNS))})"
+
+
+def _ascii_words(text: str) -> str:
+    text = unicodedata.normalize("NFKD", str(text)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def race_key(name: str) -> str:
+    """'British Grand Prix', 'Great Britain', 'great-britain' -> 'great-britain'"""
+    key = _ascii_words(name)
+    key = re.sub(r"(^|-)(formula-1|grand-prix|gp)(-|$)", "-", key).strip("-")
+    return RACE_ALIASES.get(key, key)
+
+
+def driver_key(name: str) -> str:
+    return _ascii_words(split_driver_code(name)[0]).replace("-", " ")
+
+
+def default_db_path() -> str:
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Scraper", DB_FILENAME)
+
+
+def find_race_db() -> Optional[str]:
+    """F1_RACE_DB, then race_results.sqlite next to this script or in ../Scraper"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    candidates = [
+        os.environ.get("F1_RACE_DB"),
+        os.path.join(script_dir, DB_FILENAME),
+        default_db_path(),
+    ]
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _int_or_none(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float_or_zero(value) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if number == number else 0.0
+
+
+def _normalize_record(record: dict) -> dict:
+    """Raw page headers ('POS.', 'TIME / RETIRED', ...) -> lower-case keys"""
+    return {re.sub(r"\s*/.*$", "", k.strip().lower().replace(".", "")): v for k, v in record.items()}
+
+
+def result_row(record: dict, season: int, round_number: int, row: int, key: str) -> tuple:
+    record = _normalize_record(record)
+    driver, code = split_driver_code(record.get("driver", ""))
+    pos = _int_or_none(record.get("pos"))
+    raw_pos = record.get("pos")
+    return (season, round_number, row, key, pos,
+            None if pos is not None or raw_pos in (None, "") else str(raw_pos),
+            _int_or_none(record.get("no")), driver, code, driver_key(driver), record.get("team"),
+            _int_or_none(record.get("laps")), None if record.get("time") is None else str(record.get("time")),
+            _float_or_zero(record.get("pts")))
+
+
+def read_manifest(partitions_dir: str) -> List[dict]:
+    """Latest manifest entry per race partition, in (season, round) order"""
+    entries: Dict[str, dict] = {}
+    path = os.path.join(partitions_dir, "manifest.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry.get("key", "").startswith("races/"):
+                entries[entry["key"]] = entry
+    return sorted(entries.values(), key=lambda e: (e["season"], e["round"]))
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class RaceResultsDB:
+    """SQLite store of per-race classifications; one connection per thread"""
+
+    def __init__(self, path: Optional[str] = None, readonly: bool = False):
+        self.path = path or default_db_path()
+        self.readonly = readonly
+        self._local = threading.local()
+        if not readonly:
+            with self.connect() as conn:
+                conn.executescript(SCHEMA)
+
+    def connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.readonly:
+                conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def is_ingested(self, key: str, sha256: str) -> bool:
+        row = self.connect().execute("SELECT sha256 FROM ingested WHERE key = ?", (key,)).fetchone()
+        return row is not None and row["sha256"] == sha256
+
+    def ingest_partition(self, key: str, sha256: str, records: Iterable[dict],
+                         chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+        """Replace one round with the given records, inserting chunk_rows at a time"""
+        conn = self.connect()
+        rows = 0
+        with conn:
+            season = round_number = None
+            chunk: List[tuple] = []
+            for record in records:
+                if season is None:
+                    season, round_number = int(record["Season"]), int(record["Round"])
+                    name, slug = record.get("Race"), record.get("RaceSlug")
+                    key_value = race_key(slug or name or f"round-{round_number}")
+                    conn.execute("DELETE FROM race_results WHERE season = ? AND round = ?", (season, round_number))
+                    conn.execute("INSERT OR REPLACE INTO races VALUES (?, ?, ?, ?, ?, ?)",
+                                 (season, round_number, name, slug, key_value, _int_or_none(record.get("RaceId"))))
+                chunk.append(result_row(record, season, round_number, rows, key_value))
+                rows += 1
+                if len(chunk) >= chunk_rows:
+                    conn.executemany(INSERT_RESULTS, chunk)
+                    chunk.clear()
+            if chunk:
+                conn.executemany(INSERT_RESULTS, chunk)
+            conn.execute("INSERT OR REPLACE INTO ingested VALUES (?, ?, ?, ?)",
+                         (key, sha256, rows, datetime.now(timezone.utc).isoformat(timespec="seconds")))
+        return rows
+
+    def ingest_partitions(self, partitions_dir: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                          log=print) -> Dict[str, int]:
+        """Ingest every race partition in the manifest that is new or changed"""
+        stats = {"partitions": 0, "rows": 0, "skipped": 0}
+        started = time.perf_counter()
+        for entry in read_manifest(partitions_dir):
+            path = os.path.join(partitions_dir, *entry["key"].split("/")) + ".ndjson"
+            if not os.path.exists(path) or self.is_ingested(entry["key"], entry["sha256"]):
+                stats["skipped"] += 1
+                continue
+            stats["rows"] += self.ingest_partition(entry["key"], entry["sha256"], iter_records(path), chunk_rows)
+            stats["partitions"] += 1
+        if log and stats["partitions"]:
+            log(f"🏁 Ingested {stats['rows']} race results from {stats['partitions']} rounds "
+                f"({stats['skipped']} unchanged) in {time.perf_counter() - started:.2f}s")
+        return stats
+
+    def find_race(self, season: int, race_name: str) -> Optional[sqlite3.Row]:
+        return self.connect().execute(
+            "SELECT * FROM races WHERE season = ? AND race_key = ? ORDER BY round LIMIT 1",
+            (int(season), race_key(race_name))).fetchone()
+
+    def find_result(self, season: int, race_name: str, driver_name: str) -> Optional[dict]:
+        """A driver's classification in one race, matched on the full name, then a unique surname"""
+        race = self.find_race(season, race_name)
+        if race is None:
+            return None
+        conn = self.connect()
+        key = driver_key(driver_name)
+        row = conn.execute(
+            "SELECT * FROM race_results WHERE season = ? AND race_key = ? AND driver_key = ? "
+            "AND round = ? ORDER BY row LIMIT 1",
+            (race["season"], race["race_key"], key, race["round"])).fetchone()
+        if row is None and key:
+            surname = key.split()[-1]
+            candidates = conn.execute(
+                "SELECT * FROM race_results WHERE season = ? AND race_key = ? AND round = ? "
+                "AND (driver_key = ? OR driver_key LIKE ?) ORDER BY row",
+                (race["season"], race["race_key"], race["round"], surname, f"% {surname}")).fetchall()
+            if len({c["driver_key"] for c in candidates}) == 1:
+                row = candidates[0]
+        if row is None:
+            return None
+        return {**dict(row), "race": race["race"], "race_slug": race["race_slug"]}
+
+    def summary(self) -> dict:
+        conn = self.connect()
+        seasons = [r[0] for r in conn.execute("SELECT DISTINCT season FROM races ORDER BY season")]
+        return {
+            "seasons": seasons,
+            "races": conn.execute("SELECT COUNT(*) FROM races").fetchone()[0],
+            "results": conn.execute("SELECT COUNT(*) FROM race_results").fetchone()[0],
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def main(argv: List[str]) -> int:
+    if argv[:1] == ["ingest"]:
+        partitions_dir = argv[1] if len(argv) > 1 else os.path.join(os.path.dirname(default_db_path()), "partitions")
+        db = RaceResultsDB(argv[2] if len(argv) > 2 else None)
+        stats = db.ingest_partitions(partitions_dir)
+        summary = db.summary()
+        print(f"📦 {db.path}: {summary['results']} results, {summary['races']} races, "
+              f"{len(summary['seasons'])} seasons ({stats['skipped']} partitions unchanged)")
+        return 0
+    if argv[:1] == ["lookup"] and len(argv) == 4:
+        path = find_race_db()
+        if path is None:
+            print("❌ No race_results.sqlite found; run the ingest first")
+            return 1
+        result = RaceResultsDB(path, readonly=True).find_result(int(argv[1]), argv[2], argv[3])
+        if result is None:
+            print("❌ No matching result")
+            return 1
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 0
+    print(__doc__)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Vectorized Monte Carlo race simulation on top of predict_proba.
+
+Every simulated race draws, for each driver, a finishing position from that
+driver's class distribution, then orders the grid by the draws (random
+tie-breaks). Each sample is therefore a valid permutation, positions the
+model never predicts (P7, P11 ...) are filled naturally, and a driver whose
+distribution sits higher than the others' finishes ahead of them more often.
+
+All K races are drawn at once: one uniform matrix compared against each
+CDF column, one argsort along the grid axis, one bincount for the summary.
+Seeded with numpy's default_rng, so a seed reproduces the exact same races.
+
+    python benchmark_simulator.py          # 100k races of a 20-car grid
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+# Points for P1..P10 (no fastest-lap or sprint points)
+POINTS = np.array([25, 18, 15, 12, 10, 8, 6, 4, 2, 1], dtype=float)
+PODIUM = 3
+CHUNK_SIMULATIONS = 8192
+POINTS_POSITIONS = len(POINTS)
+
+
+def sample_finishing_positions(probabilities: np.ndarray, classes, simulations: int,
+                               rng: np.random.Generator) -> np.ndarray:
+    """(simulations, n_drivers) finishing positions 1..n; every row is a permutation"""
+    probabilities = np.asarray(probabilities, dtype=float)
+    classes = np.asarray(classes, dtype=float)
+    n_drivers, n_classes = probabilities.shape
+
+    # Inverse-CDF draw for every (race, driver): the class index is how many of the
+    # driver's CDF steps the uniform clears, counted one class column at a time
+    cdf = np.cumsum(probabilities, axis=1)
+    cdf /= cdf[:, -1:]
+    uniforms = rng.random((simulations, n_drivers))
+    class_index = np.zeros((simulations, n_drivers), dtype=np.int8 if n_classes < 128 else np.intp)
+    for column in cdf[:, :-1].T:
+        class_index += uniforms >= column
+
+    # Order each race by the drawn positions; the fractional jitter breaks ties at random
+    scores = classes[class_index] + rng.random((simulations, n_drivers), dtype=np.float32)
+    order = np.argsort(scores, axis=1)
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(1, n_drivers + 1), axis=1)
+    return positions
+
+
+def position_counts(positions: np.ndarray) -> np.ndarray:
+    """(n_drivers, n_drivers) number of races each driver finished in P1..Pn"""
+    n_drivers = positions.shape[1]
+    cells = (np.arange(n_drivers) * n_drivers + positions - 1).ravel()
+    return np.bincount(cells, minlength=n_drivers * n_drivers).reshape(n_drivers, n_drivers)
+
+
+def position_distribution(positions: np.ndarray) -> np.ndarray:
+    """(n_drivers, n_drivers) share of races each driver finished in P1..Pn"""
+    return position_counts(positions) / len(positions)
+
+
+def summarize(distribution: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per-driver probabilities and expectations from a position distribution"""
+    n_drivers = distribution.shape[1]
+    points = np.zeros(n_drivers)
+    points[:min(n_drivers, POINTS_POSITIONS)] = POINTS[:n_drivers]
+    return {
+        "win_probability": distribution[:, 0],
+        "podium_probability": distribution[:, :PODIUM].sum(axis=1),
+        "points_probability": distribution[:, :POINTS_POSITIONS].sum(axis=1),
+        "expected_points": distribution @ points,
+        "expected_position": distribution @ np.arange(1, n_drivers + 1),
+        "position_distribution": distribution,
+    }
+
+
+def simulate_race(probabilities: np.ndarray, classes, simulations: int = 100_000,
+                  seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Simulate `simulations` races and summarize them per driver"""
+    rng = np.random.default_rng(seed)
+    n_drivers = len(probabilities)
+    counts = np.zeros((n_drivers, n_drivers), dtype=np.int64)
+    # Cache-sized blocks of races: faster than one huge block, and memory stays flat
+    for start in range(0, simulations, CHUNK_SIMULATIONS):
+        block = min(CHUNK_SIMULATIONS, simulations - start)
+        counts += position_counts(sample_finishing_positions(probabilities, classes, block, rng))
+    return summarize(counts / simulations)
@@ -8,28 +8,16 @@ from sklearn.metrics import r2_score, mean_squared_error
 import joblib
 import os
 
-# Get the directory of this script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-csv_path = os.path.join(script_dir, "driver_stats.csv")
-
-# Check if file exists, if not try the Scraper folder
-if not os.path.exists(csv_path):
-    csv_path = os.path.join(os.path.dirname(script_dir), "Scraper", "driver_stats.csv")
-
-print(f"Looking for CSV file at: {csv_path}")
-if os.path.exists(csv_path):
-    print("✅ CSV file found!")
-else:
-    print("❌ CSV file not found!")
+from f1_data import load_dataset
+
+# Load the cleaned standings (normalized columns, numeric pts/season, driver codes stripped)
+try:
+    df = load_dataset(['driver', 'driver_clean', 'team', 'pts', 'season'])
+    print("✅ Standings loaded!")
+except FileNotFoundError as e:
+    print(f"❌ {e}")
     exit(1)
 
-
-# Load the CSV text (replace with actual file read in your case)
-df = pd.read_csv(csv_path)  # Use the dynamically found CSV path
-
-# Clean column names
-df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
-
 # Print column names to debug
 print("Available columns:", df.columns.tolist())
 print("Data shape:", df.shape)
@@ -37,9 +25,6 @@ print("First few rows:")
 print(df.head())
 
 # Clean data
-df['driver_clean'] = df['driver'].str.extract(r'^(.*?)\s?[A-Z]{2,3}$')  # Extract name
-df['pts'] = pd.to_numeric(df['pts'], errors='coerce')  # Ensure points are numeric
-df['season'] = pd.to_numeric(df['season'], errors='coerce')
 df['driver_experience'] = df.groupby('driver_clean')['season'].transform(lambda x: x.rank(method='dense'))
 
 # Add team encoding
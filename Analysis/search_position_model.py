@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+
+"""
+Parallel hyperparameter search for the position classifier.
+
+train_position_model.py fits one hardcoded forest. This CLI evaluates a grid of
+RandomForestClassifier configurations with k-fold CV across a process pool:
+
+- the training frame and CV fold indices are built once in the parent and
+  handed to each worker process once (pool initializer), not per config
+- every finished config is appended to a JSONL results file straight away, so
+  an interrupted search resumes by skipping the configs already recorded
+- the best config is refit on all rows and saved with save_model(), which
+  writes the model and its f1_model_info together (hash-linked)
+
+    python search_position_model.py                      # default grid, all cores
+    python search_position_model.py --space space.json --folds 5 --jobs 16
+    python search_position_model.py --publish            # also publish to the model registry
+
+A --space file maps parameter names to lists of values, e.g.
+{"n_estimators": [100, 300], "max_depth": [null, 10]}.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import KFold
+
+from f1_data import POSITION_FEATURES as FEATURES, position_training_frame
+from model_loader import INFO_FILENAME, MODEL_FILENAME, save_model
+from team_resolver import TEAM_MAPPING
+
+# 4 * 4 * 3 * 3 * 2 = 288 configurations
+DEFAULT_SPACE = {
+    "n_estimators": [50, 100, 200, 400],
+    "max_depth": [None, 5, 10, 20],
+    "min_samples_split": [2, 5, 10],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", None],
+}
+
+RESULTS_FILENAME = "search_results.jsonl"
+
+# Set once per worker process by _init_worker
+_worker_data: Dict[str, object] = {}
+
+
+def build_training_frame() -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """Features, target and row keys exactly as train_position_model.py prepares them"""
+    df = position_training_frame()
+    return df[FEATURES].to_numpy(dtype=float), df['position'].to_numpy(), df['row_key'].tolist()
+
+
+def expand_space(space: Dict[str, List]) -> List[dict]:
+    """Grid -> list of param dicts, in a stable order"""
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def config_key(params: dict) -> str:
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def make_folds(n_rows: int, n_splits: int, seed: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    return list(KFold(n_splits=n_splits, shuffle=True, random_state=seed).split(np.arange(n_rows)))
+
+
+def search_id(X: np.ndarray, y: np.ndarray, folds, seed: int) -> str:
+    """Identifies the data + folds a results line was scored against"""
+    digest = hashlib.sha256()
+    for array in (X, y, *[idx for fold in folds for idx in fold]):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    digest.update(str(seed).encode())
+    return digest.hexdigest()[:16]
+
+
+def _init_worker(X: np.ndarray, y: np.ndarray, folds, seed: int) -> None:
+    _worker_data.update(X=X, y=y, folds=folds, seed=seed)
+
+
+def evaluate_config(params: dict) -> dict:
+    """CV accuracy for one config, using the worker's shared data and folds"""
+    X, y, folds, seed = (_worker_data[k] for k in ("X", "y", "folds", "seed"))
+    started = time.perf_counter()
+    scores = []
+    for train_idx, test_idx in folds:
+        model = RandomForestClassifier(random_state=seed, n_jobs=1, **params)
+        model.fit(X[train_idx], y[train_idx])
+        scores.append(float((model.predict(X[test_idx]) == y[test_idx]).mean()))
+    return {
+        "key": config_key(params),
+        "params": params,
+        "mean_accuracy": float(np.mean(scores)),
+        "std_accuracy": float(np.std(scores)),
+        "fold_accuracy": scores,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "pid": os.getpid(),
+    }
+
+
+def read_results(path: str, run_id: str) -> Dict[str, dict]:
+    """Completed configs for this search; a torn last line is ignored"""
+    done: Dict[str, dict] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if result.get("search_id") == run_id:
+                done[result["key"]] = result
+    return done
+
+
+def _drop_torn_tail(path: str) -> None:
+    """Cut a partial last line (killed mid-write) so appends start on a fresh line"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def run_search(X: np.ndarray, y: np.ndarray, configs: Iterable[dict], folds, results_path: str,
+               jobs: Optional[int] = None, seed: int = 42, log=print) -> List[dict]:
+    """Evaluate every config not yet in results_path; returns the results for these configs"""
+    configs = list(configs)
+    run_id = search_id(X, y, folds, seed)
+    # Earlier runs of the same search may have covered a different --space
+    wanted = {config_key(p) for p in configs}
+    done = {key: result for key, result in read_results(results_path, run_id).items() if key in wanted}
+    pending = [p for p in configs if config_key(p) not in done]
+    total = len(done) + len(pending)
+    if done:
+        log(f"↩️ Resuming: {len(done)} configs already in {results_path}, {len(pending)} to go")
+    if not pending:
+        return list(done.values())
+
+    jobs = jobs or os.cpu_count() or 1
+    started = time.perf_counter()
+    _drop_torn_tail(results_path)
+    with open(results_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(X, y, folds, seed)) as pool:
+        futures = [pool.submit(evaluate_config, params) for params in pending]
+        for future in as_completed(futures):
+            result = {"search_id": run_id, **future.result()}
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            done[result["key"]] = result
+            log(f"  [{len(done)}/{total}] {result['wall_seconds']:.2f}s "
+                f"acc={result['mean_accuracy']:.3f}±{result['std_accuracy']:.3f} {result['params']}")
+
+    elapsed = time.perf_counter() - started
+    busy = sum(done[config_key(p)]["wall_seconds"] for p in pending)
+    log(f"⏱️ {len(pending)} configs in {elapsed:.1f}s wall ({busy:.1f}s of fitting, "
+        f"{busy / elapsed if elapsed else 0:.1f}x parallel on {jobs} processes)")
+    return list(done.values())
+
+
+def best_result(results: List[dict]) -> dict:
+    """Highest mean accuracy; ties go to the steadier, then the cheaper config"""
+    return max(results, key=lambda r: (r["mean_accuracy"], -r["std_accuracy"],
+                                        -(r["params"].get("n_estimators") or 100)))
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter search for the position classifier")
+    parser.add_argument("--space", help="JSON file: parameter name -> list of values")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--results", default=RESULTS_FILENAME, help="JSONL file results stream to / resume from")
+    parser.add_argument("--model", default=MODEL_FILENAME)
+    parser.add_argument("--info", default=INFO_FILENAME)
+    parser.add_argument("--publish", action="store_true", help="Also publish the best model to the model registry")
+    args = parser.parse_args(argv)
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space, encoding="utf-8") as f:
+            space = json.load(f)
+    configs = expand_space(space)
+
+    X, y, keys = build_training_frame()
+    folds = make_folds(len(y), args.folds, args.seed)
+    print(f"🔍 {len(configs)} configs x {args.folds} folds on {X.shape[0]} rows")
+
+    results = run_search(X, y, configs, folds, args.results, args.jobs, args.seed)
+    best = best_result(results)
+    print(f"🏆 Best: acc={best['mean_accuracy']:.3f}±{best['std_accuracy']:.3f} {best['params']}")
+
+    model = RandomForestClassifier(random_state=args.seed, n_jobs=-1, **best["params"])
+    model.fit(X, y)
+    # Fit on every core, but serve single-threaded: the API calls predict_proba per request
+    model.set_params(n_jobs=1)
+    info = save_model(model, {
+        'features': FEATURES,
+        'team_mapping': TEAM_MAPPING,
+        'model_type': 'position_classification',
+        'accuracy': best['mean_accuracy'],
+        'cv_accuracy_std': best['std_accuracy'],
+        'params': best['params'],
+        'search': {'configs': len(results), 'folds': args.folds, 'seed': args.seed, 'results': args.results},
+        'trained_rows': sorted(keys),
+    }, args.model, args.info)
+    print(f"💾 Saved {args.model} + {args.info} (sha256 {info['model_sha256'][:12]})")
+
+    if args.publish:
+        from model_registry import ModelRegistry
+        version = ModelRegistry().publish(args.model, args.info)
+        print(f"📦 Published as model version {version}")
+    return best
+
+
+if __name__ == "__main__":
+    main()
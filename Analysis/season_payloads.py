@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Pre-serialized GET /historical/{season} responses.
+
+Each season is encoded to JSON bytes once at load time, along with one JSON
+fragment per (row, field). Full responses are served as-is; fields= projections
+and limit/offset pages are assembled by joining those fragments, so no row is
+re-materialized or re-validated per request. Every variant gets a strong ETag
+derived from the season content and the request parameters.
+"""
+
+import hashlib
+import json
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+SEASON_FIELDS = ("position", "driver", "team", "points", "nationality")
+
+
+def _dumps(value) -> bytes:
+    # Same compact, UTF-8 encoding FastAPI's JSONResponse uses
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+def _clean(value):
+    """NaN/NA -> None and numpy scalars -> Python types"""
+    if value is None:
+        return None
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def position_value(pos) -> Optional[int]:
+    """Finishing position as an int; None for DNF/DSQ text or a missing value"""
+    pos = _clean(pos)
+    if isinstance(pos, float):
+        return int(pos) if pos.is_integer() else None
+    return int(pos) if pos is not None and str(pos).isdigit() else None
+
+
+def season_row(record: dict) -> dict:
+    """Standings record -> /historical/{season} result item"""
+    pts = _clean(record.get('pts'))
+    return {
+        "position": position_value(record.get('pos')),
+        "driver": _clean(record.get('driver')),
+        "team": _clean(record.get('team', '')),
+        "points": float(pts) if pts is not None else None,
+        "nationality": _clean(record.get('nationality', '')),
+    }
+
+
+class SeasonPayload:
+    """JSON bytes and per-field fragments for one season"""
+
+    def __init__(self, season: int, records: Iterable[dict]):
+        self.season = season
+        rows = [season_row(r) for r in records]
+        self.count = len(rows)
+        # fragments[i][field] == b'"field":<value>'
+        self.fragments: List[Dict[str, bytes]] = [
+            {field: _dumps(field) + b":" + _dumps(row[field]) for field in SEASON_FIELDS}
+            for row in rows
+        ]
+        self.body = self._render(self.fragments, SEASON_FIELDS)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def _render(self, fragments: Sequence[Dict[str, bytes]], fields: Sequence[str]) -> bytes:
+        items = b",".join(b"{" + b",".join(f[field] for field in fields) + b"}" for f in fragments)
+        return b'{"season":' + _dumps(self.season) + b',"results":[' + items + b"]}"
+
+    def render(self, fields: Optional[Sequence[str]] = None, limit: Optional[int] = None,
+               offset: int = 0) -> Tuple[bytes, str]:
+        """(body, strong ETag) for a projection/page; the full payload is returned pre-built"""
+        fields = tuple(fields) if fields else SEASON_FIELDS
+        if fields == SEASON_FIELDS and offset == 0 and (limit is None or limit >= self.count):
+            return self.body, self.etag
+
+        end = self.count if limit is None else offset + limit
+        body = self._render(self.fragments[offset:end], fields)
+        variant = f"{self.etag}|{','.join(fields)}|{offset}|{limit}"
+        return body, f'"{hashlib.sha256(variant.encode()).hexdigest()[:32]}"'
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """'driver,points' -> ('driver', 'points'); raises ValueError on unknown fields"""
+    if not fields:
+        return None
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in SEASON_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}; available: {list(SEASON_FIELDS)}")
+    return requested or None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return etag in [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+
+
+def build_season_payloads(seasons: Dict[int, Iterable[dict]]) -> Dict[int, SeasonPayload]:
+    """season -> SeasonPayload for every loaded season"""
+    return {int(season): SeasonPayload(int(season), records) for season, records in seasons.items()}
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+Pre-fork production launcher for the prediction API.
+
+`uvicorn main:app --workers N` imports main in every worker, so each one loads
+its own forest, pandas history, indexes and pre-serialized payloads. This
+launcher imports main once, freezes the loaded objects out of the cyclic GC
+(so collections do not write to their headers and un-share the pages), binds
+the listening socket, then fork()s the workers. Workers share the parent's
+pages copy-on-write and only pay for what they touch afterwards.
+
+    python serve.py --workers 4 --port 8000
+    F1_WORKERS=4 F1_PORT=8000 python serve.py
+
+uvloop and httptools are used when installed (--loop/--http auto). Crashed
+workers are restarted; SIGINT/SIGTERM stop them all. Without os.fork (Windows)
+the launcher falls back to a single uvicorn process.
+
+Hot reloads (main.py /admin/models/reload) only reach the worker that served
+the request; set F1_MODEL_WATCH_SECONDS so every worker follows the registry.
+"""
+
+import argparse
+import gc
+import importlib.util
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Dict
+
+import uvicorn
+
+RESTART_BACKOFF_SECONDS = 1.0
+
+
+def resolve_loop(loop: str) -> str:
+    if loop == "auto":
+        return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    return loop
+
+
+def resolve_http(http: str) -> str:
+    if http == "auto":
+        return "httptools" if importlib.util.find_spec("httptools") else "h11"
+    return http
+
+
+def bind_socket(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def load_app():
+    """Import main once in the parent: model, indexes and payloads are built here"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    started = time.perf_counter()
+    import main
+    print(f"✅ Application loaded in {time.perf_counter() - started:.2f}s")
+    # Move everything loaded so far to the permanent generation; the GC no longer
+    # touches those objects, so their pages stay shared after fork()
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+def make_config(app, args) -> uvicorn.Config:
+    return uvicorn.Config(
+        app,
+        loop=resolve_loop(args.loop),
+        http=resolve_http(args.http),
+        lifespan="on",
+        log_level=args.log_level,
+        access_log=args.access_log,
+        timeout_keep_alive=args.keep_alive,
+    )
+
+
+def run_worker(app, sock: socket.socket, args) -> None:
+    """Child process: serve on the inherited socket until told to stop"""
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    server = uvicorn.Server(make_config(app, args))
+    server.run(sockets=[sock])
+
+
+def spawn(app, sock: socket.socket, args) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(app, sock, args)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def supervise(app, sock: socket.socket, args) -> None:
+    workers: Dict[int, float] = {}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for _ in range(args.workers):
+        workers[spawn(app, sock, args)] = time.monotonic()
+    print(f"🚀 Serving on {args.host}:{args.port} with {args.workers} workers "
+          f"(pids {sorted(workers)}, loop={resolve_loop(args.loop)}, http={resolve_http(args.http)})")
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+        print(f"⚠️ Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, restarting")
+        if time.monotonic() - started < RESTART_BACKOFF_SECONDS:
+            time.sleep(RESTART_BACKOFF_SECONDS)
+        workers[spawn(app, sock, args)] = time.monotonic()
+    print("👋 All workers stopped")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-fork launcher for the F1 prediction API")
+    parser.add_argument("--host", default=os.environ.get("F1_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("F1_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("F1_WORKERS", os.cpu_count() or 1)))
+    parser.add_argument("--loop", choices=["auto", "uvloop", "asyncio"], default="auto")
+    parser.add_argument("--http", choices=["auto", "httptools", "h11"], default="auto")
+    parser.add_argument("--keep-alive", type=int, default=5, help="Keep-alive timeout in seconds")
+    parser.add_argument("--log-level", default="warning")
+    parser.add_argument("--access-log", action="store_true")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    app = load_app()
+    sock = bind_socket(args.host, args.port)
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        print(f"🚀 Serving on {args.host}:{args.port} with a single process")
+        uvicorn.Server(make_config(app, args)).run(sockets=[sock])
+    else:
+        supervise(app, sock, args)
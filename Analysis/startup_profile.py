@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+"""
+Cold-start profiling for the API process.
+
+main.py runs each startup step (imports, model load and warmup, historical
+data, indexes, race results) inside a StartupProfiler phase, which records
+its wall time and how many modules it imported. When the app is ready the
+per-phase report is logged, and if F1_STARTUP_BUDGET_MS is set and
+import-to-ready took longer, StartupBudgetExceeded is raised so the process
+(or the deploy's smoke check) fails instead of quietly getting slower.
+
+    F1_STARTUP_BUDGET_MS=3000 uvicorn main:app
+    python startup_profile.py --budget 3000          # profile `import main` and exit 1 if over
+
+Diagnostics go through api_logger(): F1_LOG_LEVEL=DEBUG shows the
+per-request lines, WARNING keeps only problems (default INFO).
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+LOGGER_NAME = "f1.api"
+
+
+def api_logger(name: str = LOGGER_NAME) -> logging.Logger:
+    """stdout logger at F1_LOG_LEVEL (default INFO)"""
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.propagate = False
+    logger.setLevel(os.environ.get("F1_LOG_LEVEL", "INFO").upper())
+    return logger
+
+
+def budget_from_env() -> Optional[float]:
+    value = os.environ.get("F1_STARTUP_BUDGET_MS")
+    return float(value) if value else None
+
+
+class StartupBudgetExceeded(RuntimeError):
+    """Import-to-ready took longer than F1_STARTUP_BUDGET_MS"""
+
+
+class StartupProfiler:
+    """Wall time and imported-module count per named startup phase"""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.ready_at: Optional[float] = None
+        self.phases: List[Dict] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        modules = len(sys.modules)
+        started = self.clock()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "name": name,
+                "ms": round((self.clock() - started) * 1000, 1),
+                "modules": len(sys.modules) - modules,
+            })
+
+    def elapsed_ms(self) -> float:
+        end = self.ready_at if self.ready_at is not None else self.clock()
+        return round((end - self.started) * 1000, 1)
+
+    def summary(self, budget_ms: Optional[float] = None) -> dict:
+        return {"ready_ms": self.elapsed_ms(), "budget_ms": budget_ms, "phases": list(self.phases)}
+
+    def report(self) -> List[str]:
+        total = self.elapsed_ms()
+        lines = [f"⏱️ Ready in {total:.0f} ms"]
+        for phase in self.phases:
+            share = phase["ms"] / total * 100 if total else 0.0
+            lines.append(f"   {phase['name']:<16} {phase['ms']:>8.1f} ms {share:5.1f}%  (+{phase['modules']} modules)")
+        return lines
+
+    def ready(self, logger: Optional[logging.Logger] = None, budget_ms: Optional[float] = None) -> dict:
+        """Mark the process ready, log the report and enforce the budget (default F1_STARTUP_BUDGET_MS)"""
+        self.ready_at = self.clock()
+        budget_ms = budget_ms if budget_ms is not None else budget_from_env()
+        over_budget = budget_ms is not None and self.elapsed_ms() > budget_ms
+        if logger is not None:
+            for line in self.report():
+                logger.log(logging.WARNING if over_budget else logging.INFO, line)
+        if over_budget:
+            slowest = max(self.phases, key=lambda p: p["ms"])["name"] if self.phases else "-"
+            raise StartupBudgetExceeded(
+                f"Startup took {self.elapsed_ms():.0f} ms, over the {budget_ms:.0f} ms budget (slowest phase: {slowest})")
+        return self.summary(budget_ms)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Profile `import main` (the API's cold start) per phase")
+    parser.add_argument("--budget", type=float, help="Fail when import-to-ready exceeds this many ms")
+    parser.add_argument("--json", action="store_true", help="Print the phase summary as JSON")
+    args = parser.parse_args(argv)
+
+    if args.budget is not None:
+        os.environ["F1_STARTUP_BUDGET_MS"] = str(args.budget)
+    os.environ.setdefault("F1_LOG_LEVEL", "WARNING")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    # main.py raises the class from the importable module, not this __main__ copy
+    from startup_profile import StartupBudgetExceeded as BudgetExceeded
+    try:
+        import main as api
+    except BudgetExceeded as e:
+        print(f"❌ {e}")
+        return 1
+    if args.json:
+        print(json.dumps(api.startup_summary, indent=2))
+    else:
+        print("\n".join(api.startup.report()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
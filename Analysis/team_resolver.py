@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+"""
+One team-name resolver shared by training and serving.
+
+Scraped team strings are "<constructor> <engine>" ("McLaren Mercedes",
+"Aston Martin Aramco Mercedes", "RB Honda RBPT"), so the constructor is matched
+at the start of the string first; only if that fails do we search anywhere in
+it (sponsor names like "Oracle Red Bull Racing"). Engine suppliers never decide
+the team, which is what made the old substring checks encode "Aston Martin
+Aramco Mercedes" as Mercedes and "Red Bull Racing RBPT" as RB.
+
+Codes are fixed (not enumerate(unique_teams)), so every training script and the
+API agree on them.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict
+
+UNKNOWN_TEAM_CODE = 10
+
+# code -> canonical (current) constructor name
+TEAM_NAMES: Dict[int, str] = {
+    0: "Red Bull Racing", 1: "Mercedes", 2: "Ferrari", 3: "McLaren",
+    4: "Aston Martin", 5: "Alpine", 6: "Haas", 7: "RB",
+    8: "Williams", 9: "Kick Sauber",
+}
+
+# Former and alternative constructor names -> code
+TEAM_ALIASES: Dict[str, int] = {
+    "Red Bull": 0,
+    "Mercedes AMG": 1, "Mercedes-AMG": 1,
+    "Scuderia Ferrari": 2,
+    "Racing Point": 4, "Force India": 4,
+    "Renault": 5, "Lotus": 5,
+    "Haas F1 Team": 6,
+    "AlphaTauri": 7, "Alpha Tauri": 7, "Toro Rosso": 7, "Racing Bulls": 7, "Visa Cash App RB": 7,
+    "Alfa Romeo": 9, "Alfa Romeo Racing": 9, "Sauber": 9, "Stake F1 Team": 9,
+}
+
+# Name -> code mapping served by /teams and stored in f1_model_info (canonical + legacy names)
+TEAM_MAPPING: Dict[str, int] = {
+    **{name: code for code, name in TEAM_NAMES.items()},
+    "AlphaTauri": 7, "Alfa Romeo": 9,
+}
+
+_ALL_NAMES = {**{name: code for code, name in TEAM_NAMES.items()}, **TEAM_ALIASES}
+_CODE_BY_NAME = {name.lower(): code for name, code in _ALL_NAMES.items()}
+
+# Longest names first so "Red Bull Racing" wins over "Red Bull" and "RB"
+_ALTERNATION = "|".join(re.escape(name) for name in sorted(_ALL_NAMES, key=len, reverse=True))
+_LEADING_TEAM = re.compile(rf"^\s*({_ALTERNATION})\b", re.IGNORECASE)
+_ANY_TEAM = re.compile(rf"\b({_ALTERNATION})\b", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def resolve_team(team: str) -> int:
+    """Team string (scraped, canonical or alias) -> team code, UNKNOWN_TEAM_CODE if unmatched"""
+    if not isinstance(team, str):
+        return UNKNOWN_TEAM_CODE
+    match = _LEADING_TEAM.match(team) or _ANY_TEAM.search(team)
+    if match is None:
+        return UNKNOWN_TEAM_CODE
+    return _CODE_BY_NAME[match.group(1).lower()]
+
+
+def team_name(team_code: int) -> str:
+    """Team code -> canonical name"""
+    return TEAM_NAMES.get(team_code, f"Team {team_code}")
+
+
+def encode_teams(teams):
+    """Vectorized resolve for a whole pandas Series: one regex pass per distinct team string"""
+    import numpy as np
+    import pandas as pd
+
+    codes, uniques = pd.factorize(teams)
+    lookup = np.array([resolve_team(team) for team in uniques] + [UNKNOWN_TEAM_CODE], dtype=np.int64)
+    # factorize marks missing values with -1, which indexes the trailing UNKNOWN entry
+    return pd.Series(lookup[codes], index=teams.index, name='team_encoded')
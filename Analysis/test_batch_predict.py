@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Test POST /predict/batch in-process against the single /predict endpoint
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import main
+from benchmark_api import BATCH_1000
+
+client = TestClient(main.app)
+
+BATCH = [
+    {"season": 2024, "team_encoded": 0, "driver_name": "Max Verstappen", "driver_experience": 10},
+    {"season": 2023, "team_encoded": 4, "driver_name": "Lance Stroll", "driver_experience": 6},
+    {"season": 2025, "team_encoded": 3, "driver_name": "Lando Norris", "driver_experience": 5},
+    {"season": 2022, "team_encoded": 8, "driver_experience": 3},
+]
+
+
+def test_batch_matches_single_predictions():
+    """Each batch result equals the single /predict response, in request order"""
+    response = client.post("/predict/batch", json=BATCH)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == len(BATCH) and body["errors"] == 0
+
+    for i, (item, result) in enumerate(zip(BATCH, body["results"])):
+        single = client.post("/predict", json=item).json()
+        assert result["index"] == i
+        assert result["prediction"] == single
+        print(f"  ✅ {item.get('driver_name', 'team ' + str(item['team_encoded']))}: P{single['predicted_position']}")
+
+
+def test_bad_item_does_not_fail_batch():
+    """An invalid item is reported in its slot while the others are still scored"""
+    response = client.post("/predict/batch", json=[BATCH[0], {"season": "not-a-year"}, BATCH[1]])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["prediction"] is not None
+    assert results[1]["prediction"] is None and "Invalid request" in results[1]["error"]
+    assert results[2]["prediction"] is not None
+    assert response.json()["errors"] == 1
+
+    response = client.post("/predict/batch", json=[BATCH[0], 5, None, "x", BATCH[1]])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["prediction"] is None for r in results] == [False, True, True, True, False]
+    assert all("Invalid request" in r["error"] for r in results[1:4])
+
+
+def test_unscorable_row_only_fails_its_slot():
+    """A row the model cannot take is an error in its slot; the rest of the batch is still scored"""
+    future = {"season": 2035, "team_encoded": 4, "driver_experience": 12}
+    alone = client.post("/predict/batch", json=[future]).json()["results"][0]["prediction"]
+
+    mixed = [future, {"season": 2024, "team_encoded": 1, "driver_experience": 10**40},
+             {"season": 2024, "team_encoded": 1, "driver_experience": 10**400}, BATCH[0]]
+    body = client.post("/predict/batch", json=mixed).json()
+    assert body["errors"] == 2
+    assert body["results"][0]["prediction"] == alone
+    for result in body["results"][1:3]:
+        assert result["prediction"] is None and "float32" in result["error"]
+    assert body["results"][3]["prediction"] == client.post("/predict", json=BATCH[0]).json()
+
+
+def test_model_failure_is_reported_per_row():
+    """When the model pass raises, rows are retried one by one and only failing rows get an error"""
+    rows = [{"season": 2040 + i, "team_encoded": i % 10, "driver_experience": 12} for i in range(4)]
+    expected = client.post("/predict/batch", json=rows).json()["results"]
+    real_predict_rows = main.serving.predict_rows
+
+    def flaky_predict_rows(X):
+        if (X[:, 0] == 2042).any():
+            raise ValueError("model exploded")
+        return real_predict_rows(X)
+
+    main.serving.predict_rows = flaky_predict_rows
+    try:
+        body = client.post("/predict/batch", json=rows).json()
+    finally:
+        del main.serving.predict_rows
+    assert body["errors"] == 1
+    assert "model exploded" in body["results"][2]["error"] and body["results"][2]["prediction"] is None
+    for i in (0, 1, 3):
+        assert body["results"][i] == expected[i]
+
+
+def test_batch_size_limit():
+    response = client.post("/predict/batch", json=[BATCH[0]] * (main.MAX_BATCH_ITEMS + 1))
+    assert response.status_code == 400
+
+
+def test_thousand_row_batch_matches_singles():
+    """A 1000-row batch (table hits and live inference) agrees with /predict row by row"""
+    body = client.post("/predict/batch", json=BATCH_1000).json()
+    assert body["count"] == len(BATCH_1000) and body["errors"] == 0
+    for i in range(0, len(BATCH_1000), 97):
+        assert body["results"][i]["prediction"] == client.post("/predict", json=BATCH_1000[i]).json()
+    print(f"  ✅ {len(BATCH_1000)} rows scored; speed vs single calls is checked by benchmark_api.py")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing batch prediction")
+    print("=" * 40)
+    test_batch_matches_single_predictions()
+    test_bad_item_does_not_fail_batch()
+    test_unscorable_row_only_fails_its_slot()
+    test_model_failure_is_reported_per_row()
+    test_batch_size_limit()
+    test_thousand_row_batch_matches_singles()
+    print("\n✅ All tests completed!")
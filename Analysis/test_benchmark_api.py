@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""
+Test the in-process benchmark runner and its baseline comparison
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_api import check_batch, compare, load_app, run_suite
+
+
+def test_suite_runs_in_process():
+    results = asyncio.run(run_suite(load_app(), ["predict_historical", "historical_season"],
+                                    requests=20, concurrency=4, warmup=2))
+    for name, r in results.items():
+        assert r["requests"] == 20, name
+        assert 0 < r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"], name
+        assert r["throughput_rps"] > 0, name
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {"predict": {"p50_ms": 1.0, "p95_ms": 2.0, "throughput_rps": 1000.0}}
+    steady = {"predict": {"p50_ms": 1.1, "p95_ms": 2.3, "throughput_rps": 900.0}}
+    assert compare(steady, baseline, tolerance=0.2, min_delta_ms=0.0) == []
+
+    slower = {"predict": {"p50_ms": 1.5, "p95_ms": 2.1, "throughput_rps": 700.0}, "new": {"p50_ms": 9.0}}
+    regressions = compare(slower, baseline, tolerance=0.2, min_delta_ms=0.0)
+    assert [r.split(":")[0] for r in regressions] == ["predict.p50_ms", "predict.throughput_rps"]
+
+    # A 50% jump that is only 0.5 ms is noise under min_delta_ms=1
+    assert [r.split(":")[0] for r in compare(slower, baseline, 0.2, min_delta_ms=1.0)] == ["predict.throughput_rps"]
+
+
+
+def test_batch_must_beat_single_calls():
+    fast = {"predict_batch_1000": {"p50_ms": 9.0}, "predict_historical": {"p50_ms": 1.0}}
+    assert check_batch(fast) == []
+    slow = {"predict_batch_1000": {"p50_ms": 12.0}, "predict_historical": {"p50_ms": 1.0}}
+    assert [r.split(":")[0] for r in check_batch(slow)] == ["predict_batch_1000.p50_ms"]
+    assert check_batch({"predict_historical": {"p50_ms": 1.0}}) == []
+
+
+if __name__ == "__main__":
+    print("🧪 Testing benchmark suite")
+    print("=" * 40)
+    test_suite_runs_in_process()
+    test_compare_flags_only_real_regressions()
+    test_batch_must_beat_single_calls()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Test that the NumPy forest evaluator reproduces sklearn's predict_proba bit for bit
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compiled_forest import CompiledForest, compile_forest
+from model_loader import ModelArtifactError, find_model_artifact, load_model
+from model_registry import COMPILED_BATCH_LIMIT, ServingModel
+from prediction_table import domain_grid
+
+
+def _bits(a):
+    return np.ascontiguousarray(a, dtype=np.float64).view(np.uint64)
+
+
+def _assert_identical(forest, model, X):
+    assert np.array_equal(_bits(forest.predict_proba(X)), _bits(model.predict_proba(X)))
+    assert np.array_equal(forest.predict(X), model.predict(X))
+
+
+def _continuous_forest(seed, **params):
+    rng = np.random.RandomState(seed)
+    X = rng.normal(size=(400, 4)) * [1, 10, 1e-3, 1e4]
+    y = (X[:, 0] > 0).astype(int) * 3 + rng.randint(0, 3, 400)
+    model = RandomForestClassifier(random_state=seed, **params).fit(X, y)
+    return model, X
+
+
+def test_matches_sklearn_on_random_and_boundary_inputs():
+    for params in ({"n_estimators": 30}, {"n_estimators": 7, "max_depth": 3},
+                   {"n_estimators": 20, "class_weight": "balanced", "min_samples_leaf": 5},
+                   {"n_estimators": 15, "max_features": None, "bootstrap": False}):
+        model, X_train = _continuous_forest(1, **params)
+        forest = CompiledForest.from_sklearn(model)
+        rng = np.random.RandomState(2)
+        _assert_identical(forest, model, X_train)
+        _assert_identical(forest, model, rng.normal(size=(500, 4)) * [3, 30, 3e-3, 3e4])
+
+        # Right on, and one float32/float64 ulp around, every split threshold
+        tree = model.estimators_[0].tree_
+        splits = tree.children_left != -1
+        edges = []
+        for feature, threshold in zip(tree.feature[splits], tree.threshold[splits]):
+            for value in (threshold, np.nextafter(threshold, np.inf), np.nextafter(threshold, -np.inf),
+                          np.nextafter(np.float32(threshold), np.float32(np.inf))):
+                row = X_train[len(edges) % len(X_train)].copy()
+                row[feature] = value
+                edges.append(row)
+        _assert_identical(forest, model, np.array(edges))
+
+
+def test_single_row_and_leaf_ids():
+    model, X_train = _continuous_forest(3, n_estimators=12)
+    forest = CompiledForest.from_sklearn(model)
+    for row in X_train[:20]:
+        _assert_identical(forest, model, row.reshape(1, -1))
+    leaves = forest.apply(X_train[:50])
+    assert np.array_equal(leaves, model.apply(X_train[:50]) + forest.roots)
+
+
+def test_served_model_over_domain():
+    try:
+        model, _ = load_model(*find_model_artifact())
+    except ModelArtifactError:
+        print("⚠️ No model artifact, skipping")
+        return
+    forest = compile_forest(model)
+    assert forest is not None
+    X = np.vstack([domain_grid(), [[2035, 9, 25], [2019.5, 3.2, -1], [2024, 0, 1e9]]])
+    _assert_identical(forest, model, X)
+
+
+def test_save_load_roundtrip_and_validation():
+    model, X_train = _continuous_forest(4, n_estimators=5)
+    forest = CompiledForest.from_sklearn(model)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "forest.npz")
+        forest.save(path)
+        loaded = CompiledForest.load(path)
+    _assert_identical(loaded, model, X_train)
+    assert loaded.depth == forest.depth and loaded.n_estimators == 5
+
+    for bad in (np.array([[np.nan, 0, 0, 0]]), np.array([[1e39, 0, 0, 0]]), np.zeros((2, 3))):
+        try:
+            forest.predict_proba(bad)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+
+def test_serving_model_uses_numpy_evaluator():
+    X = domain_grid()[::7]
+    y = (X[:, 1] * 2).astype(int) + 1
+    model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+    serving = ServingModel(model, {"model_sha256": "f" * 64, "classes": sorted(set(y.tolist()))}, "f" * 12, "memory")
+    assert serving.evaluator_name == "numpy"
+    positions, confidences = serving.predict_rows(np.array([[2024, 3, 5], [2040, 9, 30]], dtype=float))
+    proba = model.predict_proba([[2024, 3, 5], [2040, 9, 30]])
+    assert list(positions) == list(model.classes_[proba.argmax(axis=1)])
+    assert list(confidences) == list(proba.max(axis=1))
+
+    # Above the batch limit sklearn answers; the probabilities are the same bits either way
+    big = domain_grid()[: COMPILED_BATCH_LIMIT + 1]
+    assert np.array_equal(_bits(serving.predict_proba(big)), _bits(serving.forest.predict_proba(big)))
+
+
+if __name__ == "__main__":
+    print("🧪 Testing compiled forest")
+    print("=" * 40)
+    test_matches_sklearn_on_random_and_boundary_inputs()
+    test_single_row_and_leaf_ids()
+    test_served_model_over_domain()
+    test_save_load_roundtrip_and_validation()
+    test_serving_model_uses_numpy_evaluator()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Test fuzzy driver-name search: code stripping, ranking and lookup latency
+"""
+
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from driver_search import DriverSearchIndex, split_driver_code
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "driver_stats.csv")
+
+
+def _records():
+    df = pd.read_csv(CSV_PATH)
+    df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
+    return df.to_dict('records')
+
+
+def test_strips_glued_driver_codes():
+    assert split_driver_code("Max\xa0VerstappenVER") == ("Max Verstappen", "VER")
+    assert split_driver_code("Lewis Hamilton") == ("Lewis Hamilton", None)
+
+
+def test_ranked_matches():
+    """Full names, surnames, typos, prefixes and codes find the right driver first"""
+    index = DriverSearchIndex(_records())
+    cases = {
+        "Carlos Sainz": "Carlos Sainz",
+        "Lewis": "Lewis Hamilton",
+        "Verstapen": "Max Verstappen",
+        "lec": "Charles Leclerc",
+        "HAM": "Lewis Hamilton",
+        "perez": "Sergio Perez",
+    }
+    for query, expected in cases.items():
+        results = index.search(query)
+        assert results, query
+        assert results[0]['driver'] == expected, (query, results[:3])
+        print(f"  ✅ '{query}' -> {results[0]['driver']} ({results[0]['score']})")
+    assert index.search("zzzzqqq") == []
+
+
+def test_lookup_latency_at_scale():
+    """Sub-millisecond average query time over tens of thousands of driver-season rows"""
+    # ~1,000 distinct drivers (about F1's whole history), 30 seasons each
+    base = _records()
+    records = []
+    for copy in range(40):
+        for r in base:
+            first, last = split_driver_code(r['driver'])[0].split(" ", 1)
+            for season in range(1950, 1980):
+                records.append({**r, 'driver': f"{first} {last}{chr(97 + copy % 26)}{copy}", 'season': season})
+    index = DriverSearchIndex(records)
+    queries = ["Hamilton", "Max Verstapen", "lec", "Sainz 12", "Fernando"] * 40
+
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q)
+    per_query_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"  ⏱️ {len(records)} rows, {len(index.drivers)} drivers: {per_query_ms:.3f} ms/query")
+    assert per_query_ms < 1.0
+
+
+if __name__ == "__main__":
+    print("🧪 Testing driver search")
+    print("=" * 40)
+    test_strips_glued_driver_codes()
+    test_ranked_matches()
+    test_lookup_latency_at_scale()
+    print("\n✅ All tests completed!")
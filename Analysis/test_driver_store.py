@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+Test that the season store round-trips the scraped standings with typed columns
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from driver_store import DriverStore, load_standings, normalize_columns, write_store
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "driver_stats.csv")
+
+
+def test_round_trip_matches_csv():
+    """Every value survives, with categorical text columns and numeric pos/pts/season"""
+    raw = pd.read_csv(CSV_PATH)
+    expected = normalize_columns(raw)
+    with tempfile.TemporaryDirectory() as tmp:
+        write_store(raw, tmp)
+        df = load_standings(root=tmp)
+
+    assert len(df) == len(expected)
+    for column in ('driver', 'team', 'nationality'):
+        assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        assert df[column].astype(str).tolist() == expected[column].astype(str).tolist()
+    assert df['season'].dtype == np.int16
+    assert np.array_equal(df['pos'].to_numpy(), expected['pos'].to_numpy(dtype=float))
+    assert np.allclose(df['pts'].to_numpy(), expected['pts'].to_numpy(dtype=float))
+    print(f"  ✅ {len(df)} rows round-trip")
+
+
+def test_reads_only_requested_columns_and_seasons():
+    raw = pd.DataFrame({
+        'POS.': ['1', '2', 'DQ', '1', 'NC'],
+        'DRIVER': ['Max VerstappenVER', 'Lando NorrisNOR', 'Pierre GaslyGAS', 'Lando NorrisNOR', None],
+        'NATIONALITY': ['NED', 'GBR', 'FRA', 'GBR', 'ESP'],
+        'TEAM': ['Red Bull Racing', 'McLaren', 'Alpine', 'McLaren', 'Ferrari'],
+        'PTS.': [25, 18, 0, 25, 0],
+        'Season': [2023, 2023, 2023, 2024, 2024],
+    })
+    with tempfile.TemporaryDirectory() as tmp:
+        write_store(raw, tmp)
+        store = DriverStore(tmp)
+        assert store.seasons == [2023, 2024] and store.rows == 5
+
+        df = store.load(['driver', 'pts'], seasons=[2024, 1999])
+        assert df.columns.tolist() == ['driver', 'pts']
+        assert df['driver'].tolist()[0] == 'Lando NorrisNOR' and pd.isna(df['driver'].tolist()[1])
+
+        df = store.load(['pos', 'status'], seasons=[2023])
+        assert np.isnan(df['pos'].iloc[2]) and df['status'].tolist() == ['', '', 'DQ']
+
+        # Rewriting with fewer seasons drops the stale partition
+        write_store(raw[raw['Season'] == 2024], tmp)
+        assert sorted(os.listdir(tmp)) == ['schema.json', 'season=2024.npz']
+        try:
+            store.load(['team', 'bogus'])
+            assert False, "unknown column accepted"
+        except KeyError:
+            pass
+    print("  ✅ Column and season pruning work")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing driver store")
+    print("=" * 40)
+    test_round_trip_matches_csv()
+    test_reads_only_requested_columns_and_seasons()
+    print("\n✅ All tests completed!")
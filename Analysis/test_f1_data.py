@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+
+"""
+Test that the shared loader cleans once and re-cleans only when the source changes
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import f1_data
+
+RAW = pd.DataFrame({
+    'POS.': ['1', '2', 'DQ', '1'],
+    'DRIVER': ['Max VerstappenVER', 'Lando NorrisNOR', 'Pierre GaslyGAS', 'Lando Norris'],
+    'NATIONALITY': ['NED', 'GBR', 'FRA', 'GBR'],
+    'TEAM': ['Red Bull Racing', 'McLaren', 'Alpine', 'McLaren'],
+    'PTS.': ['25', '18', '0', '25'],
+    'Season': [2023, 2023, 2023, 2024],
+})
+
+
+def _counting_clean(calls):
+    original = f1_data.clean_standings
+
+    def clean(df):
+        calls.append(len(df))
+        return original(df)
+    return clean
+
+
+def test_cleaning_steps():
+    df = f1_data.clean_standings(RAW)
+    assert df.columns[:6].tolist() == ['pos', 'driver', 'nationality', 'team', 'pts', 'season']
+    assert df['driver_clean'].tolist() == ['Max Verstappen', 'Lando Norris', 'Pierre Gasly', 'Lando Norris']
+    assert df['driver_code'].tolist()[:3] == ['VER', 'NOR', 'GAS']
+    assert df['classified'].tolist() == [True, True, False, True]
+    assert pd.api.types.is_numeric_dtype(df['pts']) and df['season'].dtype.kind == 'i'
+
+
+def test_one_driver_code_split_everywhere():
+    """Cleaning, search, the historical index and race results strip names identically"""
+    import driver_search
+    import historical_index
+    import race_results
+
+    assert driver_search.split_driver_code is f1_data.split_driver_code
+    assert race_results.split_driver_code is f1_data.split_driver_code
+    assert historical_index.split_driver_code is f1_data.split_driver_code
+    assert f1_data.split_driver_code("Max\xa0 VerstappenVER") == ("Max Verstappen", "VER")
+    assert f1_data.split_driver_code("Zhou GuanyuZHO") == ("Zhou Guanyu", "ZHO")
+    assert f1_data.split_driver_code("Lewis Hamilton") == ("Lewis Hamilton", None)
+    assert historical_index.driver_tokens("Max VerstappenVER") == ["max", "verstappenver", "max", "verstappen"]
+
+
+def test_cache_hit_and_invalidation():
+    calls = []
+    original = f1_data.clean_standings
+    f1_data.clean_standings = _counting_clean(calls)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            os.environ["F1_CACHE_DIR"] = os.path.join(tmp, "cache")
+            source = os.path.join(tmp, "driver_stats.csv")
+            RAW.to_csv(source, index=False)
+
+            first = f1_data.load_dataset(source=source)
+            second = f1_data.load_dataset(source=source)
+            assert calls == [4], "second load should come from the cache"
+            pd.testing.assert_frame_equal(first, second)
+
+            finishers = f1_data.load_dataset(source=source, classified_only=True, seasons=[2023])
+            assert finishers['driver_clean'].tolist() == ['Max Verstappen', 'Lando Norris']
+            assert calls == [4]
+
+            # Any change to the source content means a new key and a fresh clean
+            RAW.iloc[:3].to_csv(source, index=False)
+            assert len(f1_data.load_dataset(source=source)) == 3
+            assert calls == [4, 3]
+    finally:
+        f1_data.clean_standings = original
+        os.environ.pop("F1_CACHE_DIR", None)
+    print("  ✅ Cleaned once per source fingerprint")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing shared data loader")
+    print("=" * 40)
+    test_cleaning_steps()
+    test_one_driver_code_split_everywhere()
+    test_cache_hit_and_invalidation()
+    print("\n✅ All tests completed!")
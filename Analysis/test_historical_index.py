@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+Test that the historical index returns the same rows as the old per-request pandas scans
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from historical_index import HistoricalIndex
+from team_resolver import encode_teams
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "driver_stats.csv")
+
+QUERIES = [
+    ("Max Verstappen", None), ("Lewis Hamilton", 1), ("Carlos Sainz", None), ("Verstappen", None),
+    ("Lance Stroll", 4), ("Nobody Known", 7), ("Nobody Known", 9), ("MaxVerstappen", None),
+    (None, 0), (None, 4), (None, 7), (None, 10), (None, 12), ("Kimi Antonelli", 1), ("Oscar", None),
+]
+
+
+def _load():
+    df = pd.read_csv(CSV_PATH)
+    df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
+    return df
+
+
+def _scan_lookup(df, season, driver_name, team_encoded):
+    """The per-request driver scans get_historical_data used before the index"""
+    season_data = df[df['season'] == season]
+    if season_data.empty:
+        return None
+    if driver_name:
+        parts = driver_name.strip().split()
+        first_name = parts[0] if parts else ""
+        last_name = parts[-1] if len(parts) > 1 else ""
+        matches = season_data[season_data['driver'].str.contains(first_name, case=False, na=False)] if first_name else pd.DataFrame()
+        if matches.empty and last_name:
+            matches = season_data[season_data['driver'].str.contains(last_name, case=False, na=False)]
+        if matches.empty:
+            no_spaces = driver_name.strip().replace(" ", "")
+            matches = season_data[season_data['driver'].str.replace(" ", "", regex=False).str.contains(no_spaces, case=False, na=False)]
+        if not matches.empty:
+            return matches.iloc[0].to_dict()
+    team_matches = season_data[encode_teams(season_data['team']) == team_encoded]
+    if not team_matches.empty:
+        return team_matches.loc[team_matches['pts'].idxmax()].to_dict()
+    return season_data.iloc[0].to_dict()
+
+
+def _indexed_lookup(index, season, driver_name, team_encoded):
+    block = index.season(season)
+    if block is None:
+        return None
+    result = index.find_driver(season, driver_name) if driver_name else None
+    if result is None and team_encoded is not None:
+        result = index.find_team(season, team_encoded)
+    return result if result is not None else block.records[0]
+
+
+def test_index_matches_scans():
+    """Every query resolves to the same row with the index and with the scans"""
+    df = _load()
+    index = HistoricalIndex(df)
+    for season in range(2020, 2027):
+        for driver_name, team_encoded in QUERIES:
+            expected = _scan_lookup(df, season, driver_name, team_encoded)
+            actual = _indexed_lookup(index, season, driver_name, team_encoded)
+            assert (expected is None) == (actual is None), (season, driver_name, team_encoded)
+            if expected is not None:
+                assert actual['driver'] == expected['driver'], (season, driver_name, team_encoded)
+    print(f"  ✅ {7 * len(QUERIES)} lookups match")
+
+
+def test_substring_lookups_match_a_row_scan():
+    """Prefixes, infixes, short needles and misses give the first row a linear scan would"""
+    index = HistoricalIndex(_load())
+    needles = ["", "v", "ve", "ver", "Verst", "erstap", "stappenVER", "ton", "Hamilton", "ZZZ", "xq", "maxverst",
+               "lando", "NOR", "o p", "Kimi Antonelli"]
+    checked = 0
+    for block in index.seasons.values():
+        for needle in needles:
+            for no_spaces in (False, True):
+                haystacks = block.lowered_no_spaces if no_spaces else block.lowered
+                expected = next((block.records[i] for i, h in enumerate(haystacks)
+                                 if h is not None and needle.lower() in h), None)
+                assert block.first_containing(needle, no_spaces) is expected, (needle, no_spaces)
+                checked += 1
+    print(f"  ✅ {checked} substring lookups match a scan")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing historical index")
+    print("=" * 40)
+    test_index_matches_scans()
+    test_substring_lookups_match_a_row_scan()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Test that the micro-batching scheduler coalesces concurrent rows and keeps results per caller
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inference_scheduler import InferenceScheduler
+
+
+def _echo_scorer(calls):
+    def score_batch(X):
+        calls.append(len(X))
+        # Position = team code + 1, confidence = experience / 100, so results are traceable per row
+        return X[:, 1].astype(int) + 1, X[:, 2] / 100.0
+    return score_batch
+
+
+def test_concurrent_rows_are_coalesced():
+    calls = []
+    scheduler = InferenceScheduler(_echo_scorer(calls), max_batch_size=16, max_wait_ms=20)
+    rows = [[2024, i % 10, i] for i in range(64)]
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(scheduler.predict, rows))
+    scheduler.close()
+
+    assert results == [(row[1] + 1, row[2] / 100.0) for row in rows]
+    assert sum(calls) == 64 and len(calls) < 64 and max(calls) <= 16
+    stats = scheduler.stats()
+    assert stats["rows"] == 64 and stats["batches"] == len(calls)
+    print(f"  ✅ 64 rows in {len(calls)} batches, histogram {stats['batch_size_histogram']}")
+
+
+def test_lone_row_flushes_after_deadline():
+    scheduler = InferenceScheduler(_echo_scorer([]), max_batch_size=64, max_wait_ms=2)
+    start = time.perf_counter()
+    assert scheduler.predict([2024, 3, 5]) == (4, 0.05)
+    assert time.perf_counter() - start < 0.5
+    scheduler.close()
+
+
+def test_errors_reach_every_caller():
+    def failing(X):
+        raise ValueError("bad batch")
+    scheduler = InferenceScheduler(failing, max_wait_ms=1)
+    try:
+        scheduler.predict([2024, 0, 1])
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    assert scheduler.stats()["errors"] == 1
+    scheduler.close()
+
+
+def test_oversized_batches_get_their_own_bucket():
+    """Batches above the largest bucket are not filed under it"""
+    calls = []
+    scheduler = InferenceScheduler(_echo_scorer(calls), max_batch_size=1024, max_wait_ms=1)
+    futures = [scheduler.submit([2024, i % 10, i]) for i in range(600)]
+    for future in futures:
+        future.result(timeout=5.0)
+    scheduler.close()
+
+    histogram = scheduler.stats()["batch_size_histogram"]
+    assert sum(histogram.values()) == len(calls)
+    assert histogram[">256"] == sum(1 for size in calls if size > 256)
+    assert histogram["<=256"] == sum(1 for size in calls if 128 < size <= 256)
+    print(f"  ✅ Batches {calls} -> {histogram}")
+
+
+def test_forked_worker_gets_its_own_thread():
+    """A pre-forked child (serve.py) can still submit: the worker thread is restarted there"""
+    if not hasattr(os, "fork"):
+        return
+    scheduler = InferenceScheduler(_echo_scorer([]), max_wait_ms=1)
+    try:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                ok = scheduler.predict([2024, 6, 10], timeout=2.0) == (7, 0.1)
+            except Exception:
+                ok = False
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert scheduler.predict([2024, 1, 2]) == (2, 0.02)
+    finally:
+        scheduler.close()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing inference scheduler")
+    print("=" * 40)
+    test_concurrent_rows_are_coalesced()
+    test_lone_row_flushes_after_deadline()
+    test_errors_reach_every_caller()
+    test_oversized_batches_get_their_own_bucket()
+    test_forked_worker_gets_its_own_thread()
+    print("\n✅ All tests completed!")
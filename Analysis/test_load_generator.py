@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Test the load generator's request mix and both pacing modes against the in-process app
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_api import load_app
+from load_generator import build_requests, parse_mix, run_load
+
+
+def test_mix_is_normalized_and_validated():
+    assert parse_mix("predict=3,teams=1") == {"predict": 0.75, "teams": 0.25}
+    for bad in ("predict=0", "health=1"):
+        try:
+            parse_mix(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} should be rejected")
+
+
+def test_requests_follow_the_mix_and_fixtures():
+    requests = build_requests({"predict": 0.5, "historical": 0.5}, 400, seed=1)
+    assert requests == build_requests({"predict": 0.5, "historical": 0.5}, 400, seed=1)
+    endpoints = [r[0] for r in requests]
+    assert 150 < endpoints.count("predict") < 250 and "teams" not in endpoints
+    for endpoint, method, path, body in requests:
+        if endpoint == "predict":
+            assert (method, path) == ("POST", "/predict") and body["driver_name"]
+        else:
+            assert method == "GET" and path.startswith("/historical/20") and body is None
+
+
+def _run(**kwargs):
+    transport = httpx.ASGITransport(app=load_app())
+    requests = kwargs.pop("requests")
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull  # main logs every request
+        try:
+            return asyncio.run(run_load("http://load", requests, transport=transport, **kwargs))
+        finally:
+            sys.stdout = stdout
+
+
+def test_closed_loop_reports_latency_and_errors():
+    requests = build_requests(parse_mix("predict=0.6,historical=0.2,teams=0.2"), 60, seed=3)
+    requests += [("historical", "GET", "/historical/1900", None)] * 5
+    summary = _run(requests=requests, concurrency=4)
+    assert summary["requests"] == 65 and summary["ok"] == 60
+    assert summary["errors"] == {"historical: 404": 5}
+    assert sum(summary["histogram"].values()) == 65
+    assert set(summary["by_endpoint"]) == {"predict", "historical", "teams"}
+    assert 0 < summary["latency"]["p50_ms"] <= summary["latency"]["p99_ms"]
+
+
+def test_open_loop_paces_to_the_target_rate():
+    summary = _run(requests=build_requests({"teams": 1.0}, 1000, seed=0), rps=200, duration=0.25)
+    # 0.25 s at 200 req/s schedules 50 requests
+    assert summary["requests"] == 50 and not summary["errors"]
+    assert summary["elapsed_s"] >= 0.24
+
+
+if __name__ == "__main__":
+    print("🧪 Testing load generator")
+    print("=" * 40)
+    test_mix_is_normalized_and_validated()
+    test_requests_follow_the_mix_and_fixtures()
+    test_closed_loop_reports_latency_and_errors()
+    test_open_loop_paces_to_the_target_rate()
+    print("\n✅ All tests completed!")
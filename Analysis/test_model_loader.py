@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+Test that the serving model loader verifies artifacts instead of retraining
+"""
+
+import os
+import sys
+import tempfile
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from model_loader import ModelArtifactError, load_model, save_model
+
+
+def _train_tiny_model():
+    X = np.array([[2021, 0, 5], [2022, 1, 3], [2023, 2, 1], [2024, 8, 2]])
+    y = np.array([1, 2, 5, 15])
+    return RandomForestClassifier(n_estimators=5, random_state=42).fit(X, y)
+
+
+def _raises(func, *args):
+    try:
+        func(*args)
+    except ModelArtifactError as e:
+        print(f"  ✅ Refused: {e}")
+        return True
+    return False
+
+
+def test_save_then_load_round_trip():
+    """A model written by save_model loads with matching metadata"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.joblib")
+        info_path = os.path.join(tmp, "info.joblib")
+        info = save_model(_train_tiny_model(), {'model_type': 'position_classification'}, model_path, info_path)
+
+        model, loaded_info = load_model(model_path, info_path)
+        assert loaded_info['model_sha256'] == info['model_sha256']
+        assert loaded_info['classes'] == [1, 2, 5, 15]
+        assert model.predict([[2023, 2, 1]])[0] == 5
+
+
+def test_refuses_tampered_or_legacy_artifacts():
+    """Hash mismatch, missing metadata and missing files all refuse to load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "model.joblib")
+        info_path = os.path.join(tmp, "info.joblib")
+        info = save_model(_train_tiny_model(), {}, model_path, info_path)
+
+        # Replace the model file with a different forest
+        joblib.dump(RandomForestClassifier(n_estimators=3, random_state=1).fit([[2020, 0, 1], [2021, 1, 2]], [1, 2]), model_path)
+        assert _raises(load_model, model_path, info_path)
+
+        # Legacy metadata without classes/content hash
+        joblib.dump({'features': info['features'], 'model_type': 'position_classification'}, info_path)
+        assert _raises(load_model, model_path, info_path)
+
+        assert _raises(load_model, os.path.join(tmp, "missing.joblib"), info_path)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing model loader")
+    print("=" * 40)
+    test_save_then_load_round_trip()
+    test_refuses_tampered_or_legacy_artifacts()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Test publishing, switching and hot-swapping model versions through the registry
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inference_scheduler import InferenceScheduler
+from model_loader import ModelArtifactError
+from model_registry import ModelRegistry
+
+X = np.array([[2021, 0, 5], [2022, 1, 3], [2023, 2, 1], [2024, 8, 2], [2025, 4, 6], [2023, 9, 0]])
+
+
+def _forest(y, seed):
+    return RandomForestClassifier(n_estimators=5, random_state=seed).fit(X, y)
+
+
+def test_publish_and_switch_versions():
+    """Published versions are content-addressed and CURRENT moves atomically"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        assert registry.current_version() is None
+
+        v1 = registry.publish_model(_forest([1, 2, 3, 4, 5, 6], 1), {})
+        v2 = registry.publish_model(_forest([10, 11, 12, 13, 14, 15], 2), {})
+        assert v1 != v2
+        assert set(registry.list_versions()) == {v1, v2}
+        assert registry.current_version() == v2
+
+        registry.set_current(v1)
+        serving = registry.load()
+        assert serving.version == v1
+        assert serving.model_info['model_sha256'].startswith(v1)
+        serving.warm_up()
+
+        try:
+            registry.set_current("does-not-exist")
+            assert False, "unknown version accepted"
+        except ModelArtifactError:
+            pass
+        assert registry.current_version() == v1
+        print(f"  ✅ {v1} -> {v2} -> {v1}")
+
+
+def test_version_names_stay_inside_the_registry():
+    """Only hash-named directories are versions; paths like ../.. are refused"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        version = registry.publish_model(_forest([1, 2, 3, 4, 5, 6], 1), {})
+        os.makedirs(os.path.join(registry.versions_dir, ".staging-abc"))
+        assert registry.list_versions() == [version]
+
+        for bad in ("../..", "..", version + "/..", version.upper(), ""):
+            try:
+                registry.version_paths(bad)
+                assert False, f"{bad!r} accepted"
+            except ModelArtifactError:
+                pass
+        print("  ✅ Traversal and non-hash names rejected")
+
+
+def test_admin_endpoints_need_a_configured_token():
+    """Admin calls are refused without F1_ADMIN_TOKEN and 404 on unknown versions"""
+    from fastapi.testclient import TestClient
+    import main
+
+    client = TestClient(main.app)
+    saved = os.environ.pop("F1_ADMIN_TOKEN", None)
+    try:
+        assert client.get("/admin/models").status_code == 503
+        assert client.post("/admin/models/reload").status_code == 503
+
+        os.environ["F1_ADMIN_TOKEN"] = "secret"
+        assert client.get("/admin/models").status_code == 403
+        assert client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 403
+        headers = {"X-Admin-Token": "secret"}
+        assert client.get("/admin/models", headers=headers).status_code == 200
+        for version in ("../..", "000000000000"):
+            response = client.post("/admin/models/reload", params={"version": version}, headers=headers)
+            assert response.status_code == 404, (version, response.status_code)
+    finally:
+        os.environ.pop("F1_ADMIN_TOKEN", None)
+        if saved is not None:
+            os.environ["F1_ADMIN_TOKEN"] = saved
+    print("  ✅ 503 without a token, 403 on a wrong one, 404 for unknown versions")
+
+
+def test_inflight_rows_keep_their_model():
+    """Rows queued against the old model are scored by it after a swap"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(tmp)
+        old = registry.load(registry.publish_model(_forest([1, 1, 1, 1, 1, 1], 1), {}))
+        new = registry.load(registry.publish_model(_forest([20, 20, 20, 20, 20, 20], 2), {}))
+
+        scheduler = InferenceScheduler(new.predict_rows, max_batch_size=64, max_wait_ms=20)
+        try:
+            before = [scheduler.submit(row, old.predict_rows) for row in X]
+            after = [scheduler.submit(row) for row in X]
+            assert [f.result(timeout=5.0)[0] for f in before] == [1] * len(X)
+            assert [f.result(timeout=5.0)[0] for f in after] == [20] * len(X)
+        finally:
+            scheduler.close()
+        print("  ✅ In-flight rows finished on the model they started with")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing model registry")
+    print("=" * 40)
+    test_publish_and_switch_versions()
+    test_version_names_stay_inside_the_registry()
+    test_admin_endpoints_need_a_configured_token()
+    test_inflight_rows_keep_their_model()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Test POST /predict/grid and the unique-position assignment behind it
+"""
+
+import itertools
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import main
+from race_grid import assign_grid, position_matrix
+
+client = TestClient(main.app)
+
+# 2024 entry list: (driver, team_encoded, experience)
+ENTRY_LIST = [
+    ("Max Verstappen", 0, 10), ("Sergio Perez", 0, 14), ("Lewis Hamilton", 1, 18), ("George Russell", 1, 6),
+    ("Charles Leclerc", 2, 7), ("Carlos Sainz", 2, 10), ("Lando Norris", 3, 6), ("Oscar Piastri", 3, 2),
+    ("Fernando Alonso", 4, 20), ("Lance Stroll", 4, 8), ("Pierre Gasly", 5, 8), ("Esteban Ocon", 5, 8),
+    ("Nico Hulkenberg", 6, 12), ("Kevin Magnussen", 6, 9), ("Yuki Tsunoda", 7, 4), ("Daniel Ricciardo", 7, 14),
+    ("Alexander Albon", 8, 5), ("Logan Sargeant", 8, 2), ("Valtteri Bottas", 9, 12), ("Zhou Guanyu", 9, 3),
+]
+
+
+def _brute_force(probabilities, classes):
+    n = len(probabilities)
+    log_p = np.log(np.maximum(position_matrix(probabilities, classes, n), 1e-12))
+    return max(sum(log_p[d, p - 1] for d, p in enumerate(order)) for order in itertools.permutations(range(1, n + 1)))
+
+
+def test_assignment_is_optimal_and_unique():
+    rng = np.random.RandomState(0)
+    classes = np.array([1, 2, 3, 5, 6, 9])
+    for _ in range(20):
+        probabilities = rng.dirichlet(np.ones(len(classes)) * 0.5, size=6)
+        positions, assigned, log_likelihood = assign_grid(probabilities, classes)
+        assert sorted(positions) == list(range(1, 7))
+        assert abs(log_likelihood - _brute_force(probabilities, classes)) < 1e-9
+        matrix = position_matrix(probabilities, classes, 6)
+        assert np.allclose(assigned, matrix[np.arange(6), positions - 1])
+
+
+def test_unreachable_positions_follow_expected_position():
+    # Nobody can finish P3/P4 (no such classes): the ties go by expected position
+    classes = np.array([1, 2, 5])
+    probabilities = np.array([[0.9, 0.1, 0.0], [0.1, 0.8, 0.1], [0.0, 0.1, 0.9], [0.0, 0.2, 0.8], [0.0, 0.5, 0.5]])
+    positions, _, _ = assign_grid(probabilities, classes)
+    assert list(positions[:2]) == [1, 2]
+    assert sorted(positions) == [1, 2, 3, 4, 5]
+    assert positions[4] == 3  # expected position 3.5, the lowest of the three left over
+
+
+def test_grid_endpoint_returns_consistent_order():
+    body = {"season": 2024, "race_name": "Monaco Grand Prix",
+            "entries": [{"driver_name": d, "team_encoded": t, "driver_experience": e} for d, t, e in ENTRY_LIST]}
+    response = client.post("/predict/grid", json=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["count"] == 20
+    assert [slot["position"] for slot in result["grid"]] == list(range(1, 21))
+    assert {slot["driver_name"] for slot in result["grid"]} == {d for d, _, _ in ENTRY_LIST}
+
+    # independent_position is what /predict says for the driver on its own
+    for slot in result["grid"]:
+        driver, team, experience = next(e for e in ENTRY_LIST if e[0] == slot["driver_name"])
+        single = client.post("/predict", json={"season": 2024, "team_encoded": team,
+                                               "driver_experience": experience}).json()
+        assert slot["independent_position"] == single["predicted_position"]
+    independent = [slot["independent_position"] for slot in result["grid"]]
+    assert len(set(independent)) < 20  # why the grid endpoint exists
+    print(f"  ✅ P1 {result['grid'][0]['driver_name']}, log-likelihood {result['log_likelihood']:.2f}")
+
+
+def test_grid_rejects_empty_and_oversized_lists():
+    assert client.post("/predict/grid", json={"season": 2024, "entries": []}).status_code == 400
+    too_many = [{"team_encoded": i % 10} for i in range(main.MAX_GRID_ENTRIES + 1)]
+    assert client.post("/predict/grid", json={"season": 2024, "entries": too_many}).status_code == 400
+    assert client.post("/predict/grid", json={"season": 2024}).status_code == 422
+
+
+def test_grid_rejects_out_of_range_features():
+    """Features beyond float32 are a 400, as for /predict, not a model failure"""
+    for entry in ({"team_encoded": 0, "driver_experience": 10 ** 40}, {"team_encoded": 10 ** 400}):
+        entries = [{"team_encoded": 1, "driver_experience": 5}, entry]
+        response = client.post("/predict/grid", json={"season": 2024, "entries": entries})
+        assert response.status_code == 400, response.text
+        assert main.FEATURE_RANGE_ERROR in response.json()["detail"]
+    print("  ✅ Out-of-range entries rejected with 400")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing grid prediction")
+    print("=" * 40)
+    test_assignment_is_optimal_and_unique()
+    test_unreachable_positions_follow_expected_position()
+    test_grid_endpoint_returns_consistent_order()
+    test_grid_rejects_empty_and_oversized_lists()
+    test_grid_rejects_out_of_range_features()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+
+"""
+Test that the precomputed prediction table matches live model inference
+"""
+
+import os
+import sys
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from prediction_table import PredictionTable, table_for_model
+
+
+def _train_model(seed=42):
+    rng = np.random.RandomState(seed)
+    X = np.column_stack([rng.randint(2020, 2026, 300), rng.randint(0, 10, 300), rng.randint(0, 21, 300)])
+    y = np.clip(X[:, 1] * 2 + rng.randint(-2, 3, 300), 1, 20)
+    return RandomForestClassifier(n_estimators=25, random_state=seed).fit(X, y)
+
+
+def test_table_matches_live_inference():
+    """Every cell equals argmax/max of a live predict_proba call"""
+    model = _train_model()
+    table = PredictionTable(model)
+    rng = np.random.RandomState(0)
+    rows = np.column_stack([rng.randint(2020, 2031, 200), rng.randint(0, 10, 200), rng.randint(0, 21, 200)])
+
+    positions, confidences, hits = table.lookup_rows(rows)
+    assert hits.all()
+    for row, position, confidence in zip(rows, positions, confidences):
+        proba = model.predict_proba([row])[0]
+        assert position == model.predict([row])[0]
+        assert confidence == proba.max()
+    print(f"  ✅ {len(rows)} table lookups match live inference")
+
+
+def test_out_of_domain_rows_miss():
+    """Rows outside season 2020-2030, team 0-9, experience 0-20 are not answered"""
+    table = PredictionTable(_train_model())
+    assert table.lookup(2019, 0, 5) is None
+    assert table.lookup(2024, 10, 5) is None
+    assert table.lookup(2024, 0, 21) is None
+    assert table.lookup(2024, 0, 5) is not None
+
+
+def test_table_rebuilt_when_artifact_changes():
+    """A new model hash builds a new table; the same hash reuses it"""
+    first = table_for_model(_train_model(1), "hash-a")
+    assert table_for_model(_train_model(1), "hash-a") is first
+    second = table_for_model(_train_model(2), "hash-b")
+    assert second is not first and second.model_sha256 == "hash-b"
+
+
+if __name__ == "__main__":
+    print("🧪 Testing prediction table")
+    print("=" * 40)
+    test_table_matches_live_inference()
+    test_out_of_domain_rows_miss()
+    test_table_rebuilt_when_artifact_changes()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Test the per-race ingest (streamed partitions -> SQLite) and the race-level API lookups
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import main
+from f1_data import split_driver_code
+from race_results import RaceResultsDB, race_key
+
+DRIVERS = [("Max Verstappen", "VER", "Red Bull Racing Honda RBPT"), ("Lando Norris", "NOR", "McLaren Mercedes"),
+           ("Sergio Pérez", "PER", "Red Bull Racing Honda RBPT"), ("Lewis Hamilton", "HAM", "Mercedes")]
+
+
+def write_partition(root, season, round_number, slug, name, records):
+    """One race partition + manifest line, in the scraper's partition layout"""
+    key = f"races/season={season}/round={round_number:02d}"
+    path = os.path.join(root, *key.split("/")) + ".ndjson"
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    body = "".join(json.dumps({**r, "Season": season, "Round": round_number, "Race": name,
+                               "RaceId": 1000 + round_number, "RaceSlug": slug}) + "\n" for r in records)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(body)
+    with open(os.path.join(root, "manifest.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"key": key, "season": season, "round": round_number, "rows": len(records),
+                            "sha256": hashlib.sha256(body.encode()).hexdigest(), "final": True}) + "\n")
+
+
+def classification(order, dnf=None):
+    records = []
+    for place, (name, code, team) in enumerate(order, start=1):
+        retired = name == dnf
+        records.append({"POS.": "NC" if retired else place, "NO.": place, "DRIVER": f"{name}{code}", "TEAM": team,
+                        "LAPS": 10 if retired else 52, "TIME / RETIRED": "DNF" if retired else "+1 lap",
+                        "PTS.": None if retired else float(max(0, 26 - place * 7))})
+    return records
+
+
+def test_race_names_and_drivers_normalize():
+    for name in ("British Grand Prix", "Great Britain", "great-britain", "FORMULA 1 BRITISH GRAND PRIX"):
+        assert race_key(name) == "great-britain", name
+    assert race_key("São Paulo Grand Prix") == "brazil" and race_key("Mexico City Grand Prix") == "mexico"
+    assert race_key("Las Vegas Grand Prix") == "las-vegas"
+    assert split_driver_code("Max VerstappenVER") == ("Max Verstappen", "VER")
+    assert split_driver_code("Zhou Guanyu") == ("Zhou Guanyu", None)
+
+
+def test_ingest_streams_chunks_and_skips_unchanged():
+    with tempfile.TemporaryDirectory() as root:
+        partitions = os.path.join(root, "partitions")
+        # 30 seasons x 20 rounds x 40 cars = 24,000 rows
+        for season in range(1996, 2026):
+            for round_number in range(1, 21):
+                write_partition(partitions, season, round_number, f"race-{round_number}", f"Race {round_number}",
+                                classification(DRIVERS * 10))
+        write_partition(partitions, 2024, 21, "great-britain", "Great Britain",
+                        classification(DRIVERS[::-1], dnf="Max Verstappen"))
+
+        db = RaceResultsDB(os.path.join(root, "race_results.sqlite"))
+        stats = db.ingest_partitions(partitions, chunk_rows=500, log=None)
+        assert stats == {"partitions": 601, "rows": 24004, "skipped": 0}
+        assert db.summary()["results"] == 24004 and len(db.summary()["seasons"]) == 30
+        assert db.ingest_partitions(partitions, log=None) == {"partitions": 0, "rows": 0, "skipped": 601}
+
+        norris = db.find_result(2024, "British Grand Prix", "Lando Norris")
+        assert (norris["pos"], norris["round"], norris["race"], norris["pts"]) == (3, 21, "Great Britain", 5.0)
+        max_ = db.find_result(2024, "British Grand Prix", "Max Verstappen")
+        assert max_["pos"] is None and max_["status"] == "NC" and max_["time"] == "DNF"
+        # Accent-insensitive full name, then a unique surname
+        assert db.find_result(2024, "great-britain", "Sergio Perez")["driver"] == "Sergio Pérez"
+        assert db.find_result(2024, "Great Britain", "Hamilton")["pos"] == 1
+        assert db.find_result(2023, "British Grand Prix", "Lando Norris") is None
+
+        # A rescraped round replaces its rows instead of adding to them
+        write_partition(partitions, 2024, 21, "great-britain", "Great Britain", classification(DRIVERS))
+        assert db.ingest_partitions(partitions, log=None)["partitions"] == 1
+        assert db.summary()["results"] == 24004
+        assert db.find_result(2024, "British Grand Prix", "Lando Norris")["pos"] == 2
+
+
+def test_actual_result_endpoint():
+    client = TestClient(main.app)
+    previous = main.race_db
+    try:
+        main.race_db = None
+        assert client.post("/actual-result", json={"season": 2024, "driver_name": "Lando Norris",
+                                                   "race_name": "British Grand Prix"}).status_code == 503
+        with tempfile.TemporaryDirectory() as root:
+            partitions = os.path.join(root, "partitions")
+            write_partition(partitions, 2024, 12, "great-britain", "Great Britain", classification(DRIVERS[::-1]))
+            path = os.path.join(root, "race_results.sqlite")
+            RaceResultsDB(path).ingest_partitions(partitions, log=None)
+            main.race_db = RaceResultsDB(path, readonly=True)
+
+            body = client.post("/actual-result", json={"season": 2024, "driver_name": "Lando Norris",
+                                                       "race_name": "British Grand Prix"}).json()
+            assert body["actual_position"] == 3 and body["round"] == 12 and body["race_name"] == "Great Britain"
+            assert client.post("/actual-result", json={"season": 2024, "driver_name": "Nobody",
+                                                       "race_name": "British Grand Prix"}).status_code == 404
+
+            prediction = client.post("/predict", json={"season": 2024, "team_encoded": 0, "driver_experience": 10,
+                                                       "driver_name": "Max Verstappen",
+                                                       "race_name": "British Grand Prix"}).json()
+            assert prediction["race_result"]["actual_position"] == 4
+            assert prediction["historical_result"]["driver"].startswith("Max")
+            future = client.post("/predict", json={"season": 2026, "team_encoded": 0, "driver_experience": 10,
+                                                   "driver_name": "Max Verstappen", "race_name": "British Grand Prix"})
+            assert future.json()["race_result"] is None
+    finally:
+        main.race_db = previous
+
+
+if __name__ == "__main__":
+    print("🧪 Testing per-race results")
+    print("=" * 40)
+    test_race_names_and_drivers_normalize()
+    test_ingest_streams_chunks_and_skips_unchanged()
+    test_actual_result_endpoint()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Test the Monte Carlo race simulator and POST /predict/simulate
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import main
+from race_simulator import POINTS, sample_finishing_positions, simulate_race
+
+client = TestClient(main.app)
+
+ENTRIES = [{"driver_name": f"Driver {team}-{experience}", "team_encoded": team, "driver_experience": experience}
+           for team in range(10) for experience in (3, 9)]
+
+
+def test_every_sample_is_a_permutation():
+    rng = np.random.default_rng(0)
+    probabilities = rng.dirichlet(np.full(6, 0.5), size=8)
+    positions = sample_finishing_positions(probabilities, [1, 2, 4, 6, 9, 12], 5000, rng)
+    assert positions.shape == (5000, 8)
+    assert (np.sort(positions, axis=1) == np.arange(1, 9)).all()
+
+
+def test_seeded_and_consistent():
+    probabilities = np.random.default_rng(1).dirichlet(np.full(20, 0.3), size=20)
+    classes = np.arange(1, 21)
+    first = simulate_race(probabilities, classes, 20_000, seed=42)
+    again = simulate_race(probabilities, classes, 20_000, seed=42)
+    other = simulate_race(probabilities, classes, 20_000, seed=43)
+    assert all(np.array_equal(first[key], again[key]) for key in first)
+    assert not np.array_equal(first["position_distribution"], other["position_distribution"])
+
+    # Exactly one winner, three podium places, ten points finishes, 101 points per race
+    assert np.isclose(first["win_probability"].sum(), 1.0)
+    assert np.isclose(first["podium_probability"].sum(), 3.0)
+    assert np.isclose(first["points_probability"].sum(), 10.0)
+    assert np.isclose(first["expected_points"].sum(), POINTS.sum())
+    assert np.allclose(first["position_distribution"].sum(axis=0), 1.0)
+
+
+def test_draws_follow_each_drivers_distribution():
+    # Driver 0 always draws P1, driver 1 always P2 ... no ties: the order is fixed
+    classes = np.array([1, 2, 3, 4])
+    result = simulate_race(np.eye(4), classes, 1000, seed=0)
+    assert np.array_equal(result["expected_position"], [1, 2, 3, 4])
+    assert np.array_equal(result["expected_points"], POINTS[:4])
+
+    # Two drivers with identical distributions split the wins evenly
+    result = simulate_race(np.array([[0.5, 0.5], [0.5, 0.5]]), [1, 2], 100_000, seed=0)
+    assert abs(result["win_probability"][0] - 0.5) < 0.01
+
+    # A driver who usually draws P1 wins more than one who usually draws P3
+    result = simulate_race(np.array([[0.8, 0.1, 0.1], [0.1, 0.1, 0.8], [0.3, 0.4, 0.3]]), [1, 2, 3], 50_000, seed=0)
+    assert result["win_probability"][0] > result["win_probability"][2] > result["win_probability"][1]
+
+
+def test_simulate_endpoint():
+    body = {"season": 2024, "race_name": "Monaco Grand Prix", "entries": ENTRIES, "simulations": 50_000,
+            "seed": 7, "include_distribution": True}
+    response = client.post("/predict/simulate", json=body)
+    assert response.status_code == 200
+    result = response.json()
+    assert result["simulations"] == 50_000 and len(result["drivers"]) == 20
+    assert abs(sum(d["win_probability"] for d in result["drivers"]) - 1.0) < 1e-9
+    assert abs(sum(d["expected_points"] for d in result["drivers"]) - 101.0) < 1e-2
+    points = [d["expected_points"] for d in result["drivers"]]
+    assert points == sorted(points, reverse=True)
+    assert all(len(d["position_distribution"]) == 20 for d in result["drivers"])
+    assert client.post("/predict/simulate", json=body).json() == result  # same seed, same answer
+    print(f"  ✅ Favourite: {result['drivers'][0]['team_name']} "
+          f"({result['drivers'][0]['win_probability']:.1%} wins)")
+
+
+def test_simulate_rejects_bad_sizes():
+    assert client.post("/predict/simulate", json={"season": 2024, "entries": []}).status_code == 400
+    too_many = {"season": 2024, "entries": ENTRIES, "simulations": main.MAX_SIMULATIONS + 1}
+    assert client.post("/predict/simulate", json=too_many).status_code == 400
+    negative_seed = {"season": 2024, "entries": ENTRIES, "simulations": 100, "seed": -1}
+    assert client.post("/predict/simulate", json=negative_seed).status_code == 400
+    out_of_range = {"season": 2024, "entries": ENTRIES[:1] + [{"team_encoded": 0, "driver_experience": 10 ** 40}]}
+    response = client.post("/predict/simulate", json=out_of_range)
+    assert response.status_code == 400 and main.FEATURE_RANGE_ERROR in response.json()["detail"]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing race simulator")
+    print("=" * 40)
+    test_every_sample_is_a_permutation()
+    test_seeded_and_consistent()
+    test_draws_follow_each_drivers_distribution()
+    test_simulate_endpoint()
+    test_simulate_rejects_bad_sizes()
+    print("\n✅ All tests completed!")
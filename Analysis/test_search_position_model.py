@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+"""
+Test that the hyperparameter search streams results and resumes without redoing configs
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_position_model import best_result, config_key, expand_space, make_folds, run_search
+
+SPACE = {"n_estimators": [5, 10], "max_depth": [None, 3], "min_samples_leaf": [1, 2]}
+
+
+def _data():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.integers(2021, 2026, 60), rng.integers(0, 10, 60), rng.integers(1, 15, 60)]).astype(float)
+    y = (X[:, 1] * 2 + 1).astype(int)
+    return X, y
+
+
+def test_results_stream_and_resume():
+    X, y = _data()
+    configs = expand_space(SPACE)
+    folds = make_folds(len(y), 3, seed=42)
+    with tempfile.TemporaryDirectory() as tmp:
+        results_path = os.path.join(tmp, "results.jsonl")
+
+        # "Interrupted" run: only half the grid got done
+        first = run_search(X, y, configs[:4], folds, results_path, jobs=2, log=lambda *_: None)
+        assert len(first) == 4
+        with open(results_path, "a") as f:
+            f.write('{"search_id": "torn')  # killed mid-write
+
+        evaluated = []
+        results = run_search(X, y, configs, folds, results_path, jobs=2,
+                             log=lambda line: evaluated.append(line) if line.startswith("  [") else None)
+        assert len(evaluated) == 4, "only the remaining configs run"
+        assert {r["key"] for r in results} == {config_key(p) for p in configs}
+
+        lines = [json.loads(l) for l in open(results_path) if l.strip().endswith("}")]
+        assert len(lines) == 8 and all(r["wall_seconds"] > 0 and len(r["fold_accuracy"]) == 3 for r in lines)
+
+        # A narrower --space over the same results only returns (and counts) its own configs
+        progress = []
+        narrow = run_search(X, y, configs[2:6] + [{"n_estimators": 3}], folds, results_path, jobs=1,
+                            log=lambda line: progress.append(line) if line.startswith("  [") else None)
+        assert {r["key"] for r in narrow} == {config_key(p) for p in configs[2:6] + [{"n_estimators": 3}]}
+        assert progress[0].startswith("  [5/5]")
+
+        # Different folds are a different search: nothing is reused
+        other = run_search(X, y, configs[:1], make_folds(len(y), 3, seed=7), results_path, jobs=1, seed=7,
+                           log=lambda *_: None)
+        assert len(other) == 1
+
+    best = best_result(results)
+    assert best["mean_accuracy"] == max(r["mean_accuracy"] for r in results)
+    print(f"  ✅ Resumed {len(evaluated)} of {len(configs)} configs, best {best['params']}")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing hyperparameter search")
+    print("=" * 40)
+    test_results_stream_and_resume()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""
+Test pre-serialized GET /historical/{season}: body, ETag/304, projection and paging
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def _iterrows_results(season):
+    """The per-request row building the endpoint used before pre-serialization"""
+    season_data = main.historical_data[main.historical_data['season'] == season]
+    return [{
+        "position": int(row.get('pos', 0)) if pd.notna(row.get('pos')) else None,
+        "driver": row.get('driver'),
+        "team": row.get('team', ''),
+        "points": float(row.get('pts', 0)) if pd.notna(row.get('pts')) else None,
+        "nationality": row.get('nationality', '')
+    } for _, row in season_data.iterrows()]
+
+
+def test_full_payload_matches_row_building():
+    for season in sorted(main.season_payloads):
+        response = client.get(f"/historical/{season}")
+        assert response.status_code == 200
+        assert response.json() == {"season": season, "results": _iterrows_results(season)}
+        print(f"  ✅ {season}: {len(response.json()['results'])} rows, ETag {response.headers['etag']}")
+    assert client.get("/historical/1900").status_code == 404
+
+
+def test_etag_revalidation():
+    first = client.get("/historical/2023")
+    etag = first.headers["etag"]
+    assert client.get("/historical/2023", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/historical/2023", headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+    assert client.get("/historical/2023", headers={"If-None-Match": '"stale"'}).status_code == 200
+    # A projection is a different representation with its own ETag
+    projected = client.get("/historical/2023", params={"fields": "driver"}, headers={"If-None-Match": etag})
+    assert projected.status_code == 200 and projected.headers["etag"] != etag
+
+
+def test_projection_and_paging():
+    full = client.get("/historical/2024").json()["results"]
+    page = client.get("/historical/2024", params={"fields": "driver,points", "limit": 5, "offset": 3}).json()
+    assert page["results"] == [{"driver": r["driver"], "points": r["points"]} for r in full[3:8]]
+    assert client.get("/historical/2024", params={"fields": "driver,salary"}).status_code == 400
+
+
+if __name__ == "__main__":
+    print("🧪 Testing season payloads")
+    print("=" * 40)
+    test_full_payload_matches_row_building()
+    test_etag_revalidation()
+    test_projection_and_paging()
+    print("\n✅ All tests completed!")
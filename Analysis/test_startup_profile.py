@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Test the cold-start profiler, the startup budget guard and F1_LOG_LEVEL
+"""
+
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from startup_profile import StartupBudgetExceeded, StartupProfiler
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_phases_and_budget():
+    clock = FakeClock()
+    profiler = StartupProfiler(clock=clock)
+    with profiler.phase("imports"):
+        clock.now += 0.4
+    with profiler.phase("model"):
+        clock.now += 1.2
+    clock.now += 0.1
+
+    summary = profiler.ready(budget_ms=2000)
+    assert summary["ready_ms"] == 1700.0
+    assert [(p["name"], p["ms"]) for p in summary["phases"]] == [("imports", 400.0), ("model", 1200.0)]
+    assert "Ready in 1700 ms" in profiler.report()[0]
+
+    try:
+        profiler.ready(budget_ms=1500)
+        assert False, "expected StartupBudgetExceeded"
+    except StartupBudgetExceeded as e:
+        assert "slowest phase: model" in str(e)
+
+
+def _import_main(**env):
+    return subprocess.run([sys.executable, "-W", "ignore", "-c", "import main"], cwd=ANALYSIS_DIR,
+                          capture_output=True, text=True, env={**os.environ, **env}, timeout=120)
+
+
+def test_main_startup_quiet_and_guarded():
+    quiet = _import_main(F1_LOG_LEVEL="WARNING", F1_STARTUP_BUDGET_MS="")
+    assert quiet.returncode == 0, quiet.stderr
+    assert "✅" not in quiet.stdout and "Ready in" not in quiet.stdout
+
+    over = _import_main(F1_LOG_LEVEL="WARNING", F1_STARTUP_BUDGET_MS="1")
+    assert over.returncode != 0
+    assert "StartupBudgetExceeded" in over.stderr
+    assert "Ready in" in over.stdout and "model" in over.stdout  # report shown even when quiet
+
+
+def test_startup_metrics_endpoint():
+    from fastapi.testclient import TestClient
+
+    import main
+
+    summary = TestClient(main.app).get("/metrics/startup").json()
+    names = [p["name"] for p in summary["phases"]]
+    assert names[:3] == ["web imports", "data imports", "model"]
+    assert summary["ready_ms"] >= sum(p["ms"] for p in summary["phases"])
+
+
+if __name__ == "__main__":
+    print("🧪 Testing startup profile")
+    print("=" * 40)
+    test_phases_and_budget()
+    test_main_startup_quiet_and_guarded()
+    test_startup_metrics_endpoint()
+    print("\n✅ All tests completed!")
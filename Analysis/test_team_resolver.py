@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""
+Test the shared team resolver against the scraped team strings
+"""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from team_resolver import UNKNOWN_TEAM_CODE, encode_teams, resolve_team, team_name
+
+EXPECTED = {
+    "Red Bull Racing Honda RBPT": "Red Bull Racing",
+    "Red Bull Racing RBPT": "Red Bull Racing",
+    "AlphaTauri Honda RBPT": "RB",
+    "RB Honda RBPT": "RB",
+    "Racing Bulls": "RB",
+    "Aston Martin Aramco Mercedes": "Aston Martin",
+    "McLaren Mercedes": "McLaren",
+    "Williams Mercedes": "Williams",
+    "Alfa Romeo Racing Ferrari": "Kick Sauber",
+    "Kick Sauber Ferrari": "Kick Sauber",
+    "Haas Ferrari": "Haas",
+    "Alpine Renault": "Alpine",
+    "Oracle Red Bull Racing": "Red Bull Racing",
+    "Mercedes": "Mercedes",
+}
+
+
+def test_engine_supplier_never_decides_team():
+    for scraped, expected in EXPECTED.items():
+        assert team_name(resolve_team(scraped)) == expected, scraped
+        print(f"  ✅ {scraped} -> {expected}")
+    assert resolve_team("Brabham BT52") == UNKNOWN_TEAM_CODE
+    assert resolve_team(None) == UNKNOWN_TEAM_CODE
+
+
+def test_vectorized_encoding_matches_scalar():
+    teams = pd.Series(list(EXPECTED) * 3 + [None, "Unknown Racing"])
+    encoded = encode_teams(teams)
+    assert encoded.tolist() == [resolve_team(t) for t in teams]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing team resolver")
+    print("=" * 40)
+    test_engine_supplier_never_decides_team()
+    test_vectorized_encoding_matches_scalar()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Test that warm-start updates add trees for new rows without changing the forest's classes
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from f1_data import POSITION_FEATURES
+from model_loader import ModelArtifactError
+from update_position_model import full_rebuild, incremental_update
+
+
+def _frame(seasons, n_per_season=20):
+    rows = []
+    for season in seasons:
+        for i in range(n_per_season):
+            rows.append({'season': season, 'team_encoded': i % 10, 'driver_experience': 1 + i % 7,
+                         'position': i + 1, 'row_key': f"{season}-{i}"})
+    return pd.DataFrame(rows)
+
+
+def _base(frame):
+    model = RandomForestClassifier(n_estimators=10, random_state=0)
+    model.fit(frame[POSITION_FEATURES].to_numpy(dtype=float), frame['position'].to_numpy())
+    return model, {'model_sha256': 'base', 'classes': list(map(int, model.classes_)),
+                   'trained_rows': sorted(frame['row_key'])}
+
+
+def test_new_rows_add_trees_with_same_classes():
+    history = _frame([2021, 2022, 2023])
+    model, info = _base(history)
+    # One new race's worth of results: only some positions present
+    frame = pd.concat([history, _frame([2024], n_per_season=8)], ignore_index=True)
+
+    updated, new_info = incremental_update(model, info, frame, new_trees=5)
+    assert len(updated.estimators_) == 15 and updated.n_estimators == 15
+    assert np.array_equal(updated.classes_, model.classes_)
+    assert len(model.estimators_) == 10, "the serving model is not modified"
+    proba = updated.predict_proba(frame[POSITION_FEATURES].to_numpy(dtype=float))
+    assert proba.shape[1] == 20 and np.allclose(proba.sum(axis=1), 1.0)
+
+    stats = new_info['incremental']
+    assert stats['new_rows'] == 8 and stats['rehearsal_rows'] >= 16
+    assert set(new_info['trained_rows']) == set(frame['row_key'])
+    assert incremental_update(updated, new_info, frame) is None, "nothing new the second time"
+    print(f"  ✅ +5 trees for 8 new rows, rehearsal {stats['rehearsal_rows']} rows")
+
+
+def test_oldest_trees_age_out():
+    history = _frame([2021, 2022])
+    model, info = _base(history)
+    frame = pd.concat([history, _frame([2023], n_per_season=5)], ignore_index=True)
+    updated, new_info = incremental_update(model, info, frame, new_trees=6, max_trees=12)
+    # 10 old + 6 new, the 4 oldest dropped
+    assert len(updated.estimators_) == 12 and new_info['incremental']['dropped_trees'] == 4
+    assert updated.n_jobs == 1
+    for kept, original in zip(updated.estimators_[:6], model.estimators_[4:]):
+        assert np.array_equal(kept.tree_.threshold, original.tree_.threshold)
+
+
+def test_unknown_position_needs_rebuild():
+    history = _frame([2021, 2022], n_per_season=10)
+    model, info = _base(history)
+    frame = pd.concat([history, _frame([2023], n_per_season=12)], ignore_index=True)  # P11, P12 are new
+    try:
+        incremental_update(model, info, frame)
+        assert False, "new class accepted"
+    except ModelArtifactError:
+        pass
+
+    rebuilt, rebuilt_info = full_rebuild({'params': {'n_estimators': 7}}, frame)
+    assert len(rebuilt.estimators_) == 7 and list(rebuilt.classes_) == list(range(1, 13))
+    assert rebuilt.n_jobs == 1, "published models must not fan out per request"
+    assert len(rebuilt_info['trained_rows']) == len(frame)
+
+
+if __name__ == "__main__":
+    print("🧪 Testing incremental model updates")
+    print("=" * 40)
+    test_new_rows_add_trees_with_same_classes()
+    test_oldest_trees_age_out()
+    test_unknown_position_needs_rebuild()
+    print("\n✅ All tests completed!")
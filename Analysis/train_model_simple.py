@@ -6,42 +6,37 @@ from sklearn.metrics import accuracy_score
 import joblib
 import os
 
+from f1_data import load_dataset
+from model_loader import save_model
+from team_resolver import TEAM_MAPPING, encode_teams
+
 print("🏎️ F1 Position Predictor - Simple Training")
 print("="*50)
 
-# Load the data
-csv_path = "driver_stats.csv"
-print(f"🔍 Loading data from: {csv_path}")
+# Load the cleaned standings (shared loader, cached by source hash)
+print(f"🔍 Loading cleaned standings")
 
 try:
-    df = pd.read_csv(csv_path)
+    df = load_dataset(['pos', 'driver', 'team', 'pts', 'season'])
     print(f"✅ Data loaded: {df.shape[0]} records, {df.shape[1]} columns")
 except Exception as e:
     print(f"❌ Error loading data: {e}")
     exit(1)
-
-# Clean column names
-df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
 print(f"📋 Columns: {df.columns.tolist()}")
 
 # Clean and prepare data
 print("\n🧹 Cleaning data...")
 
-# Convert position to numeric (handle DNF, DSQ, etc.)
-df['pos_numeric'] = pd.to_numeric(df['pos'], errors='coerce')
+# Positions are numeric already (NaN for DNF, DSQ, etc.)
+df['pos_numeric'] = df['pos']
 
 # Filter out non-finishing positions (DNF, DSQ, etc.)
 df_clean = df[df['pos_numeric'].notna() & (df['pos_numeric'] > 0) & (df['pos_numeric'] <= 20)].copy()
 print(f"📊 Clean data: {len(df_clean)} records with valid positions")
 
-# Create team mapping
-team_mapping = {}
-unique_teams = df_clean['team'].unique()
-for i, team in enumerate(unique_teams):
-    team_mapping[team] = i
-
-# Encode teams
-df_clean['team_encoded'] = df_clean['team'].map(team_mapping)
+# Encode teams with the shared resolver (same codes the API serves)
+team_mapping = TEAM_MAPPING
+df_clean['team_encoded'] = encode_teams(df_clean['team'])
 
 # Create driver experience feature (simple version - just use a default)
 df_clean['driver_experience'] = 3  # Default experience
@@ -74,18 +69,15 @@ y_pred = model.predict(X_test)
 accuracy = accuracy_score(y_test, y_pred)
 print(f"📊 Test Accuracy: {accuracy:.3f}")
 
-# Save the model
+# Save the model together with its metadata (features, classes, content hash)
 model_path = "f1_position_predictor.joblib"
-joblib.dump(model, model_path)
-print(f"💾 Model saved as '{model_path}'")
-
-# Save model info
-model_info = {
+model_info = save_model(model, {
     'features': features,
     'team_mapping': team_mapping,
-    'model_type': 'position_classification'
-}
-joblib.dump(model_info, "f1_model_info.joblib")
+    'model_type': 'position_classification',
+    'accuracy': accuracy
+}, model_path, "f1_model_info.joblib")
+print(f"💾 Model saved as '{model_path}' (sha256 {model_info['model_sha256'][:12]})")
 print(f"💾 Model info saved as 'f1_model_info.joblib'")
 
 # Test prediction
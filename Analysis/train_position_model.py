@@ -8,30 +8,21 @@ from sklearn.metrics import accuracy_score, classification_report, confusion_mat
 import joblib
 import os
 
+from f1_data import load_dataset, row_keys
+from model_loader import save_model
+from team_resolver import TEAM_MAPPING, encode_teams, team_name
+
 print("🏎️ F1 Position Predictor - Training Model")
 print("="*50)
 
-# Get the directory of this script
-script_dir = os.path.dirname(os.path.abspath(__file__))
-csv_path = os.path.join(script_dir, "driver_stats.csv")
-
-# Check if file exists, if not try the Scraper folder
-if not os.path.exists(csv_path):
-    csv_path = os.path.join(os.path.dirname(script_dir), "Scraper", "driver_stats.csv")
-
-print(f"🔍 Looking for CSV file at: {csv_path}")
-if os.path.exists(csv_path):
-    print("✅ CSV file found!")
-else:
-    print("❌ CSV file not found!")
+# Load the cleaned standings (normalized columns; pos is NaN for DNF, DSQ, etc.)
+try:
+    df = load_dataset(['pos', 'driver', 'driver_clean', 'team', 'pts', 'season', 'classified'])
+    print("✅ Standings loaded!")
+except FileNotFoundError as e:
+    print(f"❌ {e}")
     exit(1)
 
-# Load the data
-df = pd.read_csv(csv_path)
-
-# Clean column names
-df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
-
 print(f"📊 Data loaded: {df.shape[0]} records, {df.shape[1]} columns")
 print(f"📋 Columns: {df.columns.tolist()}")
 
@@ -42,66 +33,24 @@ print(f"🏁 Position range: {df['pos'].min()} to {df['pos'].max()}")
 # Clean and prepare data
 print("\n🧹 Cleaning data...")
 
-# Clean driver names (remove driver codes like "HAM", "VER")
-df['driver_clean'] = df['driver'].str.extract(r'^(.*?)\s?[A-Z]{2,3}$')[0]
-df['driver_clean'] = df['driver_clean'].fillna(df['driver'])
-
-# Convert position to numeric (handle DNF, DSQ, etc.)
-df['pos_numeric'] = pd.to_numeric(df['pos'], errors='coerce')
+# Driver names come with their codes ("HAM", "VER") stripped in driver_clean
+df['pos_numeric'] = df['pos']
 
-# Remove rows where position couldn't be converted (DNF, DSQ, etc.)
-df_clean = df.dropna(subset=['pos_numeric']).copy()
+# Remove non-finishing results (DNF, DSQ, etc.)
+df_clean = df[df['classified']].copy()
 print(f"🔧 After cleaning: {len(df_clean)} records (removed {len(df) - len(df_clean)} non-finishing results)")
 
 # Convert position to integer
 df_clean['position'] = df_clean['pos_numeric'].astype(int)
 
-# Create team encoding manually (more reliable than automatic encoding)
-team_mapping = {
-    "Red Bull Racing": 0, "Mercedes": 1, "Ferrari": 2, "McLaren": 3,
-    "Aston Martin": 4, "Alpine": 5, "Haas": 6, "AlphaTauri": 7,
-    "Williams": 8, "Alfa Romeo": 9, "RB": 7, "Kick Sauber": 9
-}
-
-def encode_team(team_name):
-    """Encode team name to number"""
-    team_lower = str(team_name).lower()
-    for team, code in team_mapping.items():
-        if team.lower() in team_lower or any(word in team_lower for word in team.lower().split()):
-            return code
-    
-    # Handle special cases
-    if 'red bull' in team_lower:
-        return 0  # Red Bull Racing
-    elif 'mercedes' in team_lower:
-        return 1
-    elif 'ferrari' in team_lower:
-        return 2
-    elif 'mclaren' in team_lower:
-        return 3
-    elif 'aston' in team_lower:
-        return 4
-    elif 'alpine' in team_lower or 'renault' in team_lower:
-        return 5
-    elif 'haas' in team_lower:
-        return 6
-    elif 'alphatauri' in team_lower or 'rb ' in team_lower:
-        return 7
-    elif 'williams' in team_lower:
-        return 8
-    elif 'alfa' in team_lower or 'sauber' in team_lower:
-        return 9
-    else:
-        return 10  # Unknown team
-
-df_clean['team_encoded'] = df_clean['team'].apply(encode_team)
+# Encode teams with the shared resolver (same codes the API serves)
+team_mapping = TEAM_MAPPING
+df_clean['team_encoded'] = encode_teams(df_clean['team'])
 
 print(f"\n🏎️ Team encoding distribution:")
 team_counts = df_clean['team_encoded'].value_counts().sort_index()
 for code, count in team_counts.items():
-    team_name = [k for k, v in team_mapping.items() if v == code]
-    team_name = team_name[0] if team_name else f"Team {code}"
-    print(f"  {code}: {team_name} - {count} records")
+    print(f"  {code}: {team_name(code)} - {count} records")
 
 # Feature engineering
 print("\n⚙️ Engineering features...")
@@ -189,18 +138,17 @@ report = classification_report(
 )
 print(report)
 
-# Save the model
+# Save the model together with its metadata (features, classes, content hash)
 model_path = "f1_position_predictor.joblib"
-joblib.dump(model, model_path)
-print(f"\n💾 Model saved as '{model_path}'")
-
-# Save feature information
-feature_info = {
+feature_info = save_model(model, {
     'features': features,
     'team_mapping': team_mapping,
-    'model_type': 'position_classification'
-}
-joblib.dump(feature_info, "f1_model_info.joblib")
+    'model_type': 'position_classification',
+    'accuracy': test_accuracy,
+    # Rows the model has seen, so update_position_model.py can add only new ones
+    'trained_rows': sorted(row_keys(df_clean.loc[X_train.index]))
+}, model_path, "f1_model_info.joblib")
+print(f"\n💾 Model saved as '{model_path}' (sha256 {feature_info['model_sha256'][:12]})")
 print(f"💾 Model info saved as 'f1_model_info.joblib'")
 
 # Test predictions with some examples
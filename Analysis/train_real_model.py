@@ -6,31 +6,30 @@ from sklearn.metrics import accuracy_score, classification_report
 import joblib
 import os
 
+from f1_data import load_dataset
+from model_loader import save_model
+from team_resolver import TEAM_MAPPING, encode_teams
+
 print("🏎️ F1 Position Predictor - Training with Real Data")
 print("=" * 60)
 
-# Load the data
-csv_path = "driver_stats.csv"
-print(f"🔍 Loading data from: {csv_path}")
+# Load the cleaned standings (shared loader, cached by source hash)
+print(f"🔍 Loading cleaned standings")
 
 try:
-    df = pd.read_csv(csv_path)
+    df = load_dataset(['pos', 'driver', 'team', 'pts', 'season'])
     print(f"✅ Data loaded: {df.shape[0]} records, {df.shape[1]} columns")
     print(f"📋 Columns: {df.columns.tolist()}")
 except Exception as e:
     print(f"❌ Error loading data: {e}")
     exit(1)
 
-# Clean column names
-df.columns = df.columns.str.strip().str.lower().str.replace('.', '', regex=False)
-print(f"📋 Cleaned columns: {df.columns.tolist()}")
-
 # Check what position data looks like
 print(f"\n📊 Position data sample:")
 print(df[['driver', 'team', 'season', 'pos']].head(10))
 
-# Convert position to numeric and clean
-df['pos_numeric'] = pd.to_numeric(df['pos'], errors='coerce')
+# Positions are stored numeric already (NaN for DNF, DSQ, etc.)
+df['pos_numeric'] = df['pos']
 
 # Filter valid positions (1-20, exclude DNF, DSQ, etc.)
 df_clean = df[df['pos_numeric'].notna() & (df['pos_numeric'] >= 1) & (df['pos_numeric'] <= 20)].copy()
@@ -79,13 +78,9 @@ else:
     # Use real data
     print(f"✅ Using real data for training")
     
-    # Create team mapping
-    unique_teams = df_clean['team'].unique()
-    team_mapping = {team: i for i, team in enumerate(unique_teams)}
-    print(f"🏁 Team mapping: {team_mapping}")
-    
-    # Encode teams
-    df_clean['team_encoded'] = df_clean['team'].map(team_mapping)
+    # Encode teams with the shared resolver (same codes the API serves)
+    df_clean['team_encoded'] = encode_teams(df_clean['team'])
+    print(f"🏁 Team codes: {df_clean['team_encoded'].value_counts().sort_index().to_dict()}")
     
     # Create driver experience (simplified - count seasons per driver)
     driver_seasons = df_clean.groupby('driver')['season'].nunique().to_dict()
@@ -175,24 +170,15 @@ for case in test_cases:
     
     print(f"   Input: season={case[0]}, team={case[1]}, exp={case[2]} → P{pred} (conf: {conf:.3f})")
 
-# Save the model
+# Save the model together with its metadata (features, classes, content hash)
 model_path = "f1_position_predictor.joblib"
-joblib.dump(model, model_path)
-print(f"\n💾 Model saved as '{model_path}'")
-
-# Save model info
-model_info = {
+model_info = save_model(model, {
     'features': features,
-    'team_mapping': {
-        "Red Bull Racing": 0, "Mercedes": 1, "Ferrari": 2, "McLaren": 3,
-        "Aston Martin": 4, "Alpine": 5, "Haas": 6, "RB": 7,
-        "Williams": 8, "Kick Sauber": 9
-    },
+    'team_mapping': TEAM_MAPPING,
     'model_type': 'position_classification',
-    'classes': model.classes_.tolist(),
     'accuracy': test_accuracy
-}
-joblib.dump(model_info, "f1_model_info.joblib")
+}, model_path, "f1_model_info.joblib")
+print(f"\n💾 Model saved as '{model_path}' (sha256 {model_info['model_sha256'][:12]})")
 print(f"💾 Model info saved as 'f1_model_info.joblib'")
 
 print(f"\n✅ Position prediction model ready!")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+"""
+Incremental retraining of the position classifier when new results land.
+
+Instead of refitting the whole forest on all history, the update mode loads
+the serving model and grows it with `warm_start`: only the new trees are fit,
+on the rows the model has not seen yet (found through the `trained_rows` keys
+in its model info) plus a small rehearsal sample of old rows. The rehearsal
+sample always contains every class the forest knows, because sklearn rebuilds
+classes_ from each fit's labels and new trees must vote over the same classes
+as the old ones. With --max-trees the oldest trees are dropped so the ensemble
+stays bounded. The result is published as a new model registry version.
+
+--rebuild is the periodic compaction: a fresh forest on all rows with the
+serving model's hyperparameters, published the same way.
+
+    python update_position_model.py                    # add 25 trees for new rows
+    python update_position_model.py --trees 50 --max-trees 300
+    python update_position_model.py --rebuild
+"""
+
+import argparse
+import copy
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+
+from f1_data import POSITION_FEATURES, position_training_frame
+from model_loader import ModelArtifactError, find_model_artifact, load_model
+from model_registry import ModelRegistry
+
+DEFAULT_NEW_TREES = 25
+# Old rows refit alongside the new ones, per new row
+DEFAULT_REHEARSAL_RATIO = 2.0
+
+
+def load_current(registry: ModelRegistry) -> Tuple[RandomForestClassifier, dict, str]:
+    """The registry's CURRENT version, else the standalone artifact"""
+    if registry.current_version() is not None:
+        serving = registry.load()
+        return serving.model, serving.model_info, serving.version
+    model_path, info_path = find_model_artifact()
+    model, info = load_model(model_path, info_path)
+    return model, info, model_path
+
+
+def rehearsal_sample(old: pd.DataFrame, classes: np.ndarray, size: int, seed: int) -> pd.DataFrame:
+    """`size` random old rows, topped up so every class appears at least once"""
+    rng = np.random.default_rng(seed)
+    picked = set(rng.choice(len(old), size=min(size, len(old)), replace=False).tolist()) if len(old) else set()
+    positions = old['position'].to_numpy()
+    present = set(positions[sorted(picked)].tolist())
+    for cls in classes:
+        if cls in present:
+            continue
+        candidates = np.flatnonzero(positions == cls)
+        if len(candidates) == 0:
+            raise ModelArtifactError(f"No rows left for class {cls}; run a full --rebuild")
+        picked.add(int(rng.choice(candidates)))
+        present.add(cls)
+    return old.iloc[sorted(picked)]
+
+
+def incremental_update(model: RandomForestClassifier, info: dict, frame: pd.DataFrame,
+                       new_trees: int = DEFAULT_NEW_TREES, max_trees: Optional[int] = None,
+                       rehearsal_ratio: float = DEFAULT_REHEARSAL_RATIO,
+                       seed: int = 42) -> Optional[Tuple[RandomForestClassifier, dict]]:
+    """Grow a copy of the model on rows it has not seen; None when nothing is new"""
+    if 'trained_rows' not in info:
+        raise ModelArtifactError("Model info has no trained_rows manifest; run a full --rebuild first")
+    trained = set(info['trained_rows'])
+    is_new = ~frame['row_key'].isin(trained)
+    new, old = frame[is_new], frame[~is_new]
+    if new.empty:
+        return None
+
+    classes = np.asarray(model.classes_)
+    unseen = sorted(set(new['position'].unique()) - set(classes.tolist()))
+    if unseen:
+        raise ModelArtifactError(f"New rows contain positions {unseen} the forest has no output for; run a full --rebuild")
+
+    rehearsal = rehearsal_sample(old if not old.empty else new, classes, int(len(new) * rehearsal_ratio), seed)
+    fit_rows = pd.concat([new, rehearsal])
+    X_new = new[POSITION_FEATURES].to_numpy(dtype=float)
+    accuracy_before = float((model.predict(X_new) == new['position'].to_numpy()).mean())
+
+    updated = copy.deepcopy(model)
+    previous_trees = len(updated.estimators_)
+    updated.set_params(warm_start=True, n_estimators=previous_trees + new_trees, random_state=seed + previous_trees)
+    updated.fit(fit_rows[POSITION_FEATURES].to_numpy(dtype=float), fit_rows['position'].to_numpy())
+    if not np.array_equal(updated.classes_, classes):
+        raise ModelArtifactError("Incremental fit changed the forest's classes; run a full --rebuild")
+
+    dropped = 0
+    if max_trees and len(updated.estimators_) > max_trees:
+        dropped = len(updated.estimators_) - max_trees
+        updated.estimators_ = updated.estimators_[dropped:]
+    # Published models serve single-threaded (see full_rebuild)
+    updated.set_params(warm_start=False, n_estimators=len(updated.estimators_), n_jobs=1)
+
+    new_info = {k: v for k, v in info.items() if k not in ('model_sha256', 'classes')}
+    new_info['trained_rows'] = sorted(trained | set(new['row_key']))
+    new_info['incremental'] = {
+        'base_model_sha256': info.get('model_sha256'),
+        'new_rows': int(len(new)),
+        'rehearsal_rows': int(len(rehearsal)),
+        'added_trees': new_trees,
+        'dropped_trees': dropped,
+        'n_estimators': len(updated.estimators_),
+        'new_rows_accuracy_before': accuracy_before,
+        'new_rows_accuracy_after': float((updated.predict(X_new) == new['position'].to_numpy()).mean()),
+    }
+    return updated, new_info
+
+
+def full_rebuild(info: dict, frame: pd.DataFrame, seed: int = 42) -> Tuple[RandomForestClassifier, dict]:
+    """Fresh forest on every row with the serving model's hyperparameters"""
+    params = info.get('params') or {
+        'n_estimators': 100, 'max_depth': 10, 'min_samples_split': 5, 'min_samples_leaf': 2,
+    }
+    model = RandomForestClassifier(random_state=seed, n_jobs=-1, **params)
+    model.fit(frame[POSITION_FEATURES].to_numpy(dtype=float), frame['position'].to_numpy())
+    # Fit on every core, but publish with n_jobs=1: the API calls predict_proba per request
+    model.set_params(n_jobs=1)
+    new_info = {k: v for k, v in info.items() if k not in ('model_sha256', 'classes', 'incremental')}
+    new_info.update(params=params, trained_rows=sorted(frame['row_key']))
+    return model, new_info
+
+
+def main(argv=None) -> Optional[str]:
+    parser = argparse.ArgumentParser(description="Incrementally update the position model with new rows")
+    parser.add_argument("--trees", type=int, default=DEFAULT_NEW_TREES, help="Trees to add for the new rows")
+    parser.add_argument("--max-trees", type=int, default=None, help="Drop the oldest trees beyond this many")
+    parser.add_argument("--rehearsal-ratio", type=float, default=DEFAULT_REHEARSAL_RATIO)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rebuild", action="store_true", help="Full retrain on all rows (compaction)")
+    parser.add_argument("--no-activate", action="store_true", help="Publish without moving CURRENT")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    registry = ModelRegistry()
+    model, info, source = load_current(registry)
+    frame = position_training_frame()
+    print(f"📦 Current model: {source} ({len(model.estimators_)} trees); {len(frame)} classified rows")
+
+    if args.rebuild:
+        updated, new_info = full_rebuild(info, frame, args.seed)
+        print(f"🔁 Rebuilt on all {len(frame)} rows ({len(updated.estimators_)} trees)")
+    else:
+        result = incremental_update(model, info, frame, args.trees, args.max_trees, args.rehearsal_ratio, args.seed)
+        if result is None:
+            print("✅ No new rows since the last training; nothing to publish")
+            return None
+        updated, new_info = result
+        stats = new_info['incremental']
+        print(f"➕ {stats['new_rows']} new rows (+{stats['rehearsal_rows']} rehearsal): "
+              f"+{stats['added_trees']} trees, -{stats['dropped_trees']} oldest, now {stats['n_estimators']}")
+        print(f"🎯 Accuracy on the new rows: {stats['new_rows_accuracy_before']:.3f} -> "
+              f"{stats['new_rows_accuracy_after']:.3f}")
+
+    version = registry.publish_model(updated, new_info, make_current=not args.no_activate)
+    print(f"🚀 Published model version {version} in {time.perf_counter() - started:.2f}s"
+          f"{'' if args.no_activate else ' (now current)'}")
+    return version
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except ModelArtifactError as e:
+        print(f"❌ {e}")
+        exit(1)
@@ -340,7 +340,7 @@ const races = [
 
 const seasons = [2021, 2022, 2023, 2024, 2025];
 
-// Sample historical results for demonstration (in production, this would come from the backend)
+// Fallback sample results, used only when the backend has no per-race results ingested (POST /actual-result)
 const sampleHistoricalResults = {
   "2024_Max Verstappen_Bahrain Grand Prix": { actual_position: 1 },
   "2024_Lewis Hamilton_British Grand Prix": { actual_position: 3 },
@@ -1,66 +1,438 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
+#!/usr/bin/env python3
+
+"""
+Scrape driver standings (and optionally every race result) from formula1.com.
+
+The results archive is server-rendered, so the default engine is a bounded
+pool of pooled HTTP sessions (one keep-alive requests.Session per worker
+thread); --browser swaps in a pool of headless Chrome drivers for when the
+site needs JavaScript. Either way a page only counts once its results table
+is present: the browser waits for it explicitly (WebDriverWait), the HTTP
+engine re-fetches with backoff when it is missing, and tables are read with a
+direct lxml pass instead of pd.read_html on a re-serialized table.
+
+Seasons are scraped concurrently; with --races each season's race list is
+fetched and its race-result pages are queued on the same pool. Pages go
+through the page cache (page_cache.py): finished seasons are never downloaded
+twice, and --offline rebuilds everything from the cache without the network.
+
+Each page is written as soon as it is parsed, to its own atomically renamed
+NDJSON partition (partition_writer.py); a rerun skips the partitions of
+finished seasons already in the manifest, so an interrupted scrape resumes.
+driver_stats.csv / .ndjson, the typed driver_store and race_results.csv are
+then assembled from the partitions, and race partitions are ingested into
+race_results.sqlite (Analysis/race_results.py) for per-race lookups.
+
+    python f1_scraper.py                              # 2021..current season standings
+    python f1_scraper.py --seasons 1950-2025 --races  # full archive, per race
+    python f1_scraper.py --workers 16 --browser
+    python f1_scraper.py --offline --races            # re-parse cached pages only
+"""
+
+import argparse
+import os
+import queue
+import re
+import sys
+import threading
 import time
-from io import StringIO
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+import lxml.html
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Analysis"))
+from driver_store import write_store
+from race_results import DB_FILENAME, RaceResultsDB
+from page_cache import CachingFetcher, PageCache, default_cache_dir
+from partition_writer import RACES, STANDINGS, PartitionWriter
+
+BASE_URL = "https://www.formula1.com"
+FIRST_SEASON = 1950
+DEFAULT_FIRST_SEASON = 2021
+DEFAULT_WORKERS = 8
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) f1-position-predictor-scraper"
+
+# Most specific first; the archive has used all of these
+TABLE_XPATHS = [
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' resultsarchive-table ')]",
+    "//table[@data-testid='results-table']",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' results-table ')]//table",
+    "//table",
+]
+
+# /en/results/2024/races/1229/bahrain/race-result (older pages end in .html)
+RACE_LINK_PATTERN = re.compile(r"/results(?:\.html)?/(\d{4})/races/(\d+)/([^/]+)/race-result")
+
+T = TypeVar("T")
+
+
+def standings_url(season: int) -> str:
+    return f"{BASE_URL}/en/results/{season}/drivers"
+
+
+def races_url(season: int) -> str:
+    return f"{BASE_URL}/en/results/{season}/races"
+
+
+def race_result_url(season: int, race_id: str, slug: str) -> str:
+    return f"{BASE_URL}/en/results/{season}/races/{race_id}/{slug}/race-result"
+
+
+class TableNotFound(Exception):
+    """A page came back without a results table"""
+
+
+def _clean_text(text: str) -> str:
+    # Same whitespace rule as pd.read_html, so values match earlier scrapes
+    return re.sub(r"[\r\n]+|\s{2,}", " ", text).strip()
+
+
+def _find_table(root):
+    for xpath in TABLE_XPATHS:
+        for table in root.xpath(xpath):
+            if table.xpath(".//tr[td]"):
+                return table
+    return None
+
+
+def parse_results_table(html: str) -> pd.DataFrame:
+    """First results table on the page as a DataFrame, numeric columns converted"""
+    table = _find_table(lxml.html.fromstring(html))
+    if table is None:
+        raise TableNotFound("no results table in page")
+
+    header_cells = table.xpath("./thead//th") or table.xpath(".//tr[th][1]/th")
+    columns = [_clean_text(th.text_content()) for th in header_cells]
+    rows = [[_clean_text(td.text_content()) for td in tr.xpath("./td")] for tr in table.xpath(".//tr[td]")]
+    width = max(len(columns), max(len(r) for r in rows))
+    columns += [f"Unnamed: {i}" for i in range(len(columns), width)]
+    df = pd.DataFrame([r + [""] * (width - len(r)) for r in rows], columns=columns[:width])
+
+    for column in df.columns:
+        converted = pd.to_numeric(df[column].replace("", None), errors="coerce")
+        if converted.notna().sum() == (df[column] != "").sum():
+            df[column] = converted
+    return df
+
+
+def parse_race_links(html: str, season: int) -> List[Tuple[str, str, str]]:
+    """(race_id, slug, grand prix name) per race of the season, in calendar order"""
+    table = _find_table(lxml.html.fromstring(html))
+    if table is None:
+        raise TableNotFound("no race list in page")
+    races, seen = [], set()
+    for anchor in table.xpath(".//a[@href]"):
+        match = RACE_LINK_PATTERN.search(anchor.get("href"))
+        if not match or int(match.group(1)) != season or match.group(2) in seen:
+            continue
+        seen.add(match.group(2))
+        races.append((match.group(2), match.group(3), _clean_text(anchor.text_content())))
+    return races
+
+
+class HttpFetcher:
+    """Pooled keep-alive sessions, one per worker thread"""
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, timeout: float = 20.0, retries: int = 3):
+        self.workers = workers
+        self.timeout = timeout
+        self.retries = retries
+        self._local = threading.local()
+        self._sessions: List[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            retry = Retry(total=self.retries, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=("GET",))
+            session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retry))
+            session.headers["User-Agent"] = USER_AGENT
+            self._local.session = session
+            with self._lock:
+                self._sessions.append(session)
+        return session
 
-# Get the current year
-current_year = datetime.now().year
+    def fetch(self, url: str) -> str:
+        response = self._session().get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
 
-# Set up Selenium (headless)
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service, options=options)
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions.clear()
 
-# Prepare data storage
-all_data = []
 
-# Loop from 2021 to current year (e.g. 2025)
-for year in range(2021, current_year + 1):
-    print(f"🔍 Scraping season: {year}")
-    url = f"https://www.formula1.com/en/results.html/{year}/drivers.html"
-    driver.get(url)
-    time.sleep(3)
+class BrowserFetcher:
+    """Pool of headless Chrome drivers that wait for the results table to render"""
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
+    def __init__(self, workers: int = DEFAULT_WORKERS, timeout: float = 20.0):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions
+        from selenium.webdriver.support.ui import WebDriverWait
+        from webdriver_manager.chrome import ChromeDriverManager
 
+        self.workers = workers
+        self.timeout = timeout
+        self._webdriver = webdriver
+        self._service_path = ChromeDriverManager().install()
+        self._service = Service
+        self._wait = lambda driver: WebDriverWait(driver, timeout).until(
+            expected_conditions.presence_of_element_located((By.CSS_SELECTOR, "table tbody tr")))
+        # Drivers are started lazily, at most one per worker
+        self._pool: "queue.Queue" = queue.Queue()
+        for _ in range(workers):
+            self._pool.put(None)
+        self._drivers = []
+
+    def _new_driver(self):
+        options = self._webdriver.ChromeOptions()
+        options.add_argument("--headless")
+        driver = self._webdriver.Chrome(service=self._service(self._service_path), options=options)
+        self._drivers.append(driver)
+        return driver
+
+    def fetch(self, url: str) -> str:
+        driver = self._pool.get() or self._new_driver()
+        try:
+            driver.get(url)
+            self._wait(driver)
+            return driver.page_source
+        finally:
+            self._pool.put(driver)
+
+    def close(self) -> None:
+        for driver in self._drivers:
+            driver.quit()
+        self._drivers.clear()
+
+
+def fetch_table_page(fetch: Callable[[str], str], url: str, parse: Callable[[str], T],
+                     attempts: int = 3, backoff: float = 1.0) -> T:
+    """parse(html of url), re-fetching with backoff while the page has no results table"""
+    for attempt in range(1, attempts + 1):
+        try:
+            return parse(fetch(url))
+        except TableNotFound:
+            if attempt < attempts:
+                time.sleep(backoff * 2 ** (attempt - 1))
+    raise TableNotFound(f"no results table at {url} after {attempts} attempts")
+
+
+class SeasonResult:
+    """What was scraped for one season (the frames themselves only when no sink took them)"""
+
+    def __init__(self, season: int):
+        self.season = season
+        self.standings: Optional[pd.DataFrame] = None
+        self.races: Dict[int, pd.DataFrame] = {}
+        self.pages = 0
+        self.rows = 0
+        self.skipped = 0
+        self.errors: List[str] = []
+
+    def race_results(self) -> Optional[pd.DataFrame]:
+        if not self.races:
+            return None
+        return pd.concat([self.races[r] for r in sorted(self.races)], ignore_index=True)
+
+
+def _scrape_standings(fetch, season: int) -> pd.DataFrame:
+    df = fetch_table_page(fetch, standings_url(season), parse_results_table)
+    df["Season"] = season
+    return df
+
+
+def _scrape_race_list(fetch, season: int) -> List[Tuple[str, str, str]]:
+    return fetch_table_page(fetch, races_url(season), lambda html: parse_race_links(html, season))
+
+
+def _scrape_race(fetch, season: int, round_number: int, race_id: str, slug: str, name: str) -> pd.DataFrame:
+    df = fetch_table_page(fetch, race_result_url(season, race_id, slug), parse_results_table)
+    df["Season"] = season
+    df["Round"] = round_number
+    df["Race"] = name
+    df["RaceId"] = int(race_id)
+    df["RaceSlug"] = slug
+    return df
+
+
+Sink = Callable[[int, Optional[int], pd.DataFrame], None]
+
+
+def scrape_seasons(fetch: Callable[[str], str], seasons: List[int], workers: int = DEFAULT_WORKERS,
+                   races: bool = False, sink: Optional[Sink] = None,
+                   skip: Optional[Callable[[int, Optional[int]], bool]] = None) -> Iterator[SeasonResult]:
+    """Scrape seasons on a bounded thread pool, yielding each season as soon as all its pages are in
+
+    With a sink, every parsed page goes to sink(season, round, frame) (round None for the
+    standings) from this generator's thread right away and is not kept in the SeasonResult.
+    skip(season, round) -> True leaves out pages that are already stored.
+    """
+    skip = skip or (lambda season, round_number: False)
+    results = {season: SeasonResult(season) for season in seasons}
+    pending_per_season = {season: 0 for season in seasons}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scrape") as pool:
+        jobs = {}
+
+        def submit(season, label, fn, *args):
+            jobs[pool.submit(fn, fetch, season, *args)] = (season, label)
+            pending_per_season[season] += 1
+
+        for season in seasons:
+            if skip(season, None):
+                results[season].skipped += 1
+            else:
+                submit(season, "standings", _scrape_standings)
+            if races:
+                submit(season, "races", _scrape_race_list)
+        # Seasons with every page already stored are done straight away
+        for season in seasons:
+            if pending_per_season[season] == 0:
+                yield results.pop(season)
+
+        while jobs:
+            done, _ = wait(jobs, return_when=FIRST_COMPLETED)
+            for future in done:
+                season, label = jobs.pop(future)
+                result = results[season]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    result.errors.append(f"{label}: {e}")
+                else:
+                    if label == "races":
+                        for round_number, (race_id, slug, name) in enumerate(value, start=1):
+                            if skip(season, round_number):
+                                result.skipped += 1
+                            else:
+                                submit(season, round_number, _scrape_race, round_number, race_id, slug, name)
+                    else:
+                        round_number = None if label == "standings" else label
+                        result.pages += 1
+                        result.rows += len(value)
+                        if sink is not None:
+                            try:
+                                sink(season, round_number, value)
+                            except Exception as e:
+                                result.errors.append(f"writing {label}: {e}")
+                        elif round_number is None:
+                            result.standings = value
+                        else:
+                            result.races[round_number] = value
+                pending_per_season[season] -= 1
+                if pending_per_season[season] == 0:
+                    yield results.pop(season)
+
+
+def parse_seasons(text: str) -> List[int]:
+    """'2021-2025', '1950-', '2023' or '2019,2021' -> sorted season list"""
+    current_year = datetime.now().year
+    seasons = set()
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            start, _, end = part.partition("-")
+            seasons.update(range(int(start or FIRST_SEASON), int(end or current_year) + 1))
+        elif part:
+            seasons.add(int(part))
+    return sorted(seasons)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scrape F1 driver standings and race results")
+    parser.add_argument("--seasons", default=None,
+                        help=f"Seasons to scrape, e.g. 2021-2025, {FIRST_SEASON}- or 2019,2021 "
+                             f"(default {DEFAULT_FIRST_SEASON}-, or every cached season with --offline)")
+    parser.add_argument("--races", action="store_true", help="Also scrape every race result page")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent sessions/browsers")
+    parser.add_argument("--browser", action="store_true", help="Use headless Chrome instead of HTTP sessions")
+    parser.add_argument("--out", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--cache", default=default_cache_dir(), help="Page cache directory")
+    parser.add_argument("--no-cache", action="store_true", help="Neither read nor write the page cache")
+    parser.add_argument("--offline", action="store_true", help="Rebuild from cached pages only, no network")
+    parser.add_argument("--partitions", default=None, help="Partition directory (default: <out>/partitions)")
+    parser.add_argument("--force", action="store_true", help="Rewrite partitions the manifest already has")
+    args = parser.parse_args(argv)
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the page cache")
+
+    cache = None if args.no_cache else PageCache(args.cache)
+    if args.seasons:
+        seasons = parse_seasons(args.seasons)
+    elif args.offline:
+        seasons = cache.seasons()
+    else:
+        seasons = parse_seasons(f"{DEFAULT_FIRST_SEASON}-")
+    if not seasons:
+        print(f"❌ No seasons to scrape{' in ' + cache.root if args.offline else ''}.")
+        return 1
+
+    fetcher = None
+    if not args.offline:
+        fetcher = BrowserFetcher(args.workers) if args.browser else HttpFetcher(args.workers)
+    fetch = fetcher.fetch if fetcher else None
+    caching = None
+    if cache is not None:
+        caching = CachingFetcher(cache, fetch, offline=args.offline)
+        fetch = caching.fetch
+
+    started = time.perf_counter()
+    engine = "the page cache" if args.offline else (
+        f"{args.workers} {'browsers' if args.browser else 'HTTP sessions'}")
+    print(f"🔍 Scraping {len(seasons)} seasons ({seasons[0]}-{seasons[-1]}) from {engine}"
+          f"{' + race results' if args.races else ''}")
+
+    writer = PartitionWriter(args.partitions or os.path.join(args.out, "partitions"))
+    skip = None if args.force else writer.is_complete
     try:
-        # Try multiple selectors to ensure table is found
-        selectors = [
-            "table.resultsarchive-table",
-            "table",
-            "[data-testid='results-table']",
-            ".results-table"
-        ]
-
-        table = None
-        for selector in selectors:
-            table = soup.select_one(selector)
-            if table:
-                print(f"✅ Found table using selector: {selector}")
-                break
-
-        if table:
-            df = pd.read_html(StringIO(str(table)))[0]
-            df["Season"] = year
-            all_data.append(df)
-            print(f"✅ Successfully scraped {year} - {len(df)} drivers")
-        else:
-            print(f"⚠️ No table found for {year}")
-    except Exception as e:
-        print(f"❌ Error scraping {year}: {e}")
-
-driver.quit()
-
-# Save data
-if all_data:
-    df_all = pd.concat(all_data, ignore_index=True)
-    df_all.to_csv("driver_stats.csv", index=False)
-    df_all.to_json("driver_stats.json", orient="records", indent=2)
+        for result in scrape_seasons(fetch, seasons, args.workers, args.races, sink=writer.write, skip=skip):
+            for error in result.errors:
+                print(f"❌ {result.season}: {error}")
+            skipped = f", {result.skipped} already stored" if result.skipped else ""
+            print(f"✅ {result.season}: {result.pages} pages, {result.rows} rows written{skipped}")
+    finally:
+        if fetcher:
+            fetcher.close()
+
+    print(f"⏱️ Scraped in {time.perf_counter() - started:.1f}s")
+    if caching:
+        print(f"📦 Page cache: {caching.stats['hits']} hits, {caching.stats['fetched']} new, "
+              f"{caching.stats['refreshed']} refetched")
+    if not writer.completed(STANDINGS, seasons):
+        print("❌ No data scraped.")
+        return 1
+
+    # Combined outputs are streamed from every completed partition, not just this run's
+    # seasons: a `--seasons 2024` refresh must not drop the other years from the exports
+    rows = writer.export(STANDINGS, os.path.join(args.out, "driver_stats.csv"),
+                         os.path.join(args.out, "driver_stats.ndjson"))
+    # Typed, season-partitioned copy the API and training scripts load from
+    write_store(pd.concat(writer.iter_frames(STANDINGS), ignore_index=True),
+                os.path.join(args.out, "driver_store"))
+    print(f"💾 {rows} standings rows saved.")
+    if args.races and writer.completed(RACES, seasons):
+        race_rows = writer.export(RACES, os.path.join(args.out, "race_results.csv"))
+        print(f"🏁 {race_rows} race results saved.")
+        # Indexed by (season, race, driver) for the API; only new or changed rounds are loaded
+        race_db = RaceResultsDB(os.path.join(args.out, DB_FILENAME))
+        race_db.ingest_partitions(writer.root)
+        race_db.close()
     print("✅ All seasons saved successfully.")
-else:
-    print("❌ No data scraped.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
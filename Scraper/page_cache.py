@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+
+"""
+Content-addressed cache of scraped pages.
+
+Layout (F1_PAGE_CACHE, default Scraper/page_cache):
+
+    objects/<sha256[:2]>/<sha256>.html.gz   page bodies, keyed by content hash
+    pages/<sha1(url)>.json                  {url, sha256, season, season_final, fetched_at, bytes}
+
+A finished season's results never change, so CachingFetcher serves a page from
+the cache forever once it was fetched after its season ended (season_final);
+pages of the current season, pages cached while their season was still
+running and pages it has never seen come from the network. In offline mode it never touches the network,
+which rebuilds driver_stats from cached HTML alone:
+
+    python f1_scraper.py --offline
+    python page_cache.py               # what is cached, per season
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional
+
+# /en/results/2024/..., /en/results.html/2024/...
+SEASON_PATTERN = re.compile(r"/results(?:\.html)?/(\d{4})(?:/|$)")
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("F1_PAGE_CACHE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "page_cache"))
+
+
+def season_of_url(url: str) -> Optional[int]:
+    match = SEASON_PATTERN.search(url)
+    return int(match.group(1)) if match else None
+
+
+def looks_like_results(html: str) -> bool:
+    """Cheap check that a page has table rows (not a consent or error page) before caching it"""
+    return "<td" in html
+
+
+class CacheMiss(LookupError):
+    """Offline mode asked for a page that was never cached"""
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class PageCache:
+    """Page bodies by content hash plus per-URL metadata"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or default_cache_dir()
+        self.objects_dir = os.path.join(self.root, "objects")
+        self.pages_dir = os.path.join(self.root, "pages")
+
+    def _object_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256[:2], f"{sha256}.html.gz")
+
+    def _page_path(self, url: str) -> str:
+        return os.path.join(self.pages_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def metadata(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._page_path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def get(self, url: str) -> Optional[str]:
+        """Cached body of url, or None (also when the object is missing or corrupt)"""
+        meta = self.metadata(url)
+        if meta is None:
+            return None
+        try:
+            with gzip.open(self._object_path(meta["sha256"]), "rb") as f:
+                body = f.read()
+        except (OSError, EOFError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta["sha256"]:
+            return None
+        return body.decode("utf-8")
+
+    def put(self, url: str, html: str, season_final: bool = False) -> dict:
+        """Store a page; season_final records that its season had ended when it was fetched"""
+        body = html.encode("utf-8")
+        sha256 = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(sha256)
+        if not os.path.exists(object_path):
+            _atomic_write(object_path, gzip.compress(body, mtime=0))
+        meta = {
+            "url": url,
+            "sha256": sha256,
+            "season": season_of_url(url),
+            "season_final": season_final,
+            "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "bytes": len(body),
+        }
+        _atomic_write(self._page_path(url), json.dumps(meta, indent=2).encode("utf-8"))
+        return meta
+
+    def entries(self) -> Iterator[dict]:
+        if not os.path.isdir(self.pages_dir):
+            return
+        for name in sorted(os.listdir(self.pages_dir)):
+            if name.endswith(".json"):
+                with open(os.path.join(self.pages_dir, name), encoding="utf-8") as f:
+                    yield json.load(f)
+
+    def seasons(self) -> List[int]:
+        return sorted({e["season"] for e in self.entries() if e.get("season") is not None})
+
+
+class CachingFetcher:
+    """fetch(url) through a PageCache: past seasons from the cache, the current season from the network"""
+
+    def __init__(self, cache: PageCache, fetch: Optional[Callable[[str], str]] = None,
+                 current_season: Optional[int] = None, offline: bool = False,
+                 validate: Callable[[str], bool] = looks_like_results):
+        if fetch is None and not offline:
+            raise ValueError("A fetch function is needed unless offline")
+        self.cache = cache
+        self._fetch = fetch
+        self.current_season = current_season or datetime.now().year
+        self.offline = offline
+        self.validate = validate
+        self.stats: Dict[str, int] = {"hits": 0, "fetched": 0, "refreshed": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def season_finished(self, url: str) -> bool:
+        season = season_of_url(url)
+        return season is not None and season < self.current_season
+
+    def is_frozen(self, url: str) -> bool:
+        """Cached after its season finished: the page can no longer change"""
+        if not self.season_finished(url):
+            return False
+        meta = self.cache.metadata(url)
+        if meta is None:
+            return False
+        final = meta.get("season_final")
+        if final is None:
+            # Entries from before season_final was recorded: fetched in a later year
+            final = int(meta["fetched_at"][:4]) > meta["season"]
+        return bool(final)
+
+    def fetch(self, url: str) -> str:
+        if self.offline or self.is_frozen(url):
+            html = self.cache.get(url)
+            if html is not None:
+                self._count("hits")
+                return html
+            if self.offline:
+                raise CacheMiss(f"{url} is not in the page cache ({self.cache.root})")
+
+        refreshing = self.cache.metadata(url) is not None
+        html = self._fetch(url)
+        if self.validate(html):
+            self.cache.put(url, html, season_final=self.season_finished(url))
+        self._count("refreshed" if refreshing else "fetched")
+        return html
+
+
+def main() -> None:
+    cache = PageCache()
+    entries = list(cache.entries())
+    if not entries:
+        print(f"📭 No pages cached in {cache.root}")
+        return
+    per_season: Dict[Optional[int], List[dict]] = {}
+    for entry in entries:
+        per_season.setdefault(entry.get("season"), []).append(entry)
+    objects = {e["sha256"] for e in entries}
+    print(f"📦 {len(entries)} pages ({len(objects)} unique bodies) in {cache.root}")
+    for season in sorted(per_season, key=lambda s: (s is None, s)):
+        pages = per_season[season]
+        latest = max(p["fetched_at"] for p in pages)
+        print(f"  {season or '-'}: {len(pages)} pages, last fetched {latest}")
+
+
+if __name__ == "__main__":
+    main()
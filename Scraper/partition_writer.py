@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+
+"""
+Streaming, partitioned output for the scraper.
+
+Every parsed page is written as soon as it arrives, one NDJSON file per
+partition:
+
+    partitions/
+        manifest.jsonl
+        standings/season=2024.ndjson
+        races/season=2024/round=01.ndjson
+
+A partition is written to a temp file in its directory and renamed into
+place, then appended to manifest.jsonl, so an entry in the manifest always
+points at a complete file. Partitions of finished seasons are final and a
+rerun skips them; the current season's are rewritten on every run. Memory
+stays flat: nothing is held beyond the page being written, and the combined
+outputs are assembled by streaming the partition files back in order.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+MANIFEST_FILENAME = "manifest.jsonl"
+STANDINGS = "standings"
+RACES = "races"
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class PartitionWriter:
+    """Atomic per-season / per-race NDJSON partitions plus a completion manifest
+
+    Not thread-safe: write from one thread (the scraper's collecting loop).
+    """
+
+    def __init__(self, root: str, current_season: Optional[int] = None):
+        self.root = root
+        self.current_season = current_season or datetime.now().year
+        self.manifest_path = os.path.join(root, MANIFEST_FILENAME)
+        self._entries = self._read_manifest()
+
+    @staticmethod
+    def partition_key(season: int, round_number: Optional[int] = None) -> str:
+        if round_number is None:
+            return f"{STANDINGS}/season={int(season)}"
+        return f"{RACES}/season={int(season)}/round={int(round_number):02d}"
+
+    def partition_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/")) + ".ndjson"
+
+    def _read_manifest(self) -> Dict[str, dict]:
+        """Latest entry per partition; a torn last line (killed mid-append) is ignored"""
+        entries: Dict[str, dict] = {}
+        if not os.path.exists(self.manifest_path):
+            return entries
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                entries[entry["key"]] = entry
+        return entries
+
+    def is_complete(self, season: int, round_number: Optional[int] = None) -> bool:
+        """True for a final partition already on disk (safe to skip)"""
+        key = self.partition_key(season, round_number)
+        entry = self._entries.get(key)
+        return bool(entry and entry.get("final")) and os.path.exists(self.partition_path(key))
+
+    def write(self, season: int, round_number: Optional[int], frame: pd.DataFrame) -> dict:
+        key = self.partition_key(season, round_number)
+        path = self.partition_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        body = frame.to_json(orient="records", lines=True).encode("utf-8")
+        if body and not body.endswith(b"\n"):
+            body += b"\n"
+
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(body)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        entry = {
+            "key": key,
+            "season": int(season),
+            "round": None if round_number is None else int(round_number),
+            "rows": int(len(frame)),
+            "sha256": hashlib.sha256(body).hexdigest(),
+            "final": int(season) < self.current_season,
+            "written_at": _utc_now(),
+        }
+        self._append_manifest(entry)
+        self._entries[key] = entry
+        return entry
+
+    def _append_manifest(self, entry: dict) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        with open(self.manifest_path, "ab+") as f:
+            # Start on a fresh line if a previous run died mid-append
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write((json.dumps(entry) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def completed(self, kind: str, seasons: Optional[Iterable[int]] = None) -> List[dict]:
+        """Manifest entries of one kind whose files exist, in (season, round) order"""
+        wanted = None if seasons is None else {int(s) for s in seasons}
+        entries = [e for e in self._entries.values()
+                   if e["key"].startswith(kind + "/") and (wanted is None or e["season"] in wanted)
+                   and os.path.exists(self.partition_path(e["key"]))]
+        return sorted(entries, key=lambda e: (e["season"], e["round"] or 0))
+
+    def read(self, entry: dict) -> pd.DataFrame:
+        path = self.partition_path(entry["key"])
+        if entry["rows"] == 0:
+            return pd.DataFrame()
+        return pd.read_json(path, lines=True, convert_dates=False)
+
+    def iter_frames(self, kind: str, seasons: Optional[Iterable[int]] = None) -> Iterator[pd.DataFrame]:
+        for entry in self.completed(kind, seasons):
+            yield self.read(entry)
+
+    def columns(self, kind: str, seasons: Optional[Iterable[int]] = None) -> List[str]:
+        """Union of the partitions' columns in first-seen order, from each file's first record"""
+        columns: Dict[str, None] = {}
+        for entry in self.completed(kind, seasons):
+            with open(self.partition_path(entry["key"]), encoding="utf-8") as f:
+                first = f.readline()
+            if first.strip():
+                columns.update(dict.fromkeys(json.loads(first)))
+        return list(columns)
+
+    def export(self, kind: str, csv_path: Optional[str] = None, ndjson_path: Optional[str] = None,
+               seasons: Optional[Iterable[int]] = None) -> int:
+        """Stream the partitions of one kind into a combined CSV and/or NDJSON file; returns rows"""
+        entries = self.completed(kind, seasons)
+        columns = self.columns(kind, seasons)
+        rows = 0
+        # Temp files renamed into place at the end, so readers never see a half-written export
+        targets = [path for path in (csv_path, ndjson_path) if path]
+        csv_file = open(csv_path + ".tmp", "w", encoding="utf-8", newline="") if csv_path else None
+        ndjson_file = open(ndjson_path + ".tmp", "wb") if ndjson_path else None
+        try:
+            for entry in entries:
+                if ndjson_file:
+                    with open(self.partition_path(entry["key"]), "rb") as f:
+                        ndjson_file.write(f.read())
+                if csv_file and entry["rows"]:
+                    frame = self.read(entry).reindex(columns=columns)
+                    frame.to_csv(csv_file, index=False, header=rows == 0)
+                rows += entry["rows"]
+        except BaseException:
+            for f in (csv_file, ndjson_file):
+                if f:
+                    f.close()
+                    os.remove(f.name)
+            raise
+        for f in (csv_file, ndjson_file):
+            if f:
+                f.close()
+        for path in targets:
+            os.replace(path + ".tmp", path)
+        return rows
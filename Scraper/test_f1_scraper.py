@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""
+Test the scraper's table parsing and concurrent season scheduling on canned pages (no network)
+"""
+
+import os
+import sys
+import threading
+from io import StringIO
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from f1_scraper import (TableNotFound, fetch_table_page, parse_race_links, parse_results_table, parse_seasons, race_result_url,
+                        races_url, scrape_seasons, standings_url)
+
+STANDINGS_HTML = """<html><body><nav><table><tr><td>menu</td></tr></table></nav>
+<table class="f1-table resultsarchive-table">
+<thead><tr><th>POS.</th><th>DRIVER</th><th>NATIONALITY</th><th>TEAM</th><th>PTS.</th></tr></thead>
+<tbody>
+<tr><td>1</td><td><span>Max</span>&nbsp;<span>Verstappen</span><span>VER</span></td><td>NED</td>
+    <td>Red Bull Racing
+        Honda RBPT</td><td>575</td></tr>
+<tr><td>2</td><td><span>Lando</span>&nbsp;<span>Norris</span><span>NOR</span></td><td>GBR</td><td>McLaren Mercedes</td><td>374.5</td></tr>
+<tr><td>DQ</td><td><span>Logan</span>&nbsp;<span>Sargeant</span><span>SAR</span></td><td>USA</td><td>Williams Mercedes</td><td>1</td></tr>
+</tbody></table></body></html>"""
+
+RACES_HTML = """<html><body><table class="resultsarchive-table">
+<thead><tr><th>GRAND PRIX</th><th>WINNER</th></tr></thead><tbody>
+<tr><td><a href="/en/results/2024/races/1229/bahrain/race-result">Bahrain</a></td><td>Max Verstappen</td></tr>
+<tr><td><a href="/en/results.html/2024/races/1230/saudi-arabia/race-result.html">Saudi Arabia</a></td><td>Max Verstappen</td></tr>
+<tr><td><a href="/en/results/2024/races/1229/bahrain/race-result">Bahrain</a></td><td>dup</td></tr>
+<tr><td><a href="/en/results/2023/races/1141/bahrain/race-result">last year</a></td><td>x</td></tr>
+</tbody></table></body></html>"""
+
+RACE_HTML = """<html><body><table class="resultsarchive-table">
+<thead><tr><th>POS.</th><th>NO.</th><th>DRIVER</th><th>TEAM</th><th>LAPS</th><th>TIME / RETIRED</th><th>PTS.</th></tr></thead>
+<tbody><tr><td>1</td><td>1</td><td>Max VerstappenVER</td><td>Red Bull Racing Honda RBPT</td><td>57</td><td>1:31:44.742</td><td>26</td></tr>
+<tr><td>NC</td><td>2</td><td>Logan SargeantSAR</td><td>Williams Mercedes</td><td>10</td><td>DNF</td><td></td></tr></tbody></table></body></html>"""
+
+
+def test_lxml_parse_matches_read_html():
+    parsed = parse_results_table(STANDINGS_HTML)
+    expected = pd.read_html(StringIO(STANDINGS_HTML), attrs={"class": "f1-table resultsarchive-table"})[0]
+    pd.testing.assert_frame_equal(parsed, expected)
+    assert parsed.loc[0, "DRIVER"] == "Max\u00a0VerstappenVER"
+
+
+def test_missing_table_is_reported():
+    try:
+        parse_results_table("<html><body><p>Accept cookies</p></body></html>")
+    except TableNotFound:
+        return
+    raise AssertionError("expected TableNotFound")
+
+
+def test_page_without_table_is_refetched():
+    responses = ["<html><body>Loading...</body></html>", STANDINGS_HTML]
+    df = fetch_table_page(lambda url: responses.pop(0), "https://example/drivers", parse_results_table, backoff=0)
+    assert len(df) == 3 and responses == []
+
+
+def test_race_links_in_calendar_order():
+    assert parse_race_links(RACES_HTML, 2024) == [("1229", "bahrain", "Bahrain"),
+                                                   ("1230", "saudi-arabia", "Saudi Arabia")]
+
+
+def test_parse_seasons():
+    assert parse_seasons("2021-2023,2019") == [2019, 2021, 2022, 2023]
+    assert parse_seasons("1950-1952") == [1950, 1951, 1952]
+    assert parse_seasons("-1951") == [1950, 1951]
+
+
+def test_seasons_scraped_concurrently_with_races():
+    pages = {standings_url(2024): STANDINGS_HTML, races_url(2024): RACES_HTML,
+             race_result_url(2024, "1229", "bahrain"): RACE_HTML,
+             race_result_url(2024, "1230", "saudi-arabia"): RACE_HTML,
+             standings_url(2023): STANDINGS_HTML}
+    threads = set()
+
+    def fetch(url):
+        threads.add(threading.get_ident())
+        if url not in pages:
+            raise OSError(f"404 {url}")
+        return pages[url]
+
+    results = {r.season: r for r in scrape_seasons(fetch, [2023, 2024], workers=4, races=True)}
+    assert sorted(results) == [2023, 2024]
+    assert len(threads) > 1
+
+    season = results[2024]
+    assert season.errors == [] and list(season.standings["Season"].unique()) == [2024]
+    races = season.race_results()
+    assert races["Round"].tolist() == [1, 1, 2, 2]
+    assert races["Race"].tolist() == ["Bahrain", "Bahrain", "Saudi Arabia", "Saudi Arabia"]
+    assert races["RaceId"].tolist() == [1229, 1229, 1230, 1230]
+
+    # 2023's race list is missing: standings still arrive, the failure is recorded
+    assert results[2023].standings is not None and not results[2023].races
+    assert len(results[2023].errors) == 1 and results[2023].errors[0].startswith("races:")
+
+
+if __name__ == "__main__":
+    print("🧪 Testing scraper")
+    print("=" * 40)
+    test_lxml_parse_matches_read_html()
+    test_missing_table_is_reported()
+    test_page_without_table_is_refetched()
+    test_race_links_in_calendar_order()
+    test_parse_seasons()
+    test_seasons_scraped_concurrently_with_races()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+
+"""
+Test the content-addressed page cache, its refetch policy and offline replay
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import f1_scraper
+from page_cache import CacheMiss, CachingFetcher, PageCache, season_of_url
+from test_f1_scraper import RACE_HTML, RACES_HTML, STANDINGS_HTML
+
+
+def test_pages_are_content_addressed():
+    with tempfile.TemporaryDirectory() as root:
+        cache = PageCache(root)
+        a = cache.put("https://www.formula1.com/en/results/2023/drivers", STANDINGS_HTML)
+        b = cache.put("https://www.formula1.com/en/results.html/2023/drivers.html", STANDINGS_HTML)
+        assert a["sha256"] == b["sha256"] and a["season"] == 2023 and a["bytes"] == len(STANDINGS_HTML.encode())
+        assert cache.get("https://www.formula1.com/en/results/2023/drivers") == STANDINGS_HTML
+        assert cache.get("https://www.formula1.com/en/results/2022/drivers") is None
+        objects = [f for _, _, files in os.walk(cache.objects_dir) for f in files]
+        assert len(objects) == 1 and cache.seasons() == [2023]
+
+        # A damaged body is a miss, not bad data
+        with open(cache._object_path(a["sha256"]), "wb") as f:
+            f.write(b"garbage")
+        assert cache.get("https://www.formula1.com/en/results/2023/drivers") is None
+
+
+def test_only_the_current_season_is_refetched():
+    assert season_of_url("https://www.formula1.com/en/results/1950/races/94/britain/race-result") == 1950
+    with tempfile.TemporaryDirectory() as root:
+        calls = []
+
+        def fetch(url):
+            calls.append(url)
+            return STANDINGS_HTML
+
+        fetcher = CachingFetcher(PageCache(root), fetch, current_season=2025)
+        past, current = f1_scraper.standings_url(2024), f1_scraper.standings_url(2025)
+        for _ in range(3):
+            fetcher.fetch(past)
+            fetcher.fetch(current)
+        assert calls.count(past) == 1 and calls.count(current) == 3
+        assert fetcher.stats == {"hits": 2, "fetched": 2, "refreshed": 2}
+
+
+def test_page_cached_mid_season_is_refetched_after_it_ends():
+    """A page cached while its season ran is fetched once more after the season, then frozen"""
+    with tempfile.TemporaryDirectory() as root:
+        calls = []
+
+        def fetch(url):
+            calls.append(url)
+            return STANDINGS_HTML
+
+        url = f1_scraper.standings_url(2025)
+        CachingFetcher(PageCache(root), fetch, current_season=2025).fetch(url)
+        assert PageCache(root).metadata(url)["season_final"] is False
+
+        next_year = CachingFetcher(PageCache(root), fetch, current_season=2026)
+        next_year.fetch(url)
+        next_year.fetch(url)
+        assert calls.count(url) == 2
+        assert next_year.stats == {"hits": 1, "fetched": 0, "refreshed": 1}
+        assert PageCache(root).metadata(url)["season_final"] is True
+
+
+def test_pages_without_results_are_not_cached():
+    with tempfile.TemporaryDirectory() as root:
+        responses = ["<html>Please accept cookies</html>", STANDINGS_HTML]
+        fetcher = CachingFetcher(PageCache(root), lambda url: responses.pop(0), current_season=2025)
+        url = f1_scraper.standings_url(2020)
+        assert "cookies" in fetcher.fetch(url)
+        assert fetcher.fetch(url) == STANDINGS_HTML
+        assert fetcher.fetch(url) == STANDINGS_HTML and responses == []
+
+
+def test_offline_replay_rebuilds_driver_stats():
+    pages = {f1_scraper.standings_url(2024): STANDINGS_HTML, f1_scraper.races_url(2024): RACES_HTML,
+             f1_scraper.race_result_url(2024, "1229", "bahrain"): RACE_HTML,
+             f1_scraper.race_result_url(2024, "1230", "saudi-arabia"): RACE_HTML}
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as out:
+        cache = PageCache(root)
+        for url, html in pages.items():
+            cache.put(url, html)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert f1_scraper.main(["--offline", "--races", "--cache", root, "--out", out]) == 0
+        standings = pd.read_csv(os.path.join(out, "driver_stats.csv"))
+        assert standings["Season"].tolist() == [2024] * 3
+        assert standings["DRIVER"].tolist()[0] == "Max\u00a0VerstappenVER"
+        assert len(pd.read_csv(os.path.join(out, "race_results.csv"))) == 4
+
+        fetcher = CachingFetcher(cache, offline=True)
+        try:
+            fetcher.fetch(f1_scraper.standings_url(2023))
+        except CacheMiss:
+            return
+        raise AssertionError("offline miss should raise CacheMiss")
+
+
+def test_single_season_runs_keep_other_seasons():
+    """Two --seasons passes into the same output leave both years in the exports and the store"""
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as out:
+        cache = PageCache(root)
+        for season in (2023, 2024):
+            cache.put(f1_scraper.standings_url(season), STANDINGS_HTML)
+        for season in ("2023", "2024"):
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert f1_scraper.main(["--offline", "--seasons", season, "--cache", root, "--out", out]) == 0
+
+        standings = pd.read_csv(os.path.join(out, "driver_stats.csv"))
+        assert sorted(standings["Season"].unique().tolist()) == [2023, 2024]
+        store = sorted(os.listdir(os.path.join(out, "driver_store")))
+        assert [name for name in store if name.startswith("season=")] == ["season=2023.npz", "season=2024.npz"]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing page cache")
+    print("=" * 40)
+    test_pages_are_content_addressed()
+    test_only_the_current_season_is_refetched()
+    test_page_cached_mid_season_is_refetched_after_it_ends()
+    test_pages_without_results_are_not_cached()
+    test_offline_replay_rebuilds_driver_stats()
+    test_single_season_runs_keep_other_seasons()
+    print("\n✅ All tests completed!")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+"""
+Test the streaming partition writer: atomic partitions, manifest skipping and resumable scrapes
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from f1_scraper import parse_results_table, scrape_seasons, standings_url
+from partition_writer import RACES, STANDINGS, PartitionWriter
+from test_f1_scraper import STANDINGS_HTML
+
+
+def _standings(season, rows=3):
+    df = parse_results_table(STANDINGS_HTML).head(rows)
+    df["Season"] = season
+    return df
+
+
+def test_finished_seasons_are_skipped_on_rerun():
+    with tempfile.TemporaryDirectory() as root:
+        writer = PartitionWriter(root, current_season=2025)
+        writer.write(2024, None, _standings(2024))
+        writer.write(2025, None, _standings(2025))
+        writer.write(2024, 1, _standings(2024, rows=2))
+
+        reopened = PartitionWriter(root, current_season=2025)
+        assert reopened.is_complete(2024) and reopened.is_complete(2024, 1)
+        # The current season can still change, so it is always rewritten
+        assert not reopened.is_complete(2025) and not reopened.is_complete(2024, 2)
+        assert os.path.exists(os.path.join(root, "races", "season=2024", "round=01.ndjson"))
+        assert [e["key"] for e in reopened.completed(STANDINGS)] == ["standings/season=2024",
+                                                                    "standings/season=2025"]
+        assert not [name for _, _, files in os.walk(root) for name in files if name.startswith(".tmp-")]
+
+        # A partition whose file vanished is not complete
+        os.remove(reopened.partition_path("standings/season=2024"))
+        assert not PartitionWriter(root, current_season=2025).is_complete(2024)
+
+
+def test_torn_manifest_line_is_ignored():
+    with tempfile.TemporaryDirectory() as root:
+        writer = PartitionWriter(root, current_season=2025)
+        writer.write(2023, None, _standings(2023))
+        with open(writer.manifest_path, "a", encoding="utf-8") as f:
+            f.write('{"key": "standings/season=20')
+        writer = PartitionWriter(root, current_season=2025)
+        assert writer.is_complete(2023)
+        writer.write(2024, None, _standings(2024))
+        with open(writer.manifest_path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3 and json.loads(lines[-1])["key"] == "standings/season=2024"
+        assert PartitionWriter(root, current_season=2025).is_complete(2024)
+
+
+def test_export_streams_partitions_in_order():
+    with tempfile.TemporaryDirectory() as root:
+        writer = PartitionWriter(root, current_season=2025)
+        writer.write(2024, None, _standings(2024))
+        early = _standings(2023).drop(columns=["NATIONALITY"])
+        writer.write(2023, None, early)
+        csv_path, ndjson_path = os.path.join(root, "all.csv"), os.path.join(root, "all.ndjson")
+        assert writer.export(STANDINGS, csv_path, ndjson_path) == 6
+
+        df = pd.read_csv(csv_path)
+        assert df["Season"].tolist() == [2023] * 3 + [2024] * 3
+        assert df.columns.tolist() == ["POS.", "DRIVER", "TEAM", "PTS.", "Season", "NATIONALITY"]
+        assert df["NATIONALITY"].isna().sum() == 3
+        assert len(pd.read_json(ndjson_path, lines=True)) == 6
+        assert writer.export(RACES, os.path.join(root, "races.csv")) == 0
+
+
+def test_interrupted_scrape_resumes():
+    with tempfile.TemporaryDirectory() as root:
+        fetched = []
+        broken = {2024}
+
+        def fetch(url):
+            fetched.append(url)
+            if any(str(season) in url for season in broken):
+                raise OSError("connection reset")
+            return STANDINGS_HTML
+
+        writer = PartitionWriter(root, current_season=2030)
+        first = {r.season: r for r in scrape_seasons(fetch, [2022, 2023, 2024], 2, sink=writer.write,
+                                                      skip=writer.is_complete)}
+        assert first[2024].errors and first[2022].rows == 3 and first[2022].standings is None
+
+        broken.clear()
+        fetched.clear()
+        writer = PartitionWriter(root, current_season=2030)
+        second = {r.season: r for r in scrape_seasons(fetch, [2022, 2023, 2024], 2, sink=writer.write,
+                                                       skip=writer.is_complete)}
+        assert fetched == [standings_url(2024)]
+        assert second[2022].skipped == 1 and second[2024].pages == 1
+        assert [e["season"] for e in writer.completed(STANDINGS)] == [2022, 2023, 2024]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing partition writer")
+    print("=" * 40)
+    test_finished_seasons_are_skipped_on_rerun()
+    test_torn_manifest_line_is_ignored()
+    test_export_streams_partitions_in_order()
+    test_interrupted_scrape_resumes()
+    print("\n✅ All tests completed!")
@@ -1,25 +1,324 @@
+#!/usr/bin/env python3
+
+"""
+Bulk importer: stream driver results into the backend's /api/drivers/import.
+
+The source (NDJSON or CSV, e.g. Scraper/driver_stats.ndjson or
+race_results.csv) is read record by record, never loaded whole. Each record
+is normalized through a key map computed once per header layout ("POS.",
+"Pos", "position" ... -> position), and records are sent in fixed-size chunks
+from a bounded thread pool over one pooled requests.Session.
+
+- failed chunks are retried with exponential backoff (connection errors,
+  timeouts, 429 and 5xx; Retry-After is honoured)
+- every chunk carries an Idempotency-Key (sha256 of its body), so a retry of
+  a chunk whose response was lost can be deduplicated by the server
+- finished chunks are recorded in a checkpoint file; a rerun over the same
+  source and chunk size only sends the chunks that did not make it
+
+    python post_results.py                                   # Scraper/driver_stats.ndjson
+    python post_results.py Scraper/race_results.csv --chunk-size 1000 --concurrency 8
+    python post_results.py --reset                           # ignore the checkpoint
+"""
+
+import argparse
+import csv
+import hashlib
 import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
 import requests
+from requests.adapters import HTTPAdapter
 
-import json
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOURCE = os.path.join(ROOT, "Scraper", "driver_stats.ndjson")
+DEFAULT_URL = "http://localhost:8080/api/drivers/import"
+DEFAULT_CHECKPOINT = os.path.join(ROOT, ".import_checkpoint.json")
+
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Normalized source key -> field the backend expects
+KEY_VARIANTS = {
+    "position": ("pos", "position"),
+    "driver": ("driver",),
+    "nationality": ("nationality",),
+    "car": ("team", "car"),
+    "pts": ("pts", "points"),
+    "season": ("season",),
+    "race": ("race", "race_name", "grand_prix"),
+    "round": ("round",),
+}
+KEY_MAP = {variant: field for field, variants in KEY_VARIANTS.items() for variant in variants}
+
+
+def normalize_key(key: str) -> str:
+    """'POS.' -> 'pos', 'Grand Prix' -> 'grand_prix'"""
+    return key.strip().lower().replace(".", "").replace(" ", "_")
+
+
+def key_map_for(keys: Iterable[str]) -> Dict[str, str]:
+    """Source key -> backend field for one header layout (unknown keys are dropped)"""
+    mapping = {}
+    for key in keys:
+        field = KEY_MAP.get(normalize_key(key))
+        if field and field not in mapping.values():
+            mapping[key] = field
+    return mapping
+
+
+def _int(value) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if number == number else 0.0
+
+
+def normalize_record(record: dict, mapping: Dict[str, str]) -> dict:
+    """One source record -> the import payload shape (unclassified positions become 0)"""
+    fields = {field: record.get(key) for key, field in mapping.items()}
+    item = {
+        "position": _int(fields.get("position")),
+        "driver": fields.get("driver"),
+        "nationality": fields.get("nationality"),
+        "car": fields.get("car"),
+        "pts": _float(fields.get("pts")),
+        "season": _int(fields.get("season")),
+    }
+    if "race" in fields:
+        item["race"] = fields["race"]
+    if "round" in fields:
+        item["round"] = _int(fields["round"])
+    return item
+
+
+def iter_source(path: str) -> Iterator[dict]:
+    """Raw records from an NDJSON or CSV file, one at a time"""
+    if path.endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            yield from csv.DictReader(f)
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """Normalized records; the key map is built once per distinct header layout"""
+    mappings: Dict[Tuple[str, ...], Dict[str, str]] = {}
+    for record in iter_source(path):
+        layout = tuple(record)
+        mapping = mappings.get(layout)
+        if mapping is None:
+            mapping = mappings[layout] = key_map_for(layout)
+        yield normalize_record(record, mapping)
+
+
+def iter_chunks(records: Iterable[dict], size: int) -> Iterator[Tuple[int, List[dict]]]:
+    chunk: List[dict] = []
+    index = 0
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield index, chunk
+            index += 1
+            chunk = []
+    if chunk:
+        yield index, chunk
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """Chunks already imported for one (source content, chunk size); rewritten atomically"""
+
+    def __init__(self, path: Optional[str], source_sha256: str, chunk_size: int, url: str):
+        self.path = path
+        self.identity = {"source_sha256": source_sha256, "chunk_size": chunk_size, "url": url}
+        self.done: Dict[int, str] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    saved = json.load(f)
+            except (OSError, ValueError):
+                saved = {}
+            if all(saved.get(k) == v for k, v in self.identity.items()):
+                self.done = {int(i): key for i, key in saved.get("done", {}).items()}
+
+    def is_done(self, index: int, key: str) -> bool:
+        return self.done.get(index) == key
+
+    def mark(self, index: int, key: str) -> None:
+        self.done[index] = key
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({**self.identity, "done": {str(i): k for i, k in sorted(self.done.items())}}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class ChunkFailed(Exception):
+    """A chunk was rejected, or still failing after every retry"""
+
+
+class Importer:
+    """Posts chunks over a pooled session with retries and backoff"""
+
+    def __init__(self, url: str, concurrency: int = 4, retries: int = 5, backoff: float = 0.5,
+                 timeout: float = 30.0, max_backoff: float = 30.0):
+        self.url = url
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.retried = 0
+        self._lock = threading.Lock()
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.5)
+
+    def post_chunk(self, body: bytes, key: str) -> requests.Response:
+        headers = {"Content-Type": "application/json", "Idempotency-Key": key}
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                response = self.session.post(self.url, data=body, headers=headers, timeout=self.timeout)
+                if response.status_code < 300:
+                    return response
+                if response.status_code not in RETRY_STATUSES:
+                    raise ChunkFailed(f"HTTP {response.status_code}: {response.text[:200]}")
+                problem = f"HTTP {response.status_code}"
+            except requests.RequestException as e:
+                problem = f"{type(e).__name__}: {e}"
+            if attempt == self.retries:
+                raise ChunkFailed(f"{problem} after {self.retries + 1} attempts")
+            with self._lock:
+                self.retried += 1
+            time.sleep(self._delay(attempt, response))
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def encode_chunk(records: List[dict]) -> Tuple[bytes, str]:
+    body = json.dumps(records, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return body, hashlib.sha256(body).hexdigest()
+
+
+def run_import(source: str, importer: Importer, chunk_size: int = 500,
+               checkpoint_path: Optional[str] = DEFAULT_CHECKPOINT, log=print) -> dict:
+    """Stream source into chunks and post them concurrently; returns counts"""
+    checkpoint = Checkpoint(checkpoint_path, file_sha256(source), chunk_size, importer.url)
+    stats = {"chunks": 0, "rows": 0, "skipped": 0, "failed": 0, "retries": 0}
+    failures: List[str] = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=importer.concurrency, thread_name_prefix="import") as pool:
+        in_flight: Dict = {}
+
+        def collect(block: bool) -> None:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED) if block else (
+                [f for f in in_flight if f.done()], None)
+            for future in done:
+                index, key, rows = in_flight.pop(future)
+                try:
+                    future.result()
+                except ChunkFailed as e:
+                    stats["failed"] += 1
+                    failures.append(f"chunk {index}: {e}")
+                    continue
+                checkpoint.mark(index, key)
+                stats["chunks"] += 1
+                stats["rows"] += rows
+
+        for index, records in iter_chunks(iter_records(source), chunk_size):
+            body, key = encode_chunk(records)
+            if checkpoint.is_done(index, key):
+                stats["skipped"] += 1
+                continue
+            # Bounded read-ahead: at most two chunks per worker are held in memory
+            while len(in_flight) >= importer.concurrency * 2:
+                collect(block=True)
+            in_flight[pool.submit(importer.post_chunk, body, key)] = (index, key, len(records))
+            collect(block=False)
+        while in_flight:
+            collect(block=True)
+
+    stats["retries"] = importer.retried
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    for failure in failures:
+        log(f"❌ {failure}")
+    return stats
 
-with open("driver_stats.json") as file:
-    drivers = json.load(file)
 
-print(drivers[0].keys())  # print keys of the first driver dictionary
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream driver results into the backend import endpoint")
+    parser.add_argument("source", nargs="?", default=DEFAULT_SOURCE, help="NDJSON or CSV file")
+    parser.add_argument("--url", default=DEFAULT_URL)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--reset", action="store_true", help="Ignore and overwrite the checkpoint")
+    args = parser.parse_args(argv)
 
+    if args.reset and os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
+    importer = Importer(args.url, args.concurrency, args.retries, timeout=args.timeout)
+    print(f"📤 Importing {args.source} -> {args.url} ({args.chunk_size} rows/chunk, {args.concurrency} concurrent)")
+    try:
+        stats = run_import(args.source, importer, args.chunk_size, args.checkpoint)
+    finally:
+        importer.close()
 
-formatted_drivers = []
+    print(f"✅ {stats['rows']} rows in {stats['chunks']} chunks ({stats['skipped']} already imported, "
+          f"{stats['retries']} retries) in {stats['seconds']:.2f}s")
+    if stats["failed"]:
+        print(f"❌ {stats['failed']} chunks failed; rerun to send only those")
+        return 1
+    return 0
 
-for d in drivers:
-    formatted_drivers.append({
-        "position": int(d.get("POS.") or d.get("Pos") or d.get("pos") or d.get("Position") or d.get("position") or 0),
-        "driver": d.get("DRIVER") or d.get("Driver") or d.get("driver"),
-        "nationality": d.get("NATIONALITY") or d.get("Nationality") or d.get("nationality"),
-        "car": d.get("TEAM") or d.get("Car") or d.get("car"),
-        "pts": float(d.get("PTS.") or d.get("PTS") or d.get("pts") or 0),
-        "season": int(d.get("Season") or d.get("season") or 0)
-    })
 
-response = requests.post("http://localhost:8080/api/drivers/import", json=formatted_drivers)
-print(response.status_code, response.text)
+if __name__ == "__main__":
+    sys.exit(main())
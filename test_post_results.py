@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Test the bulk importer against a local http.server stub (no backend needed)
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from post_results import Importer, iter_records, main, run_import
+
+
+class StubBackend:
+    """Records posted chunks; `plan` maps a call number to a status to answer with"""
+
+    def __init__(self, plan=None, reject=None):
+        self.plan = dict(plan or {})
+        self.reject = reject  # predicate(chunk) -> True answers 400
+        self.calls = 0
+        self.chunks = {}
+        self.keys = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                chunk = json.loads(body)
+                key = self.headers["Idempotency-Key"]
+                with stub.lock:
+                    stub.calls += 1
+                    stub.keys.append(key)
+                    status = stub.plan.pop(stub.calls, 200)
+                    if status == 200 and stub.reject and stub.reject(chunk):
+                        status = 400
+                    if status == 200:
+                        stub.chunks[key] = chunk  # idempotent: a resent chunk replaces itself
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api/drivers/import"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def rows(self):
+        return [row for chunk in self.chunks.values() for row in chunk]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def write_ndjson(path, count):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            pos = "DQ" if i % 50 == 7 else (i % 20) + 1
+            f.write(json.dumps({"POS.": pos, "DRIVER": f"Driver {i}XX", "NATIONALITY": "GBR",
+                                "TEAM": "McLaren", "PTS.": i / 2, "Season": 2000 + i % 25}) + "\n")
+
+
+def test_key_variants_are_normalized():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "mixed.ndjson")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"Pos": "3", "Driver": "Lando NorrisNOR", "Nationality": "GBR", "Car": "McLaren",
+                                "PTS": "374.5", "season": 2024}) + "\n")
+            f.write(json.dumps({"position": None, "driver": "X", "team": "Haas", "points": None,
+                                "Season": "2023", "Race": "Monaco", "Round": 8, "extra": 1}) + "\n")
+        first, second = list(iter_records(path))
+        assert first == {"position": 3, "driver": "Lando NorrisNOR", "nationality": "GBR", "car": "McLaren",
+                         "pts": 374.5, "season": 2024}
+        assert second == {"position": 0, "driver": "X", "nationality": None, "car": "Haas", "pts": 0.0,
+                          "season": 2023, "race": "Monaco", "round": 8}
+
+        csv_path = os.path.join(tmp, "stats.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("POS.,DRIVER,NATIONALITY,TEAM,PTS.,Season\n1,Max VerstappenVER,NED,Red Bull,395.5,2021\n")
+        assert list(iter_records(csv_path))[0]["pts"] == 395.5
+
+
+def test_chunks_sent_concurrently_with_retries():
+    backend = StubBackend(plan={1: 503, 2: 429, 5: 502})
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "stats.ndjson")
+            write_ndjson(source, 1050)
+            importer = Importer(backend.url, concurrency=4, backoff=0.01)
+            stats = run_import(source, importer, chunk_size=100, checkpoint_path=os.path.join(tmp, "ckpt.json"))
+            importer.close()
+
+            assert stats["chunks"] == 11 and stats["rows"] == 1050 and stats["failed"] == 0
+            assert stats["retries"] == 3 and backend.calls == 14
+            rows = backend.rows()
+            assert sorted(r["driver"] for r in rows) == sorted(f"Driver {i}XX" for i in range(1050))
+            assert sum(1 for r in rows if r["position"] == 0) == 21
+            assert max(len(c) for c in backend.chunks.values()) == 100
+    finally:
+        backend.close()
+
+
+def test_checkpoint_resumes_only_failed_chunks():
+    backend = StubBackend(reject=lambda chunk: chunk[0]["driver"] == "Driver 300XX")
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "stats.ndjson")
+            checkpoint = os.path.join(tmp, "ckpt.json")
+            write_ndjson(source, 500)
+
+            first = run_import(source, Importer(backend.url, concurrency=2), chunk_size=100,
+                               checkpoint_path=checkpoint, log=lambda *_: None)
+            assert first["failed"] == 1 and first["chunks"] == 4 and first["retries"] == 0
+
+            # Backend fixed: a rerun over the same source only resends chunk 3
+            backend.reject = None
+            calls = backend.calls
+            second = run_import(source, Importer(backend.url), chunk_size=100, checkpoint_path=checkpoint)
+            assert second["skipped"] == 4 and second["chunks"] == 1 and backend.calls == calls + 1
+            assert backend.keys[-1] in backend.keys[:calls]  # same chunk, same Idempotency-Key
+
+            # A changed source, chunk size or target starts over
+            assert run_import(source, Importer(backend.url), chunk_size=250,
+                              checkpoint_path=checkpoint)["skipped"] == 0
+            write_ndjson(source, 501)
+            third = run_import(source, Importer(backend.url), chunk_size=100, checkpoint_path=checkpoint)
+            assert third["skipped"] == 0 and third["chunks"] == 6
+    finally:
+        backend.close()
+
+
+def test_cli_reports_failure_exit_code():
+    backend = StubBackend(reject=lambda chunk: True)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "stats.ndjson")
+            write_ndjson(source, 10)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                code = main([source, "--url", backend.url, "--checkpoint", os.path.join(tmp, "c.json")])
+            assert code == 1 and "1 chunks failed" in out.getvalue()
+    finally:
+        backend.close()
+
+
+if __name__ == "__main__":
+    print("🧪 Testing bulk importer")
+    print("=" * 40)
+    test_key_variants_are_normalized()
+    test_chunks_sent_concurrently_with_retries()
+    test_checkpoint_resumes_only_failed_chunks()
+    test_cli_reports_failure_exit_code()
+    print("\n✅ All tests completed!")